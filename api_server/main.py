@@ -1,15 +1,21 @@
 import sys
 import os
+import logging
 from fastapi import FastAPI
 from pydantic import BaseModel
 
 # Ajouter le répertoire racine du projet au chemin de recherche des modules
-# pour permettre les importations depuis 'france_travail' et 'app'
+# pour permettre les importations depuis 'france_travail'
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Importer les clients API initialisés depuis le module app
-# C'est une bonne pratique pour ne pas dupliquer l'initialisation
-from app import offres_client, lbb_client, romeo_client, soft_skills_client, contexte_client, cv_parser
+# Clients asynchrones : les appels à France Travail sont attendus (await)
+# au lieu d'occuper un worker du threadpool pendant toute la requête.
+from france_travail.api import AsyncOffresClient, AsyncSoftSkillsClient
+from france_travail.api.session_pool import aclose_async_sessions
+from france_travail.api.retry import get_retry_stats
+from france_travail.api.response_cache import get_cache_stats
+from france_travail.api.circuit_breaker import get_circuit_states
+from france_travail.api.scheduler import get_scheduler_stats
 
 app = FastAPI(
     title="France Travail API Wrapper",
@@ -17,42 +23,141 @@ app = FastAPI(
     version="1.0.0"
 )
 
+offres_client = None
+
+
+@app.on_event("startup")
+async def init_clients():
+    """Initialise les clients API au démarrage du serveur."""
+    global offres_client
+    try:
+        soft_skills_client = AsyncSoftSkillsClient()
+        offres_client = AsyncOffresClient(soft_skills_client=soft_skills_client)
+    except ValueError as e:
+        logging.error(f"Impossible d'initialiser les clients API. {e}")
+        offres_client = None
+
+
+@app.on_event("shutdown")
+async def close_clients():
+    """Ferme les connexions HTTP partagées."""
+    await aclose_async_sessions()
+
 @app.get("/", tags=["Général"])
 def read_root():
     """Endpoint racine pour vérifier que l'API est en ligne."""
     return {"message": "Bienvenue sur l'API du wrapper France Travail"}
 
+@app.get("/metrics/upstream", tags=["Général"])
+def upstream_metrics():
+    """Taux de réussite et nombre de nouvelles tentatives des appels France Travail, par API."""
+    return get_retry_stats()
+
+@app.get("/metrics/cache", tags=["Général"])
+def cache_metrics():
+    """Hits, misses, revalidations et réponses périmées servies par le cache de réponses, par API."""
+    return get_cache_stats()
+
+@app.get("/metrics/circuits", tags=["Général"])
+def circuit_metrics():
+    """État des disjoncteurs (fermé, ouvert, semi-ouvert) par endpoint France Travail."""
+    return get_circuit_states()
+
+@app.get("/metrics/scheduler", tags=["Général"])
+def scheduler_metrics():
+    """Profondeur des files d'attente et attente moyenne par API et par priorité (interactive, batch)."""
+    return get_scheduler_stats()
+
 # --- Endpoints pour les Offres d'Emploi --- #
 
 @app.get("/search", tags=["Offres d'emploi"])
-def search_jobs(keywords: str, range: str = "0-19"):
+async def search_jobs(keywords: str, range: str = "0-19"):
     """
     Recherche des offres d'emploi en utilisant des mots-clés.
 
     - **keywords**: Le ou les mots-clés à rechercher.
     - **range**: La plage de résultats à retourner (ex: "0-19").
     """
+    if not offres_client:
+        return {"error": "L'API n'est pas configurée correctement."}
     try:
         params = {
             'motsCles': keywords,
             'range': range
         }
-        result = offres_client.search_jobs(params=params)
+        result = await offres_client.search_jobs(params=params)
         return result
     except Exception as e:
         # Idéalement, nous devrions gérer les erreurs HTTP plus spécifiquement
         return {"error": str(e)}
 
 
+@app.get("/search/local", tags=["Offres d'emploi"])
+def search_local_jobs(q: str, limit: int = 20):
+    """
+    Recherche plein texte (BM25) dans l'entrepôt local des offres synchronisées.
+
+    - **q**: Le texte recherché (mots-clés ou texte d'une offre).
+    - **limit**: Le nombre maximal d'offres retournées.
+    """
+    from france_travail.offer_index import get_offer_index
+
+    index = get_offer_index()
+    if index is None:
+        return {"error": "Aucune offre synchronisée (python -m france_travail.offer_sync)."}
+    return {"resultats": index.search_offers(q, k=limit), "total_indexe": len(index)}
+
+
+@app.get("/search/nearby", tags=["Offres d'emploi"])
+def search_nearby_jobs(latitude: float, longitude: float, distance: float = 10, rome: str = None, limit: int = 50):
+    """
+    Offres de l'entrepôt local autour d'un point, de la plus proche à la plus éloignée.
+
+    - **latitude**, **longitude**: Le point de recherche.
+    - **distance**: Le rayon de recherche en km.
+    - **rome**: Code(s) ROME, séparés par des virgules (optionnel).
+    """
+    from france_travail.geo_index import get_offer_geo_index
+
+    index = get_offer_geo_index()
+    if index is None:
+        return {"error": "Aucune offre synchronisée (python -m france_travail.offer_sync)."}
+    return {"resultats": index.nearby(latitude, longitude, distance, rome_codes=rome, limit=limit)}
+
+
+@app.get("/facets", tags=["Offres d'emploi"])
+def offer_facets(typeContrat: str = None, romeCode: str = None, departement: str = None,
+                 experience: str = None, salaire: str = None, limit: int = 0):
+    """
+    Comptages par facette des offres de l'entrepôt local, avec filtres optionnels.
+
+    - Chaque filtre accepte plusieurs valeurs séparées par des virgules (ex: "CDI,CDD").
+    - **limit**: Nombre d'offres filtrées à retourner avec les comptages (0 : aucune).
+    """
+    from france_travail.offer_facets import get_offer_facets
+
+    facets = get_offer_facets()
+    if facets is None:
+        return {"error": "Aucune offre synchronisée (python -m france_travail.offer_sync)."}
+    filters = {'typeContrat': typeContrat, 'romeCode': romeCode, 'departement': departement,
+               'experience': experience, 'salaire': salaire}
+    result = facets.counts(filters)
+    if limit:
+        result['resultats'] = facets.offers(filters, limit=limit)
+    return result
+
+
 @app.get("/details/{job_id}", tags=["Offres d'emploi"])
-def get_job_details(job_id: str):
+async def get_job_details(job_id: str):
     """
     Récupère les détails d'une offre d'emploi spécifique par son ID.
 
     - **job_id**: L'identifiant de l'offre (ex: "194DZZT").
     """
+    if not offres_client:
+        return {"error": "L'API n'est pas configurée correctement."}
     try:
-        result = offres_client.get_job_details(job_id=job_id)
+        result = await offres_client.get_job_details(job_id=job_id)
         return result
     except Exception as e:
         return {"error": str(e)}
@@ -72,15 +177,17 @@ class CVData(BaseModel):
 # --- Endpoint pour l'analyse de CV --- #
 
 @app.post("/match/{job_id}", tags=["Matching CV"])
-def match_cv_to_job(job_id: str, cv_data: CVData):
+async def match_cv_to_job(job_id: str, cv_data: CVData):
     """
     Analyse la compatibilité entre le texte d'un CV et une offre d'emploi.
 
     - **job_id**: L'identifiant de l'offre.
     - **Request Body**: Doit contenir le texte brut du CV.
     """
+    if not offres_client:
+        return {"error": "L'API n'est pas configurée correctement."}
     try:
-        result = offres_client.analyze_cv_match(cv_text=cv_data.cv_text, job_id=job_id)
+        result = await offres_client.analyze_cv_match(cv_text=cv_data.cv_text, job_id=job_id)
         return result
     except Exception as e:
         return {"error": str(e)}
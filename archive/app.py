@@ -1,10 +1,7 @@
 from flask import Flask, jsonify, request, Response
 from flask_cors import CORS
-from scrapers.france_travail_original import lancer_scraping
-from france_travail.api import OffresClient, LBBClient, RomeoClient, SoftSkillsClient, ContexteTravailClient
-from france_travail.cv_parser import CVParser
+from france_travail.api import get_client
 from dotenv import load_dotenv
-import os
 import logging
 
 # Charger les variables d'environnement
@@ -13,50 +10,14 @@ load_dotenv()
 app = Flask(__name__)
 CORS(app)  # Activer CORS pour toutes les routes
 
-# Initialiser le parser de CV (utilisé par l'API et le CLI)
-cv_parser = CVParser()
-
-# Initialiser les clients API
-try:
-    client_id = os.getenv("FRANCE_TRAVAIL_CLIENT_ID")
-    client_secret = os.getenv("FRANCE_TRAVAIL_CLIENT_SECRET")
-
-    if not client_id or not client_secret:
-        raise ValueError("Les variables d'environnement FRANCE_TRAVAIL_CLIENT_ID et FRANCE_TRAVAIL_CLIENT_SECRET doivent être définies.")
-
-    soft_skills_client = SoftSkillsClient(
-        client_id=client_id,
-        client_secret=client_secret,
-        simulation=False
-    )
-    offres_client = OffresClient(
-        soft_skills_client=soft_skills_client,
-        client_id=client_id,
-        client_secret=client_secret,
-        simulation=False
-    )
-    lbb_client = LBBClient(
-        client_id=client_id,
-        client_secret=client_secret,
-        simulation=False
-    )
-    romeo_client = RomeoClient(
-        client_id=client_id,
-        client_secret=client_secret,
-        simulation=False
-    )
-    contexte_client = ContexteTravailClient(
-        client_id=client_id,
-        client_secret=client_secret,
-        simulation=False
-    )
-except ValueError as e:
-    print(f"ERREUR: Impossible d'initialiser les clients API. {e}")
-    offres_client = None
-    lbb_client = None
-    romeo_client = None
-    soft_skills_client = None
-    contexte_client = None
+
+def api_client(name):
+    """Client France Travail partagé, construit à la première requête (None sans identifiants)."""
+    try:
+        return get_client(name)
+    except ValueError as e:
+        logging.error(f"Impossible d'initialiser le client API '{name}'. {e}")
+        return None
 
 
 # --- Endpoints Flask (pour une utilisation web future) ---
@@ -67,6 +28,7 @@ def home():
 
 @app.route('/api/search', methods=['GET'])
 def search_jobs_endpoint():
+    offres_client = api_client('offres')
     if not offres_client:
         return jsonify({"error": "L'API n'est pas configurée correctement."}), 503
     params = request.args.to_dict()
@@ -75,6 +37,7 @@ def search_jobs_endpoint():
 
 @app.route('/api/job_details/<job_id>', methods=['GET'])
 def job_details(job_id):
+    offres_client = api_client('offres')
     if not offres_client:
         return jsonify({"error": "L'API n'est pas configurée correctement."}), 503
     details = offres_client.get_job_details(job_id)
@@ -82,8 +45,9 @@ def job_details(job_id):
 
 @app.route('/api/match', methods=['POST'])
 def api_match_cv():
-    if not offres_client or not cv_parser:
-        return jsonify({'error': 'Les clients API ou le parser de CV ne sont pas initialisés'}), 503
+    offres_client = api_client('offres')
+    if not offres_client:
+        return jsonify({'error': "L'API n'est pas configurée correctement."}), 503
 
     data = request.json
     if not data or 'cv_text' not in data or 'job_id' not in data:
@@ -115,6 +79,8 @@ def lancer_scraping_endpoint():
 
     def generate_logs():
         """Appelle le générateur du scraper et formate sa sortie pour SSE."""
+        # Import différé : le scraper charge selenium
+        from scrapers.france_travail_original import lancer_scraping
         scraper_generator = lancer_scraping(identifiant, mot_de_passe, mots_cles, localisation, headless=True)
         for log_message in scraper_generator:
             # Formatage pour Server-Sent Events (SSE)
@@ -2,14 +2,12 @@ import argparse
 import sys
 import logging
 import os
-import shutil
-import uuid
-import subprocess
 
-# Importer le module de base de données
-from database.user_database import UserDatabase
-from auth import get_password_hash
-from utils.data_exporter import export_to_csv
+# Les clients France Travail, la base de données (pg8000), l'authentification
+# (passlib, jose), le parser de CV (PyPDF2, docx) et les modules de copie de
+# fichiers et de sous-processus sont importés par les seules commandes qui les
+# utilisent : `cli.py romeo ...` ne charge que requests et les clients.
+from france_travail.api.factory import get_client
 
 # --- Fonctions d'aide pour l'affichage en console ---
 
@@ -119,7 +117,7 @@ def handle_search(args):
         'range': f"0-{args.limit-1}"
     }
     try:
-        results = offres_client.search_jobs(params)
+        results = get_client('offres').search_jobs(params)
         print_search_results(params, results)
     except Exception as e:
         logging.error(f"Une erreur est survenue lors de la recherche: {e}")
@@ -129,8 +127,9 @@ def handle_match(args):
     """Gère la commande 'match'."""
     print(f"Analyse du CV '{args.cv_path}' pour l'offre '{args.job_id}'...")
     try:
-        cv_text = cv_parser.extract_text_from_file(args.cv_path)
-        match_data = offres_client.analyze_cv_match(cv_text, args.job_id)
+        from france_travail.cv_parser import CVParser
+        cv_text = CVParser().extract_text_from_file(args.cv_path)
+        match_data = get_client('offres').analyze_cv_match(cv_text, args.job_id)
         print_match_results(match_data)
     except FileNotFoundError:
         logging.error(f"Le fichier CV '{args.cv_path}' n'a pas été trouvé.")
@@ -149,7 +148,8 @@ def handle_lbb(args):
     }
     print(f"Recherche d'entreprises (La Bonne Boîte) avec les paramètres: {params}")
     try:
-        results = lbb_client.search_companies(params)
+        # Une zone déjà interrogée est servie localement par le client (voir geo_index)
+        results = get_client('lbb').search_la_bonne_boite(args.rome_code, args.latitude, args.longitude, args.distance)
         print_lbb_results(params, results)
     except Exception as e:
         logging.error(f"Une erreur est survenue lors de l'appel à l'API LBB: {e}")
@@ -159,9 +159,9 @@ def handle_romeo(args):
     """Gère la commande 'romeo'."""
     print(f"Recherche du code ROME pour l'intitulé : \"{args.intitule}\"...")
     try:
-        results = romeo_client.predict_metiers(
-            job_title=args.intitule,
-            context=args.contexte,
+        results = get_client('romeo').predict_metiers(
+            intitule=args.intitule,
+            contexte=args.contexte,
             nb_results=args.nb
         )
         
@@ -189,21 +189,21 @@ def handle_contexte(args):
     """Gère la commande 'contexte' et ses sous-commandes."""
     if args.subcommand == 'list':
         try:
-            results = contexte_client.lister_contextes(champs=args.champs)
+            results = get_client('contextes').lister_contextes(champs=args.champs)
             print_contexte_list(results)
         except Exception as e:
             logging.error(f"Erreur lors de la récupération des contextes: {e}")
             print(f"Une erreur est survenue: {e}")
     elif args.subcommand == 'get':
         try:
-            results = contexte_client.lire_contexte(code=args.code, champs=args.champs)
+            results = get_client('contextes').lire_contexte(code=args.code, champs=args.champs)
             print_contexte_details(results)
         except Exception as e:
             logging.error(f"Erreur lors de la récupération du contexte {args.code}: {e}")
             print(f"Une erreur est survenue: {e}")
     elif args.subcommand == 'version':
         try:
-            results = contexte_client.lire_version()
+            results = get_client('contextes').lire_version()
             print_version(results)
         except Exception as e:
             logging.error(f"Erreur lors de la récupération de la version: {e}")
@@ -211,6 +211,7 @@ def handle_contexte(args):
 
 def handle_db(args):
     """Gère les commandes liées à la base de données."""
+    from database.user_database import UserDatabase
     if args.subcommand == 'init':
         print("Initialisation de la base de données...")
         db = UserDatabase(
@@ -230,9 +231,11 @@ def handle_db(args):
 
 def handle_user_command(args):
     """Gère les commandes liées aux utilisateurs."""
+    from database.user_database import UserDatabase
     db = UserDatabase()
     try:
         if args.subcommand == 'create':
+            from auth import get_password_hash
             hashed_password = get_password_hash(args.password)
             user_data = {
                 'email': args.email,
@@ -246,6 +249,8 @@ def handle_user_command(args):
             print(f"Utilisateur '{new_user['email']}' créé avec succès avec l'ID {new_user['id']}.")
 
         elif args.subcommand == 'update-docs':
+            import shutil
+            import uuid
             user = db.get_user_by_email(args.email)
             if not user:
                 print(f"Erreur : Utilisateur avec l'email '{args.email}' non trouvé.")
@@ -284,6 +289,7 @@ def handle_user_command(args):
                 base_dir = os.path.dirname(__file__)
                 scraper_path = os.path.join(base_dir, 'scrapers', 'site etudiant', 'iquestra', 'iquestra.py')
                 
+                import subprocess
                 try:
                     # Lancer le scraper. La sortie s'affichera directement dans le terminal
                     # car stdout/stderr ne sont pas redirigés.
@@ -343,6 +349,7 @@ def handle_user_command(args):
                     'Description': app.get('description')
                 })
             
+            from utils.data_exporter import export_to_csv
             export_to_csv(args.email, report_data, report_type='candidatures', subdirectory='report_iquestra')
             
         elif args.subcommand == 'update-prefs':
@@ -375,6 +382,7 @@ def handle_user_command(args):
 
 def handle_db(args):
     """Gère les commandes liées à la base de données."""
+    from database.user_database import UserDatabase
     if args.subcommand == 'init':
         try:
             db = UserDatabase()
@@ -493,6 +501,7 @@ def main():
 
 def reset_apps(email: str):
     """Réinitialise (supprime) toutes les candidatures pour un utilisateur donné."""
+    from database.user_database import UserDatabase
     db = None
     try:
         db = UserDatabase()
@@ -139,6 +139,25 @@ class UserDatabase:
         self._execute_query("ALTER TABLE job_applications ADD COLUMN IF NOT EXISTS status VARCHAR(100);")
         logger.info("✅ Table 'job_applications' prête et à jour.")
 
+        # --- Gestion de la table 'offer_recommendations' (meilleures offres par utilisateur) ---
+        logger.info("Vérification de la table 'offer_recommendations'...")
+        create_recommendations_table = """
+        CREATE TABLE IF NOT EXISTS offer_recommendations (
+            user_id INTEGER NOT NULL REFERENCES users(id),
+            offer_id VARCHAR(50) NOT NULL,
+            rank INTEGER NOT NULL,
+            matching_rate REAL NOT NULL,
+            title VARCHAR(255),
+            company VARCHAR(255),
+            location VARCHAR(255),
+            offer_url VARCHAR(2048),
+            computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, offer_id)
+        );
+        """
+        self._execute_query(create_recommendations_table)
+        logger.info("✅ Table 'offer_recommendations' prête et à jour.")
+
     def get_user_by_email(self, email: str):
         """Récupère un utilisateur par son email."""
         query = "SELECT * FROM users WHERE email = %s"
@@ -219,6 +238,49 @@ class UserDatabase:
         query = "SELECT title, company, location, description, offer_url, status, applied_at FROM job_applications WHERE user_id = %s ORDER BY applied_at DESC;"
         return self._execute_query(query, (user_id,), fetch='all')
 
+    def get_users_with_cv(self):
+        """Récupère les utilisateurs ayant déposé un CV (id, email, first_name, cv_path)."""
+        query = "SELECT id, email, first_name, cv_path FROM users WHERE cv_path IS NOT NULL ORDER BY id;"
+        return self._execute_query(query, fetch='all') or []
+
+    def save_recommendations(self, user_id: int, recommendations: list):
+        """
+        Remplace les offres recommandées d'un utilisateur, en une transaction.
+
+        Args:
+            recommendations: Dicts (offer_id, matching_rate, title, company, location, offer_url), du meilleur au moins bon.
+        """
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("DELETE FROM offer_recommendations WHERE user_id = %s;", (user_id,))
+            for rank, recommendation in enumerate(recommendations, 1):
+                cursor.execute(
+                    """
+                    INSERT INTO offer_recommendations
+                        (user_id, offer_id, rank, matching_rate, title, company, location, offer_url)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s);
+                    """,
+                    (user_id, recommendation['offer_id'], rank, recommendation['matching_rate'],
+                     recommendation.get('title'), recommendation.get('company'),
+                     recommendation.get('location'), recommendation.get('offer_url'))
+                )
+            self.conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Erreur lors de l'enregistrement des recommandations de l'utilisateur {user_id} : {e}")
+            self.conn.rollback()
+            return False
+        finally:
+            cursor.close()
+
+    def get_recommendations(self, user_id: int):
+        """Récupère les offres recommandées d'un utilisateur, de la meilleure à la moins bonne."""
+        query = """
+        SELECT offer_id, rank, matching_rate, title, company, location, offer_url, computed_at
+        FROM offer_recommendations WHERE user_id = %s ORDER BY rank;
+        """
+        return self._execute_query(query, (user_id,), fetch='all') or []
+
     def check_if_applied(self, user_id: int, offer_url: str) -> bool:
         """Vérifie si un utilisateur a déjà postulé à une offre."""
         query = "SELECT EXISTS(SELECT 1 FROM job_applications WHERE user_id = %s AND offer_url = %s);"
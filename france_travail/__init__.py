@@ -7,7 +7,6 @@ Inclut le support des APIs ROME 4.0 pour le matching de compétences.
 
 
 from .utils import afficher_offres, format_offre
-from .rome4_api import FranceTravailROME4API
 
 __version__ = "0.2.0"
 __all__ = [
@@ -16,3 +15,11 @@ __all__ = [
     'afficher_offres',
     'format_offre'
 ]
+
+
+def __getattr__(name):
+    # rome4_api (et donc requests) n'est importé qu'au premier accès
+    if name == 'FranceTravailROME4API':
+        from .rome4_api import FranceTravailROME4API
+        return FranceTravailROME4API
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,12 +6,19 @@ de France Travail pour effectuer du matching de compétences basé sur l'analyse
 des offres d'emploi.
 """
 
-import requests
 import json
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import re
 
+from .api.circuit_breaker import get_breaker, guarded_request
+from .api.config import ClientConfig
+from .api.exceptions import CircuitOpenError
+from .api.pagination import SEARCH_ENDPOINT
+from .api.session_pool import get_session
+from .api.token_cache import token_store
+from .api.scheduler import get_scheduler
+
 class FranceTravailAlternativeAPI:
     """
     Solution alternative utilisant les APIs disponibles de France Travail
@@ -25,8 +32,10 @@ class FranceTravailAlternativeAPI:
         self.token_expiry = None
         
         # URLs confirmées comme fonctionnelles
-        self.auth_url = "https://entreprise.pole-emploi.fr/connexion/oauth2/access_token"
-        self.base_url = "https://api.francetravail.io/partenaire"
+        self.auth_url = ClientConfig.resolve_url("https://entreprise.pole-emploi.fr/connexion/oauth2/access_token", auth=True)
+        self.base_url = ClientConfig.resolve_url("https://api.francetravail.io/partenaire")
+        self.session = get_session(self.base_url)
+        self.scope = 'api_offresdemploiv2 o2dsoffre'
         
         # Cache pour éviter les appels répétés
         self.cache = {
@@ -36,12 +45,19 @@ class FranceTravailAlternativeAPI:
         }
     
     def authenticate(self) -> bool:
-        """Authentification avec le scope qui fonctionne."""
+        """Authentification avec le scope qui fonctionne (token partagé via token_store)."""
+        self.access_token = token_store.get_token(self.client_id, self.scope, self._fetch_token)
+        if not self.access_token:
+            return False
+        entry = token_store.get_entry(self.client_id, self.scope)
+        if entry:
+            self.token_expiry = datetime.fromtimestamp(entry['expires_at'] - token_store.refresh_margin)
+        return True
+    
+    def _fetch_token(self) -> Optional[Dict]:
+        """Demande un nouveau token à l'API et retourne la réponse OAuth."""
         import base64
         
-        if self.is_token_valid():
-            return True
-        
         auth_string = f"{self.client_id}:{self.client_secret}"
         base64_auth = base64.b64encode(auth_string.encode('ascii')).decode('ascii')
         
@@ -53,12 +69,12 @@ class FranceTravailAlternativeAPI:
         
         data = {
             'grant_type': 'client_credentials',
-            'scope': 'api_offresdemploiv2 o2dsoffre',
+            'scope': self.scope,
             'realm': '/partenaire'
         }
         
         try:
-            response = requests.post(
+            response = get_session(self.auth_url).post(
                 f"{self.auth_url}?realm=%2Fpartenaire",
                 headers=headers,
                 data=data,
@@ -66,20 +82,15 @@ class FranceTravailAlternativeAPI:
             )
             
             if response.status_code == 200:
-                token_data = response.json()
-                self.access_token = token_data.get('access_token')
-                expires_in = token_data.get('expires_in', 3600)
-                from datetime import datetime, timedelta
-                self.token_expiry = datetime.now() + timedelta(seconds=expires_in - 60)
                 print("✅ Authentification réussie")
-                return True
+                return response.json()
             else:
                 print(f"❌ Erreur d'authentification: {response.status_code}")
                 
         except Exception as e:
             print(f"❌ Exception: {e}")
         
-        return False
+        return None
     
     def is_token_valid(self) -> bool:
         """Vérifie la validité du token."""
@@ -122,7 +133,7 @@ class FranceTravailAlternativeAPI:
             })
             
             print(f"🔍 Recherche d'offres pour ROME {rome_code}...")
-            response = requests.get(search_url, headers=headers, params=params, timeout=15)
+            response = self._search_offers(search_url, headers, params)
             
             # Gestion des réponses partielles (206) et complètes (200)
             if response.status_code in (200, 206):
@@ -139,7 +150,7 @@ class FranceTravailAlternativeAPI:
                     if not job_data['offers_sample']:
                         print("⚠️ Aucune offre avec ce code ROME, élargissement de la recherche...")
                         del params['codeROME']
-                        response = requests.get(search_url, headers=headers, params=params, timeout=15)
+                        response = self._search_offers(search_url, headers, params)
                         if response.status_code in (200, 206):
                             try:
                                 offers_data = response.json()
@@ -153,13 +164,29 @@ class FranceTravailAlternativeAPI:
             else:
                 print(f"⚠️ Erreur API: {response.status_code} - {response.text[:200]}")
                 job_data['offers_sample'] = []
+                if response.status_code >= 500:
+                    job_data['degraded_reason'] = 'upstream_unavailable'
                 
+        except CircuitOpenError as e:
+            print(f"⚡ {e}, repli immédiat sur la simulation")
+            job_data['degraded_reason'] = 'circuit_open'
         except Exception as e:
             print(f"❌ Erreur récupération offres: {e}")
+            job_data['degraded_reason'] = 'upstream_unavailable'
         
-        # Cache le résultat
-        self.cache['metiers'][rome_code] = job_data
+        # Cache le résultat (sauf en cas de panne, pour réessayer une fois l'API rétablie)
+        if 'degraded_reason' not in job_data:
+            self.cache['metiers'][rome_code] = job_data
         return job_data
+
+    def _search_offers(self, url: str, headers: Dict, params: Dict):
+        """
+        Recherche d'offres derrière le disjoncteur partagé avec OffresClient :
+        échoue immédiatement (CircuitOpenError) tant que l'API est en panne.
+        """
+        get_scheduler('offres').acquire()
+        breaker = get_breaker('offres', SEARCH_ENDPOINT)
+        return guarded_request(self.session, 'GET', url, breaker, headers=headers, params=params, timeout=15)
     
     def extract_skills_from_offers(self, offers: List[Dict]) -> List[str]:
         """
@@ -245,7 +272,7 @@ class FranceTravailAlternativeAPI:
         
         if not job_data.get('offers_sample'):
             print("⚠️ Pas de données d'offres, utilisation de la simulation")
-            return self._simulate_matching(rome_code, user_skills)
+            return self._simulate_matching(rome_code, user_skills, job_data.get('degraded_reason'))
         
         # 2. Extraire les compétences des offres
         market_skills = self.extract_skills_from_offers(job_data['offers_sample'])
@@ -354,8 +381,11 @@ class FranceTravailAlternativeAPI:
             
         return 1.0 - (distance / max_len)
         
-    def _simulate_matching(self, rome_code: str, skills: List[str]) -> Dict:
-        """Simulation locale améliorée basée sur des données réelles."""
+    def _simulate_matching(self, rome_code: str, skills: List[str], degraded_reason: Optional[str] = None) -> Dict:
+        """
+        Simulation locale améliorée basée sur des données réelles.
+        `degraded_reason` (circuit ouvert, API indisponible) est repris dans le résultat.
+        """
         
         # Base de données simplifiée par métier
         skills_by_rome = {
@@ -376,7 +406,7 @@ class FranceTravailAlternativeAPI:
         
         score = len(matches) / len(skills) if skills else 0
         
-        return {
+        result = {
             'match_score': round(score, 2),
             'matching_skills': matches,
             'expected_skills': expected_skills,
@@ -384,6 +414,9 @@ class FranceTravailAlternativeAPI:
             'source': 'simulation_enrichie',
             'timestamp': datetime.now().isoformat()
         }
+        if degraded_reason:
+            result['degraded_reason'] = degraded_reason
+        return result
 
 
 def test_alternative_api():
@@ -1,14 +1,33 @@
 # /Users/davidravin/Desktop/Api_Final/france_travail/api/__init__.py
-from .offres_client import OffresClient
-from .lbb_client import LBBClient
-from .romeo_client import RomeoClient
-from .soft_skills_client import SoftSkillsClient
-from .contexte_travail_client import ContexteTravailClient
-
-__all__ = [
-    'OffresClient',
-    'LBBClient',
-    'RomeoClient',
-    'SoftSkillsClient',
-    'ContexteTravailClient'
-]
+# Les clients sont importés au premier accès (PEP 562) : `import france_travail.api`
+# ne charge ni requests ni httpx tant qu'aucun client n'est utilisé.
+import importlib
+
+_EXPORTS = {
+    'OffresClient': '.offres_client',
+    'LBBClient': '.lbb_client',
+    'RomeoClient': '.romeo_client',
+    'SoftSkillsClient': '.soft_skills_client',
+    'ContexteTravailClient': '.contexte_travail_client',
+    'AsyncOffresClient': '.async_clients',
+    'AsyncLBBClient': '.async_clients',
+    'AsyncRomeoClient': '.async_clients',
+    'AsyncSoftSkillsClient': '.async_clients',
+    'AsyncContexteTravailClient': '.async_clients',
+    'get_client': '.factory',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
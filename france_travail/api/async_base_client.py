@@ -0,0 +1,230 @@
+import os
+import asyncio
+import logging
+import httpx
+from dotenv import load_dotenv
+from .base_client import (
+    AUTH_URL, AUTH_PARAMS, AUTH_HEADERS, raise_for_transient_status,
+    _request_key, _cache_lookup, _cache_store, _serve_stale, _flag_degraded,
+    _projected_content, decode_json
+)
+from .config import ClientConfig
+from .session_pool import get_async_session, get_async_timeout
+from .token_cache import token_store
+from .rate_limiter import get_rate_limiter
+from .scheduler import scheduler_for
+from .retry import default_policy, retry_stats, parse_retry_after, RETRYABLE_STATUSES
+from .circuit_breaker import get_breaker
+from .exceptions import FranceTravailAPIError, UpstreamUnavailableError, CircuitOpenError
+from .response_cache import response_cache
+from .singleflight import async_in_flight
+
+
+class AsyncBaseClient:
+    """
+    Client de base asynchrone (httpx) pour les API de France Travail.
+    Même authentification, limitation de débit et mode simulation que BaseClient,
+    mais les appels sont attendus (await) au lieu de bloquer un thread.
+    """
+    api_name = 'default'
+    idempotent_endpoints = ()
+    cache_ttls = {}
+
+    def __init__(self, client_id=None, client_secret=None, base_url=None, scope=None, simulation=False):
+        load_dotenv()
+        self.client_id = client_id or os.getenv('FRANCE_TRAVAIL_CLIENT_ID')
+        self.client_secret = client_secret or os.getenv('FRANCE_TRAVAIL_CLIENT_SECRET')
+
+        if not self.client_id or not self.client_secret:
+            raise ValueError("Les identifiants FRANCE_TRAVAIL_CLIENT_ID et FRANCE_TRAVAIL_CLIENT_SECRET sont requis.")
+
+        self.auth_url = ClientConfig.resolve_url(AUTH_URL, auth=True)
+        self.base_url = ClientConfig.resolve_url(base_url)
+        self.scope = scope
+
+        self.access_token = None
+        self.simulation = simulation
+        self.timeout = get_async_timeout()
+
+        # Seau à jetons partagé avec les clients synchrones de la même API
+        self.rate_limiter = get_rate_limiter(self.api_name)
+        self.retry_policy = default_policy
+
+    async def _authenticate(self, force=False):
+        """
+        Récupère un token d'accès via le cache partagé (token_store).
+        """
+        if force:
+            token_store.invalidate(self.client_id, self.scope, self.access_token)
+        self.access_token = await token_store.get_token_async(self.client_id, self.scope, self._fetch_token)
+        return bool(self.access_token)
+
+    async def _fetch_token(self):
+        """
+        S'authentifie auprès de l'API et retourne la réponse OAuth (dict) ou None.
+        """
+        logging.info(f"Tentative d'authentification pour le scope: {self.scope}...")
+
+        data = {
+            'grant_type': 'client_credentials',
+            'client_id': self.client_id,
+            'client_secret': self.client_secret,
+            'scope': self.scope
+        }
+
+        try:
+            session = get_async_session(self.auth_url)
+            response = await session.post(self.auth_url, params=AUTH_PARAMS, data=data, headers=AUTH_HEADERS, timeout=self.timeout)
+            if response.is_error:
+                logging.error(f"Erreur HTTP lors de l'authentification: {response.status_code} - {response.text}")
+                return None
+
+            token_data = response.json()
+
+            if not token_data.get('access_token'):
+                logging.error("Le token d'accès n'a pas été trouvé dans la réponse.")
+                return None
+
+            logging.info("Authentification réussie.")
+            return token_data
+
+        except Exception as e:
+            logging.error(f"Une erreur inattendue est survenue lors de l'authentification: {e}")
+            return None
+
+    async def _send(self, method, endpoint, fields=None, **kwargs):
+        """
+        Retourne la réponse httpx brute d'une requête, depuis le cache de réponses
+        si possible, sinon depuis l'API (voir BaseClient._send).
+        """
+        key = _request_key(self, method, endpoint, kwargs, fields)
+        if key is None:
+            return await self._send_upstream(method, endpoint, **kwargs)
+
+        ttl, cached = _cache_lookup(self, key, endpoint)
+        if cached is not None and cached.is_fresh():
+            response_cache.record(self.api_name, 'hit')
+            return _httpx_response(cached, method, f"{self.base_url}{endpoint}")
+        if cached is not None:
+            kwargs['headers'] = {**cached.validators(), **kwargs.get('headers', {})}
+
+        try:
+            return await async_in_flight.do(key, lambda: self._send_and_store(method, endpoint, key, ttl, cached, fields, kwargs))
+        except (CircuitOpenError, UpstreamUnavailableError) as e:
+            if cached is None:
+                raise
+            return _httpx_response(cached, method, f"{self.base_url}{endpoint}", _serve_stale(self.api_name, endpoint, e))
+
+    async def _send_and_store(self, method, endpoint, key, ttl, cached, fields, kwargs):
+        """Appelle l'API puis met à jour le cache de réponses (si l'endpoint est mis en cache)."""
+        response = await self._send_upstream(method, endpoint, **kwargs)
+        if response is None or not ttl:
+            return response
+        if cached is not None and response.status_code >= 500:
+            return _httpx_response(cached, method, f"{self.base_url}{endpoint}", _serve_stale(self.api_name, endpoint))
+        content = _projected_content(response.status_code, response.content, fields)
+        if _cache_store(self.api_name, key, ttl, cached, response.status_code, response.headers, content):
+            return _httpx_response(cached, method, f"{self.base_url}{endpoint}")
+        return response
+
+    def _cached_json(self, method, endpoint, fields=None, **kwargs):
+        """Retourne le JSON d'une réponse encore fraîche du cache, sans appel réseau, ou None."""
+        key = _request_key(self, method, endpoint, kwargs, fields)
+        ttl, cached = _cache_lookup(self, key, endpoint) if key else (0, None)
+        if cached is None or not cached.is_fresh() or not cached.content:
+            return None
+        response_cache.record(self.api_name, 'hit')
+        return decode_json(cached.content, fields)
+
+    async def _send_upstream(self, method, endpoint, **kwargs):
+        """
+        Envoie une requête authentifiée et retourne la réponse httpx brute.
+        Même gestion du rate limiting, du 401, des nouvelles tentatives et du
+        disjoncteur que BaseClient._send_upstream.
+        """
+        if not await self._authenticate():
+            return None
+
+        url = f"{self.base_url}{endpoint}"
+        headers = {'Authorization': f'Bearer {self.access_token}'}
+
+        if 'headers' in kwargs:
+            headers.update(kwargs['headers'])
+        kwargs['headers'] = headers
+        kwargs.setdefault('timeout', self.timeout)
+
+        session = get_async_session(self.base_url)
+        breaker = get_breaker(self.api_name, endpoint)
+        retry = self.retry_policy.start(method, endpoint, self.idempotent_endpoints)
+        reauthenticated = False
+        while True:
+            try:
+                with breaker.attempt():
+                    await scheduler_for(self.rate_limiter).acquire_async()
+                    response = await session.request(method.upper(), url, **kwargs)
+            except httpx.TransportError as e:
+                delay = retry.next_delay(None)
+                if delay is None:
+                    retry_stats.record_result(self.api_name, False)
+                    raise UpstreamUnavailableError(f"{method.upper()} {url} injoignable: {e}", url=url) from e
+                logging.warning(f"Erreur réseau pour {method.upper()} {url} ({e}), nouvel essai dans {delay:.2f}s.")
+                retry_stats.record_retry(self.api_name, None)
+                await asyncio.sleep(delay)
+                continue
+            breaker.record_status(response.status_code)
+
+            if response.status_code == 401 and not reauthenticated:
+                logging.warning("Token expiré (401). Tentative de ré-authentification.")
+                reauthenticated = True
+                if await self._authenticate(force=True):
+                    kwargs['headers']['Authorization'] = f'Bearer {self.access_token}'
+                    continue
+
+            if response.status_code in RETRYABLE_STATUSES:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                delay = retry.next_delay(response.status_code, retry_after)
+                if delay is not None:
+                    logging.warning(f"{response.status_code} pour {method.upper()} {url}, nouvel essai dans {delay:.2f}s.")
+                    retry_stats.record_retry(self.api_name, response.status_code)
+                    await asyncio.sleep(delay)
+                    continue
+
+            retry_stats.record_result(self.api_name, response.status_code not in RETRYABLE_STATUSES, response.status_code)
+            return response
+
+    async def _make_request(self, method, endpoint, fields=None, **kwargs):
+        """
+        Méthode générique asynchrone pour effectuer des requêtes à l'API.
+        Retourne le JSON décodé (réduit aux chemins `fields`), ou None en cas d'erreur définitive (comme BaseClient) ;
+        lève RateLimitedError / UpstreamUnavailableError après épuisement des tentatives.
+        """
+        url = f"{self.base_url}{endpoint}"
+        try:
+            response = await self._send(method, endpoint, fields=fields, **kwargs)
+            if response is None:
+                return None
+
+            raise_for_transient_status(method, url, response.status_code, response.headers, response.text)
+            if response.is_error:
+                logging.error(f"Erreur HTTP pour {method.upper()} {url}: {response.status_code} - {response.text}")
+                return None
+
+            if response.status_code == 204:
+                return None
+            return _flag_degraded(decode_json(response.content, fields), response.headers)
+
+        except FranceTravailAPIError:
+            raise
+        except Exception as e:
+            logging.error(f"Erreur pour {method.upper()} {url}: {e}")
+            return None
+
+
+def _httpx_response(cached, method, url, extra_headers=None):
+    """Construit une réponse httpx à partir d'une entrée du cache."""
+    return httpx.Response(
+        cached.status_code,
+        headers={**cached.headers, **(extra_headers or {})},
+        content=cached.content,
+        request=httpx.Request(method.upper(), url)
+    )
@@ -0,0 +1,284 @@
+"""
+Versions asynchrones des clients France Travail.
+
+Chaque classe reprend les endpoints, paramètres et données de simulation de
+son équivalent synchrone, mais s'appuie sur AsyncBaseClient (httpx).
+"""
+
+import asyncio
+import logging
+import os
+from dotenv import load_dotenv
+from .async_base_client import AsyncBaseClient
+from .base_client import decode_json
+from .projection import project
+from .config import ClientConfig
+from .exceptions import FranceTravailAPIError
+from .pagination import SEARCH_ENDPOINT, MAX_WINDOW, window_bounds, next_window, remaining_windows, range_params, parse_search_page
+from .offres_client import OFFRES_BASE_URL, OFFRES_SCOPE, OFFRES_CACHE_TTLS, _simulated_search, _simulated_details, _search_fields, _unique_ids, _rome_code_for, _score_cv_match
+from .soft_skills_client import SOFT_SKILLS_BASE_URL, SOFT_SKILLS_SCOPE, JOB_SKILLS_ENDPOINT, SOFT_SKILLS_CACHE_TTLS, _is_valid_rome_code
+from .romeo_client import ROMEO_BASE_URL, ROMEO_SCOPE, PREDICTION_ENDPOINT, ROMEO_CACHE_TTLS, _build_prediction_payload
+from .lbb_client import LBB_BASE_URL, LBB_CACHE_TTLS, _lbb_scope, _simulated_companies, _build_lbb_params
+from .contexte_travail_client import CONTEXTES_BASE_URL, CONTEXTES_SCOPE, CONTEXTES_ENDPOINT, VERSION_ENDPOINT, CONTEXTES_CACHE_TTLS
+
+
+class AsyncSoftSkillsClient(AsyncBaseClient):
+    """
+    Client asynchrone pour l'API Match via Soft Skills v1.
+    """
+    api_name = 'soft_skills'
+    idempotent_endpoints = (JOB_SKILLS_ENDPOINT,)
+    cache_ttls = SOFT_SKILLS_CACHE_TTLS
+
+    def __init__(self, client_id=None, client_secret=None, simulation=False):
+        super().__init__(
+            client_id=client_id,
+            client_secret=client_secret,
+            base_url=SOFT_SKILLS_BASE_URL,
+            scope=SOFT_SKILLS_SCOPE,
+            simulation=simulation
+        )
+
+    async def get_skills_for_job(self, rome_code: str):
+        """Récupère la liste des soft skills pour un code ROME donné."""
+        if not _is_valid_rome_code(rome_code):
+            return None
+
+        logging.info(f"Récupération des soft skills pour le code ROME: {rome_code}")
+        return await self._make_request("POST", JOB_SKILLS_ENDPOINT, params={"code": rome_code})
+
+
+class AsyncOffresClient(AsyncBaseClient):
+    """
+    Client asynchrone pour l'API Offres d'emploi v2.
+    """
+    api_name = 'offres'
+    cache_ttls = OFFRES_CACHE_TTLS
+
+    def __init__(self, soft_skills_client, client_id=None, client_secret=None, simulation=False):
+        super().__init__(
+            client_id=client_id,
+            client_secret=client_secret,
+            base_url=OFFRES_BASE_URL,
+            scope=OFFRES_SCOPE,
+            simulation=simulation
+        )
+        self.soft_skills_client = soft_skills_client
+
+    async def search_jobs(self, params, fields=None):
+        """Recherche d'offres, éventuellement réduites aux champs `fields` (voir OffresClient.search_jobs)."""
+        if self.simulation:
+            logging.info("Mode simulation: retourne des données de recherche fictives.")
+            return project(_simulated_search(), _search_fields(fields))
+        logging.info(f"Recherche d'offres avec les paramètres: {params}")
+        return await self._make_request('get', SEARCH_ENDPOINT, params=params, fields=_search_fields(fields))
+
+    async def aiter_search(self, params, window=MAX_WINDOW, limit=None, fields=None):
+        """
+        Parcourt toutes les offres d'une recherche (voir OffresClient.iter_search).
+        La fenêtre suivante est demandée dans une tâche pendant la consommation de la courante.
+        """
+        if self.simulation:
+            logging.info("Mode simulation: retourne des données de recherche fictives.")
+            for offer in project(_simulated_search()['resultats'][:limit], fields):
+                yield offer
+            return
+
+        bounds = window_bounds(0, window, limit=limit)
+        task = asyncio.ensure_future(self._search_window(params, bounds, fields)) if bounds else None
+        try:
+            while task is not None:
+                offers, total = await task
+                bounds = next_window(bounds, offers, total, window, limit)
+                task = asyncio.ensure_future(self._search_window(params, bounds, fields)) if bounds else None
+                for offer in offers:
+                    yield offer
+        finally:
+            if task is not None:
+                task.cancel()
+
+    async def search_all(self, params, window=MAX_WINDOW, limit=None, max_workers=None, fields=None):
+        """
+        Récupère toutes les offres d'une recherche en parallélisant les fenêtres
+        (voir OffresClient.search_all).
+        """
+        if self.simulation:
+            logging.info("Mode simulation: retourne des données de recherche fictives.")
+            return project(_simulated_search()['resultats'][:limit], fields)
+
+        bounds = window_bounds(0, window, limit=limit)
+        if bounds is None:
+            return []
+        offers, total = await self._search_window(params, bounds, fields)
+        if total is None:
+            # Total inconnu : on ne peut pas découper, lecture séquentielle
+            return [offer async for offer in self.aiter_search(params, window, limit, fields)]
+        windows = remaining_windows(bounds, offers, total, window, limit)
+        if not windows:
+            return offers
+
+        logging.info(f"Recherche d'offres: {total} résultats, {len(windows)} fenêtres restantes.")
+        semaphore = asyncio.Semaphore(max_workers or ClientConfig.MAX_CONCURRENCY)
+
+        async def fetch(b):
+            async with semaphore:
+                return (await self._search_window(params, b, fields))[0]
+
+        for page in await asyncio.gather(*(fetch(b) for b in windows)):
+            offers.extend(page)
+        return offers
+
+    async def _search_window(self, params, bounds, fields=None):
+        """Télécharge une fenêtre de résultats et retourne (offres, total)."""
+        logging.info(f"Recherche d'offres, fenêtre {bounds[0]}-{bounds[1]}: {params}")
+        search_fields = _search_fields(fields)
+        response = await self._send('get', SEARCH_ENDPOINT, fields=search_fields, params=range_params(params, bounds))
+        if response is None:
+            return [], 0
+        url = f"{self.base_url}{SEARCH_ENDPOINT}"
+        body = lambda: decode_json(response.content, search_fields)
+        return parse_search_page('get', url, response.status_code, response.headers, body, bounds[0])
+
+    async def get_job_details(self, job_id, fields=None):
+        if self.simulation:
+            logging.info(f"Mode simulation: retourne des détails fictifs pour l'offre {job_id}.")
+            return project(_simulated_details(job_id), fields)
+        logging.info(f"Récupération des détails pour l'offre: {job_id}")
+        return await self._make_request('get', f'/offres/{job_id}', fields=fields)
+
+    async def get_job_details_many(self, job_ids, max_workers=None, fields=None):
+        """
+        Récupère les détails de plusieurs offres (voir OffresClient.get_job_details_many).
+
+        Yields:
+            tuple: (job_id, détails ou None), au fur et à mesure des réponses.
+        """
+        missing = []
+        for job_id in _unique_ids(job_ids):
+            if self.simulation:
+                cached = project(_simulated_details(job_id), fields)
+            else:
+                cached = self._cached_json('get', f'/offres/{job_id}', fields=fields)
+            if cached is not None:
+                yield job_id, cached
+            else:
+                missing.append(job_id)
+        if not missing:
+            return
+
+        logging.info(f"Récupération des détails de {len(missing)} offres.")
+        semaphore = asyncio.Semaphore(max_workers or ClientConfig.MAX_CONCURRENCY)
+
+        async def fetch(job_id):
+            async with semaphore:
+                try:
+                    return job_id, await self.get_job_details(job_id, fields)
+                except FranceTravailAPIError as e:
+                    logging.error(f"Erreur lors de la récupération de l'offre {job_id}: {e}")
+                    return job_id, None
+
+        tasks = [asyncio.ensure_future(fetch(job_id)) for job_id in missing]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def analyze_cv_match(self, cv_text: str, job_id: str):
+        job_details = await self.get_job_details(job_id)
+        rome_code = _rome_code_for(job_id, job_details)
+        job_skills_data = await self.soft_skills_client.get_skills_for_job(rome_code)
+        return _score_cv_match(cv_text, job_details, rome_code, job_skills_data)
+
+
+class AsyncRomeoClient(AsyncBaseClient):
+    """
+    Client asynchrone pour l'API ROMEO v2.
+    """
+    api_name = 'romeo'
+    idempotent_endpoints = (PREDICTION_ENDPOINT,)
+    cache_ttls = ROMEO_CACHE_TTLS
+
+    def __init__(self, client_id=None, client_secret=None, simulation=False):
+        super().__init__(
+            client_id=client_id,
+            client_secret=client_secret,
+            base_url=ROMEO_BASE_URL,
+            scope=ROMEO_SCOPE,
+            simulation=simulation
+        )
+
+    async def predict_metiers(self, intitule: str, contexte: str = None, nb_results: int = 3):
+        """Prédit les appellations métier du ROME à partir d'un intitulé de poste."""
+        payload = _build_prediction_payload(intitule, contexte, nb_results)
+
+        logging.info(f"Recherche ROMEO pour l'intitulé : '{intitule}'")
+        return await self._make_request("POST", PREDICTION_ENDPOINT, json=payload)
+
+
+class AsyncLBBClient(AsyncBaseClient):
+    """
+    Client asynchrone pour l'API La Bonne Boite v1.
+    """
+    api_name = 'lbb'
+    cache_ttls = LBB_CACHE_TTLS
+
+    def __init__(self, client_id=None, client_secret=None, simulation=False):
+        load_dotenv()
+        resolved_client_id = client_id or os.getenv('FRANCE_TRAVAIL_CLIENT_ID')
+
+        super().__init__(
+            client_id=resolved_client_id,
+            client_secret=client_secret,
+            base_url=LBB_BASE_URL,
+            scope=_lbb_scope(resolved_client_id),
+            simulation=simulation
+        )
+
+    async def search_la_bonne_boite(self, rome_codes: str, latitude: float, longitude: float, distance: int = 10, naf_codes: str = None):
+        """Recherche les entreprises à fort potentiel d'embauche."""
+        if self.simulation:
+            logging.info("Mode simulation: retourne des données LBB fictives.")
+            return _simulated_companies()
+
+        params = _build_lbb_params(rome_codes, latitude, longitude, distance, naf_codes)
+
+        logging.info(f"Recherche La Bonne Boite avec les paramètres: {params}")
+        return await self._make_request('get', "/entreprises", params=params)
+
+
+class AsyncContexteTravailClient(AsyncBaseClient):
+    """
+    Client asynchrone pour l'API ROME V4.0 - Situations de travail.
+    """
+    api_name = 'contextes'
+    cache_ttls = CONTEXTES_CACHE_TTLS
+
+    def __init__(self, client_id: str, client_secret: str, simulation: bool = False):
+        super().__init__(
+            client_id=client_id,
+            client_secret=client_secret,
+            base_url=CONTEXTES_BASE_URL,
+            scope=CONTEXTES_SCOPE,
+            simulation=simulation
+        )
+
+    async def lister_contextes(self, champs: str = None):
+        """Récupère la liste de tous les contextes de travail."""
+        params = {'champs': champs} if champs else {}
+
+        logging.info("Récupération de la liste des contextes de travail.")
+        return await self._make_request("GET", CONTEXTES_ENDPOINT, params=params)
+
+    async def lire_contexte(self, code: str, champs: str = None):
+        """Récupère les détails d'un contexte de travail par son code."""
+        params = {'champs': champs} if champs else {}
+
+        logging.info(f"Récupération du contexte de travail pour le code: {code}")
+        return await self._make_request("GET", f"{CONTEXTES_ENDPOINT}/{code}", params=params)
+
+    async def lire_version(self):
+        """Récupère la version actuelle du référentiel ROME."""
+        logging.info("Récupération de la version du ROME.")
+        return await self._make_request("GET", VERSION_ENDPOINT)
@@ -4,14 +4,41 @@ import requests
 import logging
 import time
 from dotenv import load_dotenv
+from .config import ClientConfig
+from .session_pool import get_session
+from .token_cache import token_store
+from .rate_limiter import get_rate_limiter
+from .scheduler import scheduler_for
+from .retry import default_policy, retry_stats, parse_retry_after, is_idempotent, RETRYABLE_STATUSES
+from .response_cache import response_cache, cache_key, ttl_for, is_cacheable
+from .json_codec import loads, dumps
+from .projection import project
+from .singleflight import in_flight
+from .circuit_breaker import get_breaker
+from .exceptions import FranceTravailAPIError, RateLimitedError, UpstreamUnavailableError, CircuitOpenError
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+AUTH_URL = "https://entreprise.francetravail.fr/connexion/oauth2/access_token"
+AUTH_PARAMS = {'realm': '/partenaire'}
+AUTH_HEADERS = {'Content-Type': 'application/x-www-form-urlencoded'}
+# En-tête ajouté aux réponses périmées servies pendant une panne, et clé
+# correspondante dans le JSON retourné (valeur : raison de la dégradation)
+DEGRADED_HEADER = 'X-France-Travail-Degraded'
+DEGRADED_KEY = 'degraded_reason'
+
 class BaseClient:
     """
     Client de base pour interagir avec les API de France Travail.
     Gère l'authentification, les appels et la limitation de débit (rate limiting).
     """
+    # Nom de l'API, utilisé pour partager le quota entre instances (voir rate_limiter.API_QUOTAS)
+    api_name = 'default'
+    # Endpoints POST sans effet de bord, rejouables comme un GET
+    idempotent_endpoints = ()
+    # Durée de mise en cache (secondes) des réponses, par préfixe d'endpoint
+    cache_ttls = {}
+
     def __init__(self, client_id=None, client_secret=None, base_url=None, scope=None, simulation=False):
         load_dotenv()
         self.client_id = client_id or os.getenv('FRANCE_TRAVAIL_CLIENT_ID')
@@ -20,20 +47,36 @@ class BaseClient:
         if not self.client_id or not self.client_secret:
             raise ValueError("Les identifiants FRANCE_TRAVAIL_CLIENT_ID et FRANCE_TRAVAIL_CLIENT_SECRET sont requis.")
 
-        self.auth_url = "https://entreprise.francetravail.fr/connexion/oauth2/access_token"
-        self.base_url = base_url
+        self.auth_url = ClientConfig.resolve_url(AUTH_URL, auth=True)
+        self.base_url = ClientConfig.resolve_url(base_url)
         self.scope = scope
         
         self.access_token = None
         self.simulation = simulation
 
-        # Limite par défaut, peut être surchargée par les clients spécifiques
-        self.request_delay = 1.0 / 10  # 10 appels/seconde
-        self.last_request_time = 0
+        # Sessions partagées (keep-alive) entre toutes les instances appelant le même hôte
+        self.session = get_session(self.base_url)
+        self.auth_session = get_session(self.auth_url)
+        self.timeout = ClientConfig.get_timeout()
+
+        # Seau à jetons partagé par toutes les instances de la même API
+        self.rate_limiter = get_rate_limiter(self.api_name)
+        self.retry_policy = default_policy
+
+    def _authenticate(self, force=False):
+        """
+        Récupère un token d'accès via le cache partagé (token_store).
+        Un nouveau token n'est demandé à l'API que s'il est absent, proche de
+        l'expiration, ou si `force` est vrai (ex. après un 401).
+        """
+        if force:
+            token_store.invalidate(self.client_id, self.scope, self.access_token)
+        self.access_token = token_store.get_token(self.client_id, self.scope, self._fetch_token)
+        return bool(self.access_token)
 
-    def _authenticate(self):
+    def _fetch_token(self):
         """
-        S'authentifie auprès de l'API pour obtenir un token d'accès.
+        S'authentifie auprès de l'API et retourne la réponse OAuth (dict) ou None.
         """
         logging.info(f"Tentative d'authentification pour le scope: {self.scope}...")
         
@@ -43,51 +86,86 @@ class BaseClient:
             'client_secret': self.client_secret,
             'scope': self.scope
         }
-        
-        params = {
-            'realm': '/partenaire'
-        }
-        
-        headers = {
-            'Content-Type': 'application/x-www-form-urlencoded'
-        }
 
         try:
-            response = requests.post(self.auth_url, params=params, data=data, headers=headers, timeout=15)
+            response = self.auth_session.post(self.auth_url, params=AUTH_PARAMS, data=data, headers=AUTH_HEADERS, timeout=self.timeout)
             response.raise_for_status()
             
             token_data = response.json()
-            self.access_token = token_data.get('access_token')
             
-            if not self.access_token:
+            if not token_data.get('access_token'):
                 logging.error("Le token d'accès n'a pas été trouvé dans la réponse.")
-                return False
+                return None
                 
             logging.info("Authentification réussie.")
-            return True
+            return token_data
 
         except requests.exceptions.HTTPError as e:
             logging.error(f"Erreur HTTP lors de l'authentification: {e.response.status_code} - {e.response.text}")
-            return False
+            return None
         except Exception as e:
             logging.error(f"Une erreur inattendue est survenue lors de l'authentification: {e}")
-            return False
+            return None
 
-    def _make_request(self, method, endpoint, **kwargs):
+    def _send(self, method, endpoint, fields=None, **kwargs):
         """
-        Méthode générique pour effectuer des requêtes à l'API, avec gestion du rate limiting.
+        Retourne la réponse HTTP brute d'une requête, depuis le cache de réponses
+        si possible (voir `cache_ttls`), sinon depuis l'API. Les requêtes
+        idempotentes identiques émises simultanément partagent un seul appel.
+        Si l'API est indisponible (circuit ouvert, 5xx, erreur réseau), une
+        réponse périmée du cache est servie, marquée par DEGRADED_HEADER.
+        Avec `fields`, seule la projection de la réponse est mise en cache.
         """
-        if not self.access_token and not self._authenticate():
+        key = _request_key(self, method, endpoint, kwargs, fields)
+        if key is None:
+            return self._send_upstream(method, endpoint, **kwargs)
+
+        ttl, cached = _cache_lookup(self, key, endpoint)
+        if cached is not None and cached.is_fresh():
+            response_cache.record(self.api_name, 'hit')
+            return _requests_response(cached, f"{self.base_url}{endpoint}")
+        if cached is not None:
+            kwargs['headers'] = {**cached.validators(), **kwargs.get('headers', {})}
+
+        try:
+            return in_flight.do(key, lambda: self._send_and_store(method, endpoint, key, ttl, cached, fields, kwargs))
+        except (CircuitOpenError, UpstreamUnavailableError) as e:
+            if cached is None:
+                raise
+            return _requests_response(cached, f"{self.base_url}{endpoint}", _serve_stale(self.api_name, endpoint, e))
+
+    def _send_and_store(self, method, endpoint, key, ttl, cached, fields, kwargs):
+        """Appelle l'API puis met à jour le cache de réponses (si l'endpoint est mis en cache)."""
+        response = self._send_upstream(method, endpoint, **kwargs)
+        if response is None or not ttl:
+            return response
+        if cached is not None and response.status_code >= 500:
+            return _requests_response(cached, f"{self.base_url}{endpoint}", _serve_stale(self.api_name, endpoint))
+        content = _projected_content(response.status_code, response.content, fields)
+        if _cache_store(self.api_name, key, ttl, cached, response.status_code, response.headers, content):
+            return _requests_response(cached, f"{self.base_url}{endpoint}")
+        return response
+
+    def _cached_json(self, method, endpoint, fields=None, **kwargs):
+        """Retourne le JSON d'une réponse encore fraîche du cache, sans appel réseau, ou None."""
+        key = _request_key(self, method, endpoint, kwargs, fields)
+        ttl, cached = _cache_lookup(self, key, endpoint) if key else (0, None)
+        if cached is None or not cached.is_fresh() or not cached.content:
             return None
+        response_cache.record(self.api_name, 'hit')
+        return decode_json(cached.content, fields)
 
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        if elapsed < self.request_delay:
-            sleep_time = self.request_delay - elapsed
-            logging.info(f"Rate limiting: pause de {sleep_time:.2f}s.")
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+    def _send_upstream(self, method, endpoint, **kwargs):
+        """
+        Envoie une requête authentifiée et retourne la réponse HTTP brute.
+
+        Gère le rate limiting (par priorité, voir scheduler), la ré-authentification sur 401 et les nouvelles
+        tentatives (429 / 5xx / erreurs réseau) selon `self.retry_policy`.
+        Lève CircuitOpenError sans appel réseau si le disjoncteur de l'endpoint
+        est ouvert. Retourne None si l'authentification échoue.
+        """
+        if not self._authenticate():
+            return None
 
         url = f"{self.base_url}{endpoint}"
         headers = {'Authorization': f'Bearer {self.access_token}'}
@@ -95,26 +173,169 @@ class BaseClient:
         if 'headers' in kwargs:
             headers.update(kwargs['headers'])
         kwargs['headers'] = headers
+        kwargs.setdefault('timeout', self.timeout)
 
-        try:
-            response = requests.request(method, url, **kwargs)
-            
-            if response.status_code == 401:
+        breaker = get_breaker(self.api_name, endpoint)
+        retry = self.retry_policy.start(method, endpoint, self.idempotent_endpoints)
+        reauthenticated = False
+        while True:
+            try:
+                with breaker.attempt():
+                    scheduler_for(self.rate_limiter).acquire()
+                    response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                delay = retry.next_delay(None)
+                if delay is None:
+                    retry_stats.record_result(self.api_name, False)
+                    raise UpstreamUnavailableError(f"{method.upper()} {url} injoignable: {e}", url=url) from e
+                logging.warning(f"Erreur réseau pour {method.upper()} {url} ({e}), nouvel essai dans {delay:.2f}s.")
+                retry_stats.record_retry(self.api_name, None)
+                time.sleep(delay)
+                continue
+            breaker.record_status(response.status_code)
+
+            if response.status_code == 401 and not reauthenticated:
                 logging.warning("Token expiré (401). Tentative de ré-authentification.")
-                self.access_token = None
-                if self._authenticate():
+                reauthenticated = True
+                if self._authenticate(force=True):
                     kwargs['headers']['Authorization'] = f'Bearer {self.access_token}'
-                    response = requests.request(method, url, **kwargs)
+                    continue
 
+            if response.status_code in RETRYABLE_STATUSES:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                delay = retry.next_delay(response.status_code, retry_after)
+                if delay is not None:
+                    logging.warning(f"{response.status_code} pour {method.upper()} {url}, nouvel essai dans {delay:.2f}s.")
+                    retry_stats.record_retry(self.api_name, response.status_code)
+                    time.sleep(delay)
+                    continue
+
+            retry_stats.record_result(self.api_name, response.status_code not in RETRYABLE_STATUSES, response.status_code)
+            return response
+
+    def _make_request(self, method, endpoint, fields=None, **kwargs):
+        """
+        Méthode générique pour effectuer des requêtes à l'API, avec gestion du rate limiting.
+
+        Retourne le JSON décodé (réduit aux chemins `fields` s'ils sont donnés,
+        voir projection), ou None pour une erreur définitive (4xx, 204...).
+        Un dict servi depuis le cache pendant une panne porte la clé DEGRADED_KEY.
+        Lève RateLimitedError / UpstreamUnavailableError si l'API reste saturée ou
+        indisponible après les nouvelles tentatives, pour que l'appelant ne
+        confonde pas une panne passagère avec un résultat vide.
+        """
+        url = f"{self.base_url}{endpoint}"
+        try:
+            response = self._send(method, endpoint, fields=fields, **kwargs)
+            if response is None:
+                return None
+
+            raise_for_transient_status(method, url, response.status_code, response.headers, response.text)
             response.raise_for_status()
             
             if response.status_code == 204:
                 return None
-            return response.json()
+            return _flag_degraded(decode_json(response.content, fields), response.headers)
 
+        except FranceTravailAPIError:
+            raise
         except requests.exceptions.HTTPError as e:
             logging.error(f"Erreur HTTP pour {method.upper()} {url}: {e.response.status_code} - {e.response.text}")
             return None
         except Exception as e:
             logging.error(f"Erreur pour {method.upper()} {url}: {e}")
             return None
+
+
+def raise_for_transient_status(method, url, status_code, headers, text):
+    """Lève l'exception adaptée si la réponse finale est encore une erreur passagère."""
+    if status_code == 429:
+        logging.error(f"Quota dépassé pour {method.upper()} {url} après plusieurs essais.")
+        raise RateLimitedError(
+            f"Quota dépassé pour {method.upper()} {url}",
+            url=url,
+            retry_after=parse_retry_after(headers.get('Retry-After'))
+        )
+    if status_code in RETRYABLE_STATUSES:
+        logging.error(f"Erreur HTTP pour {method.upper()} {url}: {status_code} - {text}")
+        raise UpstreamUnavailableError(
+            f"{method.upper()} {url} indisponible ({status_code})",
+            status_code=status_code,
+            url=url
+        )
+
+
+def decode_json(content, fields=None):
+    """Décode une réponse (décodeur rapide si disponible) et applique la projection `fields`."""
+    return project(loads(content), fields)
+
+
+def _projected_content(status_code, content, fields):
+    """Contenu à mettre en cache : la projection de la réponse si `fields` est donné."""
+    if not fields or not content or status_code >= 300:
+        return content
+    try:
+        return dumps(decode_json(content, fields))
+    except ValueError:
+        return content
+
+
+def _request_key(client, method, endpoint, kwargs, fields=None):
+    """
+    Clé d'une requête idempotente (cache de réponses, regroupement), ou None :
+    les requêtes avec effet de bord ne sont ni mises en cache ni regroupées.
+    """
+    if not is_idempotent(method, endpoint, client.idempotent_endpoints):
+        return None
+    body = kwargs.get('json', kwargs.get('data'))
+    return cache_key(method, f"{client.base_url}{endpoint}", kwargs.get('params'), body, client.scope, fields)
+
+
+def _cache_lookup(client, key, endpoint):
+    """Retourne (ttl, réponse en cache) pour une requête, ou (0, None) si l'endpoint n'est pas mis en cache."""
+    ttl = ttl_for(endpoint, client.cache_ttls)
+    if not ttl:
+        return 0, None
+    return ttl, response_cache.get(key)
+
+
+def _cache_store(api_name, key, ttl, cached, status_code, headers, content):
+    """
+    Met à jour le cache après un appel à l'API.
+    Retourne True si la réponse en cache a été revalidée (304) et doit être servie.
+    """
+    if status_code == 304 and cached is not None:
+        response_cache.touch(key, ttl)
+        response_cache.record(api_name, 'revalidated')
+        return True
+    response_cache.record(api_name, 'miss')
+    if is_cacheable(status_code, headers):
+        response_cache.set(key, status_code, headers, content, ttl)
+    return False
+
+
+def _serve_stale(api_name, endpoint, error=None):
+    """Journalise le repli sur une réponse périmée et retourne l'en-tête de dégradation."""
+    reason = 'circuit_open' if isinstance(error, CircuitOpenError) else 'upstream_unavailable'
+    logging.warning(f"{api_name} {endpoint} indisponible ({reason}), réponse périmée servie depuis le cache.")
+    response_cache.record(api_name, 'stale')
+    return {DEGRADED_HEADER: reason}
+
+
+def _flag_degraded(data, headers):
+    """Ajoute la raison de la dégradation au JSON d'une réponse périmée."""
+    reason = headers.get(DEGRADED_HEADER)
+    if reason and isinstance(data, dict):
+        data[DEGRADED_KEY] = reason
+    return data
+
+
+def _requests_response(cached, url, extra_headers=None):
+    """Construit une réponse requests à partir d'une entrée du cache."""
+    response = requests.Response()
+    response.status_code = cached.status_code
+    response.headers.update(cached.headers)
+    response.headers.update(extra_headers or {})
+    response._content = cached.content
+    response.url = url
+    return response
@@ -0,0 +1,226 @@
+"""
+Enregistrement et rejeu des échanges HTTP ("cassettes").
+
+En mode "record", les réponses réelles des API sont écrites dans un fichier
+JSON compressé (gzip) ; en mode "replay", elles sont resservies sans aucun
+appel réseau, avec leur latence d'origine ou sans latence. Les benchmarks et
+tests de non-régression (analyze_cv_match, CVMatchingService,
+FranceTravailROME4API) tournent ainsi sur des données réalistes, de façon
+déterministe.
+
+Les tokens OAuth et les identifiants ne sont jamais enregistrés : le corps des
+demandes de token est ignoré et le token reçu est remplacé.
+
+Usage :
+    with use_cassette('tests/cassettes/matching.json.gz', mode='record'):
+        service.search_similar_jobs(...)
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+CASSETTE_VERSION = 1
+RECORDED_HEADERS = ('Content-Type', 'Content-Range', 'ETag', 'Last-Modified', 'Retry-After', 'Cache-Control')
+REDACTED_TOKEN = 'cassette-token'
+# En-têtes décrivant le corps transmis, faux une fois le corps décompressé par httpx
+DECODED_BODY_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+
+class CassetteMissError(LookupError):
+    """Aucune réponse enregistrée ne correspond à la requête rejouée."""
+
+
+def _is_token_request(url):
+    return urlsplit(url).path.endswith('/access_token')
+
+
+def interaction_key(method, url, body=None):
+    """Clé d'une requête : méthode, URL (paramètres triés) et empreinte du corps."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    url = urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))
+    if _is_token_request(url) or not body:
+        digest = ''
+    else:
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()[:16]
+    return f"{method.upper()} {url} {digest}".rstrip()
+
+
+class Cassette:
+    """
+    Ensemble d'échanges enregistrés.
+
+    Args:
+        path: Fichier de la cassette (.json.gz).
+        mode: "record" (appels réels enregistrés) ou "replay" (aucun appel réseau).
+        latency: "none" (réponses immédiates) ou "original" (latence enregistrée).
+    """
+
+    def __init__(self, path, mode='replay', latency='none'):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Mode de cassette inconnu: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self._interactions = {}
+        self._positions = {}
+        self._lock = threading.Lock()
+        if mode == 'replay':
+            self.load()
+
+    def load(self):
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        self._interactions = {}
+        for interaction in data.get('interactions', []):
+            self._interactions.setdefault(interaction['key'], []).append(interaction)
+        logging.info(f"Cassette chargée: {self.path} ({len(data.get('interactions', []))} échanges)")
+
+    def save(self):
+        """Écrit la cassette (mode record)."""
+        interactions = [i for group in self._interactions.values() for i in group]
+        interactions.sort(key=lambda i: i['seq'])
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with gzip.open(self.path, 'wt', encoding='utf-8') as f:
+            json.dump({'version': CASSETTE_VERSION, 'interactions': interactions}, f, ensure_ascii=False, separators=(',', ':'))
+        logging.info(f"Cassette enregistrée: {self.path} ({len(interactions)} échanges)")
+
+    def record(self, method, url, body, status_code, headers, content, elapsed):
+        """Ajoute un échange réel à la cassette."""
+        if _is_token_request(url) and status_code == 200:
+            token_data = json.loads(content)
+            token_data['access_token'] = REDACTED_TOKEN
+            content = json.dumps(token_data).encode('utf-8')
+        try:
+            text, encoding = content.decode('utf-8'), 'text'
+        except UnicodeDecodeError:
+            text, encoding = base64.b64encode(content).decode('ascii'), 'base64'
+        key = interaction_key(method, url, body)
+        with self._lock:
+            seq = sum(len(group) for group in self._interactions.values())
+            self._interactions.setdefault(key, []).append({
+                'seq': seq,
+                'key': key,
+                'status': status_code,
+                'headers': {name: headers[name] for name in RECORDED_HEADERS if headers.get(name)},
+                'body': text,
+                'encoding': encoding,
+                'elapsed': round(elapsed, 4),
+            })
+
+    def play(self, method, url, body=None):
+        """
+        Retourne l'échange enregistré pour la requête. Les réponses d'une même
+        requête sont resservies dans l'ordre, la dernière étant répétée.
+        """
+        key = interaction_key(method, url, body)
+        with self._lock:
+            group = self._interactions.get(key)
+            if not group:
+                raise CassetteMissError(f"Aucune réponse enregistrée pour {key}")
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            interaction = group[min(position, len(group) - 1)]
+        if self.latency == 'original' and interaction['elapsed']:
+            time.sleep(interaction['elapsed'])
+        return interaction
+
+    @staticmethod
+    def content_of(interaction):
+        if interaction['encoding'] == 'base64':
+            return base64.b64decode(interaction['body'])
+        return interaction['body'].encode('utf-8')
+
+
+class CassetteAdapter(HTTPAdapter):
+    """Adaptateur requests qui enregistre ou rejoue les échanges d'une cassette."""
+
+    def __init__(self, cassette, **kwargs):
+        self.cassette = cassette
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if self.cassette.mode == 'record':
+            start = time.monotonic()
+            response = super().send(request, **kwargs)
+            self.cassette.record(request.method, request.url, request.body, response.status_code,
+                                 response.headers, response.content, time.monotonic() - start)
+            return response
+
+        interaction = self.cassette.play(request.method, request.url, request.body)
+        response = requests.Response()
+        response.status_code = interaction['status']
+        response.headers = CaseInsensitiveDict(interaction['headers'])
+        response._content = Cassette.content_of(interaction)
+        response.url = request.url
+        response.request = request
+        response.reason = 'Replayed'
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+
+def cassette_transport(cassette):
+    """Transport httpx (asynchrone) qui enregistre ou rejoue les échanges d'une cassette."""
+    import httpx
+
+    class CassetteTransport(httpx.AsyncBaseTransport):
+        def __init__(self):
+            self._inner = httpx.AsyncHTTPTransport() if cassette.mode == 'record' else None
+
+        async def handle_async_request(self, request):
+            url = str(request.url)
+            body = await request.aread()
+            if self._inner is not None:
+                start = time.monotonic()
+                response = await self._inner.handle_async_request(request)
+                content = await response.aread()
+                cassette.record(request.method, url, body, response.status_code,
+                                response.headers, content, time.monotonic() - start)
+                # aread() a déjà décompressé le corps : la réponse rejouée ne doit plus le déclarer gzip
+                headers = [(name, value) for name, value in response.headers.multi_items()
+                           if name.lower() not in DECODED_BODY_HEADERS]
+                return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+            interaction = cassette.play(request.method, url, body)
+            return httpx.Response(interaction['status'], headers=interaction['headers'],
+                                  content=Cassette.content_of(interaction), request=request)
+
+        async def aclose(self):
+            if self._inner is not None:
+                await self._inner.aclose()
+
+    return CassetteTransport()
+
+
+@contextmanager
+def use_cassette(path, mode='replay', latency='none'):
+    """
+    Active une cassette pour toutes les sessions partagées (voir session_pool)
+    le temps du bloc ; en mode "record", elle est écrite à la sortie.
+    """
+    from .session_pool import install_cassette
+
+    cassette = Cassette(path, mode=mode, latency=latency)
+    install_cassette(cassette)
+    try:
+        yield cassette
+    finally:
+        install_cassette(None)
+        if mode == 'record':
+            cassette.save()
@@ -0,0 +1,159 @@
+"""
+Disjoncteurs (circuit breakers) par endpoint pour les API France Travail.
+
+Après `failure_threshold` échecs consécutifs (erreur réseau, timeout, 5xx),
+le disjoncteur s'ouvre : les appels suivants échouent immédiatement
+(CircuitOpenError) au lieu d'attendre le timeout. Après `recovery_timeout`
+secondes, un seul appel de test est autorisé (état semi-ouvert) : s'il
+réussit le circuit se referme, sinon il se rouvre pour une nouvelle période.
+Un appel qui échoue pour une autre raison (annulation, erreur de décodage...)
+compte aussi comme un échec (voir `attempt`), et un appel de test resté sans
+réponse pendant `recovery_timeout` secondes est abandonné.
+
+Les identifiants dans les chemins (/offres/194DZZT, /metier/M1805) sont
+normalisés pour qu'un même endpoint partage un seul disjoncteur.
+"""
+
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from .config import ClientConfig
+from .exceptions import CircuitOpenError
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+_ID_SEGMENT_RE = re.compile(r'/[^/]*\d[^/]*(?=/|$)')
+
+
+def endpoint_key(endpoint):
+    """Normalise un chemin : les segments contenant des chiffres deviennent {id}."""
+    return _ID_SEGMENT_RE.sub('/{id}', endpoint.split('?', 1)[0])
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur d'un endpoint (thread-safe).
+
+    Args:
+        name: Nom affiché dans les journaux et les métriques.
+        failure_threshold: Échecs consécutifs avant ouverture.
+        recovery_timeout: Durée (secondes) d'ouverture avant un appel de test.
+    """
+
+    def __init__(self, name, failure_threshold=None, recovery_timeout=None):
+        self.name = name
+        self.failure_threshold = failure_threshold or ClientConfig.CIRCUIT_FAILURE_THRESHOLD
+        self.recovery_timeout = recovery_timeout or ClientConfig.CIRCUIT_RECOVERY_TIMEOUT
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+        self._probe_started = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Lève CircuitOpenError si l'appel doit échouer immédiatement."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            now = time.monotonic()
+            remaining = self.opened_at + self.recovery_timeout - now
+            if self.state == OPEN and remaining <= 0:
+                logging.info(f"Disjoncteur {self.name}: semi-ouvert, appel de test.")
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == HALF_OPEN and self._probe_in_flight:
+                remaining = self._probe_started + self.recovery_timeout - now
+                if remaining <= 0:
+                    logging.warning(f"Disjoncteur {self.name}: appel de test sans réponse, nouvel essai.")
+                    self._probe_in_flight = False
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self._probe_started = now
+                return
+        raise CircuitOpenError(f"Circuit ouvert pour {self.name}", retry_after=max(0.0, remaining))
+
+    @contextmanager
+    def attempt(self):
+        """
+        Encadre un appel : allow(), puis enregistre un échec si le bloc lève
+        une exception quelconque (annulation comprise), pour ne jamais laisser
+        l'appel de test d'un circuit semi-ouvert en suspens.
+        """
+        self.allow()
+        try:
+            yield
+        except BaseException:
+            self.record_failure()
+            raise
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logging.info(f"Disjoncteur {self.name}: refermé.")
+            self.state = CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    logging.warning(f"Disjoncteur {self.name}: ouvert après {self.failures} échecs.")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def record_status(self, status_code):
+        """Enregistre le résultat d'une réponse HTTP (5xx = échec)."""
+        if status_code >= 500:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def snapshot(self):
+        with self._lock:
+            return {'state': self.state, 'failures': self.failures}
+
+
+_breakers = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(api_name, endpoint):
+    """Retourne le disjoncteur partagé de l'endpoint (créé au premier appel)."""
+    name = f"{api_name}:{endpoint_key(endpoint)}"
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _registry_lock:
+            breaker = _breakers.setdefault(name, CircuitBreaker(name))
+    return breaker
+
+
+def get_circuit_states():
+    """État de tous les disjoncteurs, pour les métriques."""
+    with _registry_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+
+def reset_breakers():
+    with _registry_lock:
+        _breakers.clear()
+
+
+def guarded_request(session, method, url, breaker, **kwargs):
+    """
+    Effectue `session.request(...)` derrière un disjoncteur : échoue immédiatement
+    si le circuit est ouvert, et compte les exceptions et les 5xx comme des échecs.
+    """
+    with breaker.attempt():
+        response = session.request(method, url, **kwargs)
+    breaker.record_status(response.status_code)
+    return response
@@ -0,0 +1,95 @@
+"""
+Configuration réseau partagée par les clients de l'API France Travail.
+"""
+
+import os
+from urllib.parse import urlsplit, urlunsplit
+from dotenv import load_dotenv
+
+# Charger les variables d'environnement depuis le fichier .env
+load_dotenv()
+
+
+class ClientConfig:
+    """Paramètres des connexions HTTP vers France Travail"""
+
+    # Pool de connexions (par hôte)
+    POOL_CONNECTIONS = int(os.getenv('FRANCE_TRAVAIL_POOL_CONNECTIONS', 10))
+    POOL_MAXSIZE = int(os.getenv('FRANCE_TRAVAIL_POOL_MAXSIZE', 20))
+    POOL_BLOCK = os.getenv('FRANCE_TRAVAIL_POOL_BLOCK', '0') == '1'
+    KEEP_ALIVE = os.getenv('FRANCE_TRAVAIL_KEEP_ALIVE', '1') != '0'
+
+    # Redirection des appels vers un autre hôte (ex. python -m france_travail.mock_server) ;
+    # seuls le schéma et l'hôte changent, les chemins des API sont conservés
+    API_URL = os.getenv('FRANCE_TRAVAIL_API_URL')
+    AUTH_URL = os.getenv('FRANCE_TRAVAIL_AUTH_URL')
+
+    # Cassette d'échanges HTTP : fichier, mode ("record" / "replay") et latence ("none" / "original")
+    CASSETTE = os.getenv('FRANCE_TRAVAIL_CASSETTE')
+    CASSETTE_MODE = os.getenv('FRANCE_TRAVAIL_CASSETTE_MODE', 'replay')
+    CASSETTE_LATENCY = os.getenv('FRANCE_TRAVAIL_CASSETTE_LATENCY', 'none')
+
+    # Timeouts en secondes
+    CONNECT_TIMEOUT = float(os.getenv('FRANCE_TRAVAIL_CONNECT_TIMEOUT', 5))
+    READ_TIMEOUT = float(os.getenv('FRANCE_TRAVAIL_READ_TIMEOUT', 15))
+
+    # Cache local (tokens OAuth, etc.)
+    CACHE_DIR = os.path.expanduser(os.getenv('FRANCE_TRAVAIL_CACHE_DIR', '~/.cache/france_travail'))
+    TOKEN_CACHE = os.getenv('FRANCE_TRAVAIL_TOKEN_CACHE', '1') != '0'
+    # Marge (secondes) avant expiration à partir de laquelle un token est renouvelé
+    TOKEN_REFRESH_MARGIN = float(os.getenv('FRANCE_TRAVAIL_TOKEN_REFRESH_MARGIN', 60))
+
+    # Cache disque des réponses HTTP (TTL par endpoint, voir response_cache)
+    RESPONSE_CACHE = os.getenv('FRANCE_TRAVAIL_RESPONSE_CACHE', '1') != '0'
+
+    # Décodage JSON rapide (orjson, si installé) des réponses
+    FAST_JSON = os.getenv('FRANCE_TRAVAIL_FAST_JSON', '1') != '0'
+
+    # Cache des profils de demande du marché de CVMatchingService (par signature de mots-clés)
+    MARKET_PROFILE_TTL = float(os.getenv('FRANCE_TRAVAIL_MARKET_PROFILE_TTL', 3600))
+    MARKET_PROFILE_CACHE_SIZE = int(os.getenv('FRANCE_TRAVAIL_MARKET_PROFILE_CACHE_SIZE', 256))
+
+    # Entrepôt local des offres synchronisées (voir offer_store / offer_sync)
+    OFFER_STORE = os.path.expanduser(os.getenv('FRANCE_TRAVAIL_OFFER_STORE', os.path.join(CACHE_DIR, 'offers.sqlite')))
+
+    # Limitation de débit : "memory" (par processus) ou "file" (partagé entre workers)
+    RATE_LIMIT_BACKEND = os.getenv('FRANCE_TRAVAIL_RATE_LIMIT_BACKEND', 'memory')
+
+    # Nombre maximal de requêtes simultanées pour les appels groupés (fenêtres, détails)
+    MAX_CONCURRENCY = int(os.getenv('FRANCE_TRAVAIL_MAX_CONCURRENCY', 4))
+
+    # Part minimale des jetons garantie à chaque priorité quand les files sont pleines (voir scheduler)
+    SCHEDULER_MIN_SHARES = {
+        'interactive': float(os.getenv('FRANCE_TRAVAIL_INTERACTIVE_MIN_SHARE', 0.5)),
+        'batch': float(os.getenv('FRANCE_TRAVAIL_BATCH_MIN_SHARE', 0.2)),
+    }
+
+    # Disjoncteurs par endpoint : échecs consécutifs avant ouverture, durée d'ouverture (secondes)
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('FRANCE_TRAVAIL_CIRCUIT_FAILURE_THRESHOLD', 5))
+    CIRCUIT_RECOVERY_TIMEOUT = float(os.getenv('FRANCE_TRAVAIL_CIRCUIT_RECOVERY_TIMEOUT', 30))
+
+    @classmethod
+    def resolve_url(cls, url, auth=False):
+        """Applique la redirection FRANCE_TRAVAIL_API_URL / FRANCE_TRAVAIL_AUTH_URL à une URL"""
+        override = (cls.AUTH_URL or cls.API_URL) if auth else cls.API_URL
+        if not override or not url:
+            return url
+        parts, target = urlsplit(url), urlsplit(override)
+        return urlunsplit((target.scheme, target.netloc, target.path.rstrip('/') + parts.path, parts.query, parts.fragment))
+
+    @classmethod
+    def get_timeout(cls):
+        """Retourne le couple (connexion, lecture) attendu par requests"""
+        return (cls.CONNECT_TIMEOUT, cls.READ_TIMEOUT)
+
+    @classmethod
+    def get_token_cache_path(cls):
+        """Chemin du cache disque des tokens, ou None s'il est désactivé"""
+        if not cls.TOKEN_CACHE:
+            return None
+        return os.path.join(cls.CACHE_DIR, 'tokens.json')
+
+    @classmethod
+    def get_response_cache_path(cls):
+        """Chemin de la base SQLite du cache de réponses"""
+        return os.path.join(cls.CACHE_DIR, 'responses.sqlite')
@@ -1,16 +1,30 @@
 import logging
 from .base_client import BaseClient
 
+CONTEXTES_BASE_URL = "https://api.francetravail.io/partenaire/rome-contextes-travail"
+# Les scopes requis par l'API
+CONTEXTES_SCOPE = "api_rome-contextes-travailv1,nomenclatureRome"
+CONTEXTES_ENDPOINT = "/v1/situations-travail/contexte-travail"
+VERSION_ENDPOINT = "/v1/situations-travail/version"
+# Le référentiel ROME évolue rarement
+CONTEXTES_CACHE_TTLS = {CONTEXTES_ENDPOINT: 7 * 24 * 3600, VERSION_ENDPOINT: 24 * 3600}
+
 class ContexteTravailClient(BaseClient):
     """
     Client pour l'API ROME V4.0 - Situations de travail.
     Permet de récupérer des informations sur les contextes et conditions de travail.
     """
+    api_name = 'contextes'
+    cache_ttls = CONTEXTES_CACHE_TTLS
+
     def __init__(self, client_id: str, client_secret: str, simulation: bool = False):
-        base_url = "https://api.francetravail.io/partenaire/rome-contextes-travail"
-        # Les scopes requis par l'API
-        scope = "api_rome-contextes-travailv1,nomenclatureRome"
-        super().__init__(base_url, client_id, client_secret, scope, simulation)
+        super().__init__(
+            client_id=client_id,
+            client_secret=client_secret,
+            base_url=CONTEXTES_BASE_URL,
+            scope=CONTEXTES_SCOPE,
+            simulation=simulation
+        )
 
     def lister_contextes(self, champs: str = None):
         """
@@ -23,7 +37,7 @@ class ContexteTravailClient(BaseClient):
         Returns:
             list: Une liste de dictionnaires, chaque dictionnaire représentant un contexte de travail.
         """
-        endpoint = "/v1/situations-travail/contexte-travail"
+        endpoint = CONTEXTES_ENDPOINT
         params = {}
         if champs:
             params['champs'] = champs
@@ -42,7 +56,7 @@ class ContexteTravailClient(BaseClient):
         Returns:
             dict: Un dictionnaire contenant les détails du contexte de travail.
         """
-        endpoint = f"/v1/situations-travail/contexte-travail/{code}"
+        endpoint = f"{CONTEXTES_ENDPOINT}/{code}"
         params = {}
         if champs:
             params['champs'] = champs
@@ -57,6 +71,6 @@ class ContexteTravailClient(BaseClient):
         Returns:
             dict: Un dictionnaire avec la version et la date de modification.
         """
-        endpoint = "/v1/situations-travail/version"
+        endpoint = VERSION_ENDPOINT
         logging.info("Récupération de la version du ROME.")
         return self._make_request("GET", endpoint)
@@ -0,0 +1,32 @@
+"""
+Exceptions levées par les clients de l'API France Travail.
+"""
+
+
+class FranceTravailAPIError(Exception):
+    """Erreur générique d'un appel à l'API France Travail."""
+
+    def __init__(self, message, status_code=None, url=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.url = url
+
+
+class RateLimitedError(FranceTravailAPIError):
+    """Le quota de l'API est dépassé (429) et les nouvelles tentatives sont épuisées."""
+
+    def __init__(self, message, status_code=429, url=None, retry_after=None):
+        super().__init__(message, status_code=status_code, url=url)
+        self.retry_after = retry_after
+
+
+class UpstreamUnavailableError(FranceTravailAPIError):
+    """L'API est indisponible (5xx, erreur réseau) après épuisement des tentatives."""
+
+
+class CircuitOpenError(FranceTravailAPIError):
+    """Le disjoncteur de l'endpoint est ouvert : l'appel échoue immédiatement."""
+
+    def __init__(self, message, url=None, retry_after=None):
+        super().__init__(message, url=url)
+        self.retry_after = retry_after
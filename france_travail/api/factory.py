@@ -0,0 +1,52 @@
+"""
+Construction paresseuse des clients France Travail.
+
+Chaque client est importé et construit au premier usage, puis réutilisé par
+tout le processus : une commande CLI qui n'appelle que ROMEO n'importe ni ne
+construit les quatre autres clients, et un serveur démarre sans identifiants
+tant qu'aucune route ne les utilise.
+"""
+
+import importlib
+import threading
+
+# Nom du client -> (module, classe)
+CLIENTS = {
+    'offres': ('.offres_client', 'OffresClient'),
+    'soft_skills': ('.soft_skills_client', 'SoftSkillsClient'),
+    'lbb': ('.lbb_client', 'LBBClient'),
+    'romeo': ('.romeo_client', 'RomeoClient'),
+    'contextes': ('.contexte_travail_client', 'ContexteTravailClient'),
+}
+
+_clients = {}
+_lock = threading.RLock()
+
+
+def get_client(name, simulation=False):
+    """
+    Retourne le client partagé `name` (voir CLIENTS), créé au premier appel.
+
+    Raises:
+        KeyError: si le nom de client est inconnu.
+        ValueError: si les identifiants FRANCE_TRAVAIL_CLIENT_ID / SECRET manquent.
+    """
+    key = (name, simulation)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                module, class_name = CLIENTS[name]
+                client_class = getattr(importlib.import_module(module, __package__), class_name)
+                # Identifiants lus dans l'environnement (voir BaseClient)
+                kwargs = {'client_id': None, 'client_secret': None, 'simulation': simulation}
+                if name == 'offres':
+                    kwargs['soft_skills_client'] = get_client('soft_skills', simulation)
+                client = _clients[key] = client_class(**kwargs)
+    return client
+
+
+def reset_clients():
+    with _lock:
+        _clients.clear()
@@ -0,0 +1,36 @@
+"""
+Décodage JSON des réponses France Travail.
+
+orjson (déclaré dans requirements.txt) décode et encode les réponses : les
+pages de /offres/search sont de gros documents imbriqués et le module json
+standard y passe l'essentiel du temps CPU des workers de synchronisation.
+Le module json reste utilisé si orjson n'est pas installé ou si
+FRANCE_TRAVAIL_FAST_JSON=0.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson absent : module json standard
+    orjson = None
+
+from .config import ClientConfig
+
+
+def fast_json_enabled():
+    return orjson is not None and ClientConfig.FAST_JSON
+
+
+def loads(content):
+    """Décode un document JSON (bytes ou str)."""
+    if fast_json_enabled():
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def dumps(data) -> bytes:
+    """Encode un document JSON en bytes UTF-8 (format compact)."""
+    if fast_json_enabled():
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
@@ -4,22 +4,49 @@ import os
 from dotenv import load_dotenv
 from .base_client import BaseClient
 
+LBB_BASE_URL = "https://api.emploi-store.fr/partenaire/labonneboite/v1"
+LBB_CACHE_TTLS = {"/entreprises": 3600}
+
+
+def _lbb_scope(client_id):
+    return f"api_labonneboitev1 application_{client_id}"
+
+
+def _simulated_companies():
+    return {"entreprises": [{"nom": "Super Boite (simulée)", "siret": "12345678901234"}]}
+
+
+def _build_lbb_params(rome_codes, latitude, longitude, distance, naf_codes=None):
+    params = {
+        "rome_codes": rome_codes,
+        "latitude": latitude,
+        "longitude": longitude,
+        "distance": distance,
+    }
+    if naf_codes:
+        params["naf_codes"] = naf_codes
+    return params
+
 class LBBClient(BaseClient):
     """
     Client pour l'API La Bonne Boite v1 de France Travail.
     """
-    def __init__(self, client_id=None, client_secret=None, simulation=False):
+    api_name = 'lbb'
+    cache_ttls = LBB_CACHE_TTLS
+
+    def __init__(self, client_id=None, client_secret=None, simulation=False, local_index=True):
         load_dotenv()
         resolved_client_id = client_id or os.getenv('FRANCE_TRAVAIL_CLIENT_ID')
 
         super().__init__(
             client_id=resolved_client_id,
             client_secret=client_secret,
-            base_url="https://api.emploi-store.fr/partenaire/labonneboite/v1",
-            scope=f"api_labonneboitev1 application_{resolved_client_id}",
+            base_url=LBB_BASE_URL,
+            scope=_lbb_scope(resolved_client_id),
             simulation=simulation
         )
-        self.request_delay = 1.0
+        # Réponses servies depuis les entreprises déjà connues (voir geo_index)
+        self.local_index = local_index
 
     def search_la_bonne_boite(self, rome_codes: str, latitude: float, longitude: float, distance: int = 10, naf_codes: str = None):
         """
@@ -34,17 +61,23 @@ class LBBClient(BaseClient):
         """
         if self.simulation:
             logging.info("Mode simulation: retourne des données LBB fictives.")
-            return {"entreprises": [{"nom": "Super Boite (simulée)", "siret": "12345678901234"}]}
+            return _simulated_companies()
+
+        # Sans filtre NAF, une zone déjà interrogée est servie localement
+        locator = None
+        if self.local_index and not naf_codes:
+            from ..geo_index import get_company_locator
+            locator = get_company_locator()
+            companies = locator.search(rome_codes, latitude, longitude, distance)
+            if companies is not None:
+                logging.info(f"La Bonne Boite: {len(companies)} entreprises servies localement.")
+                return {"companies": companies, "companies_count": len(companies)}
 
         endpoint = "/entreprises"
-        params = {
-            "rome_codes": rome_codes,
-            "latitude": latitude,
-            "longitude": longitude,
-            "distance": distance,
-        }
-        if naf_codes:
-            params["naf_codes"] = naf_codes
-            
+        params = _build_lbb_params(rome_codes, latitude, longitude, distance, naf_codes)
+
         logging.info(f"Recherche La Bonne Boite avec les paramètres: {params}")
-        return self._make_request('get', endpoint, params=params)
+        result = self._make_request('get', endpoint, params=params)
+        if locator is not None and result and 'companies' in result:
+            locator.record(rome_codes, latitude, longitude, distance, result['companies'])
+        return result
@@ -1,80 +1,275 @@
 # /Users/davidravin/Desktop/Api_Final/france_travail/api/offres_client.py
 import logging
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict
-from .base_client import BaseClient
+from .base_client import BaseClient, decode_json, raise_for_transient_status
+from .config import ClientConfig
+from .exceptions import FranceTravailAPIError
+from .scheduler import propagate_priority
+from .projection import project, prefixed
+from .pagination import SEARCH_ENDPOINT, MAX_WINDOW, window_bounds, next_window, remaining_windows, range_params, parse_search_page
+
+OFFRES_BASE_URL = "https://api.emploi-store.fr/partenaire/offresdemploi/v2"
+OFFRES_SCOPE = "api_offresdemploiv2 o2dsoffre"
+# Les offres sont volatiles : quelques minutes de cache seulement
+OFFRES_CACHE_TTLS = {"/offres/search": 300, "/offres/": 900}
+
+
+def _simulated_search():
+    return {"resultats": [{"id": "sim-123", "intitule": "Développeur Python (simulé)"}]}
+
+
+def _simulated_details(job_id):
+    return {"id": job_id, "intitule": "Titre (simulé)", "description": "Description simulée."}
+
+
+def _search_fields(fields):
+    """Projection d'une page de recherche à partir des champs voulus pour chaque offre."""
+    return prefixed(fields, 'resultats')
+
+
+def _unique_ids(job_ids):
+    """Dédoublonne les identifiants d'offres en conservant l'ordre."""
+    return list(dict.fromkeys(job_ids))
+
 
 class OffresClient(BaseClient):
     """
     Client pour l'API Offres d'emploi v2 de France Travail.
     """
+    api_name = 'offres'
+    cache_ttls = OFFRES_CACHE_TTLS
+
     def __init__(self, soft_skills_client, client_id=None, client_secret=None, simulation=False):
         super().__init__(
             client_id=client_id,
             client_secret=client_secret,
-            base_url="https://api.emploi-store.fr/partenaire/offresdemploi/v2",
-            scope="api_offresdemploiv2 o2dsoffre",
+            base_url=OFFRES_BASE_URL,
+            scope=OFFRES_SCOPE,
             simulation=simulation
         )
-        self.request_delay = 1.0 / 10
         self.soft_skills_client = soft_skills_client
 
-    def search_jobs(self, params):
+    def search_jobs(self, params, fields=None):
+        """
+        Recherche d'offres. Avec `fields` (ex. projection.OFFER_SUMMARY_FIELDS),
+        chaque offre est réduite à ces champs et les autres clés de la réponse
+        (filtresPossibles...) sont omises.
+        """
         if self.simulation:
             logging.info("Mode simulation: retourne des données de recherche fictives.")
-            return {"resultats": [{"id": "sim-123", "intitule": "Développeur Python (simulé)"}]}
+            return project(_simulated_search(), _search_fields(fields))
         logging.info(f"Recherche d'offres avec les paramètres: {params}")
-        return self._make_request('get', '/offres/search', params=params)
+        return self._make_request('get', SEARCH_ENDPOINT, params=params, fields=_search_fields(fields))
+
+    def iter_search(self, params, window=MAX_WINDOW, limit=None, fields=None, strict=False):
+        """
+        Parcourt toutes les offres d'une recherche, fenêtre par fenêtre.
+
+        La fenêtre suivante est téléchargée pendant que l'appelant consomme la
+        courante ; si l'appelant s'arrête, plus aucune fenêtre n'est demandée.
+        Le paramètre `range` éventuel de `params` est ignoré.
+
+        Args:
+            params: Paramètres de recherche (motsCles, codeROME, ...).
+            window: Taille des fenêtres (au plus 150, limite de l'API).
+            limit: Nombre maximal d'offres à retourner.
+            fields: Champs à conserver pour chaque offre (toutes les clés par défaut).
+            strict: Lève FranceTravailAPIError si une fenêtre échoue (authentification, erreur HTTP).
+
+        Yields:
+            dict: Les offres, dans l'ordre de l'API.
+        """
+        if self.simulation:
+            logging.info("Mode simulation: retourne des données de recherche fictives.")
+            yield from project(_simulated_search()['resultats'][:limit], fields)
+            return
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        bounds = window_bounds(0, window, limit=limit)
+        fetch = propagate_priority(lambda b: self._search_window(params, b, fields, strict))
+        future = executor.submit(fetch, bounds) if bounds else None
+        try:
+            while future is not None:
+                offers, total = future.result()
+                bounds = next_window(bounds, offers, total, window, limit)
+                future = executor.submit(fetch, bounds) if bounds else None
+                yield from offers
+        finally:
+            if future is not None:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def search_all(self, params, window=MAX_WINDOW, limit=None, max_workers=None, fields=None, strict=False):
+        """
+        Récupère toutes les offres d'une recherche en parallélisant les fenêtres.
+
+        La première fenêtre donne le total (Content-Range) ; les suivantes sont
+        téléchargées simultanément (au plus `max_workers` à la fois, dans la
+        limite du quota partagé de l'API) puis fusionnées dans l'ordre.
+        `fields` réduit chaque offre aux champs donnés (voir projection).
+        Avec `strict`, un échec d'authentification ou une erreur HTTP lève
+        FranceTravailAPIError au lieu de donner une liste incomplète.
+
+        Returns:
+            list: Les offres, dans l'ordre de l'API.
+        """
+        if self.simulation:
+            logging.info("Mode simulation: retourne des données de recherche fictives.")
+            return project(_simulated_search()['resultats'][:limit], fields)
+
+        bounds = window_bounds(0, window, limit=limit)
+        if bounds is None:
+            return []
+        offers, total = self._search_window(params, bounds, fields, strict)
+        if total is None:
+            # Total inconnu : on ne peut pas découper, lecture séquentielle
+            return list(self.iter_search(params, window, limit, fields, strict))
+        windows = remaining_windows(bounds, offers, total, window, limit)
+        if not windows:
+            return offers
 
-    def get_job_details(self, job_id):
+        logging.info(f"Recherche d'offres: {total} résultats, {len(windows)} fenêtres restantes.")
+        with ThreadPoolExecutor(max_workers=max_workers or ClientConfig.MAX_CONCURRENCY) as executor:
+            fetch = propagate_priority(lambda b: self._search_window(params, b, fields, strict)[0])
+            pages = executor.map(fetch, windows)
+            for page in pages:
+                offers.extend(page)
+        return offers
+
+    def count_search(self, params):
+        """
+        Nombre total d'offres d'une recherche (une seule offre est téléchargée).
+        Lève FranceTravailAPIError si l'API ne permet pas de le connaître
+        (authentification refusée, erreur HTTP) plutôt que de retourner 0.
+        """
+        if self.simulation:
+            return len(_simulated_search()['resultats'])
+        offers, total = self._search_window(params, (0, 0), ('id',), strict=True)
+        return len(offers) if total is None else total
+
+    def _search_window(self, params, bounds, fields=None, strict=False):
+        """
+        Télécharge une fenêtre de résultats et retourne (offres, total).
+        Avec `strict`, un échec d'authentification ou une erreur HTTP lève
+        FranceTravailAPIError au lieu de donner une fenêtre vide.
+        """
+        logging.info(f"Recherche d'offres, fenêtre {bounds[0]}-{bounds[1]}: {params}")
+        search_fields = _search_fields(fields)
+        response = self._send('get', SEARCH_ENDPOINT, fields=search_fields, params=range_params(params, bounds))
+        url = f"{self.base_url}{SEARCH_ENDPOINT}"
+        if response is None:
+            if strict:
+                raise FranceTravailAPIError(f"Authentification impossible pour GET {url}", url=url)
+            return [], 0
+        if strict and response.status_code >= 400:
+            raise_for_transient_status('get', url, response.status_code, response.headers, response.text)
+            raise FranceTravailAPIError(f"Erreur HTTP pour GET {url}: {response.status_code}",
+                                        status_code=response.status_code, url=url)
+        body = lambda: decode_json(response.content, search_fields)
+        return parse_search_page('get', url, response.status_code, response.headers, body, bounds[0])
+
+    def get_job_details(self, job_id, fields=None):
         if self.simulation:
             logging.info(f"Mode simulation: retourne des détails fictifs pour l'offre {job_id}.")
-            return {"id": job_id, "intitule": "Titre (simulé)", "description": "Description simulée."}
+            return project(_simulated_details(job_id), fields)
         logging.info(f"Récupération des détails pour l'offre: {job_id}")
-        return self._make_request('get', f'/offres/{job_id}')
+        return self._make_request('get', f'/offres/{job_id}', fields=fields)
+
+    def get_job_details_many(self, job_ids, max_workers=None, fields=None):
+        """
+        Récupère les détails de plusieurs offres.
+
+        Les identifiants sont dédoublonnés, les offres déjà en cache sont servies
+        immédiatement et les autres sont téléchargées en parallèle (au plus
+        `max_workers` à la fois, dans la limite du quota de l'API).
+        `fields` réduit chaque offre aux champs donnés (voir projection).
+
+        Yields:
+            tuple: (job_id, détails ou None), au fur et à mesure des réponses.
+        """
+        missing = []
+        for job_id in _unique_ids(job_ids):
+            if self.simulation:
+                cached = project(_simulated_details(job_id), fields)
+            else:
+                cached = self._cached_json('get', f'/offres/{job_id}', fields=fields)
+            if cached is not None:
+                yield job_id, cached
+            else:
+                missing.append(job_id)
+        if not missing:
+            return
+
+        logging.info(f"Récupération des détails de {len(missing)} offres.")
+        executor = ThreadPoolExecutor(max_workers=max_workers or ClientConfig.MAX_CONCURRENCY)
+        fetch = propagate_priority(lambda job_id: self.get_job_details(job_id, fields))
+        futures = {executor.submit(fetch, job_id): job_id for job_id in missing}
+        try:
+            for future in as_completed(futures):
+                job_id = futures[future]
+                try:
+                    yield job_id, future.result()
+                except FranceTravailAPIError as e:
+                    logging.error(f"Erreur lors de la récupération de l'offre {job_id}: {e}")
+                    yield job_id, None
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     def analyze_cv_match(self, cv_text: str, job_id: str):
         job_details = self.get_job_details(job_id)
-        if not job_details or not job_details.get('romeCode'):
-            raise ValueError(f"Impossible de récupérer le code ROME pour l'offre {job_id}.")
-
-        rome_code = job_details['romeCode']
+        rome_code = _rome_code_for(job_id, job_details)
         job_skills_data = self.soft_skills_client.get_skills_for_job(rome_code)
+        return _score_cv_match(cv_text, job_details, rome_code, job_skills_data)
+
+
+def _rome_code_for(job_id, job_details):
+    """Retourne le code ROME d'une offre ou lève ValueError s'il est absent."""
+    if not job_details or not job_details.get('romeCode'):
+        raise ValueError(f"Impossible de récupérer le code ROME pour l'offre {job_id}.")
+    return job_details['romeCode']
+
+
+def _score_cv_match(cv_text: str, job_details: Dict, rome_code: str, job_skills_data: Dict):
+    """
+    Calcule le taux de matching d'un CV avec les soft skills d'un métier.
+    Partagé par les clients synchrone et asynchrone.
+    """
+    if not job_skills_data or 'skills' not in job_skills_data:
+        raise ValueError(f"Impossible de récupérer les soft skills pour le code ROME {rome_code}.")
+
+    job_skills = job_skills_data['skills']
+    cv_text_lower = cv_text.lower()
+    
+    detected_skills = {}
+    
+    # Calculer le poids total des compétences requises
+    total_weight = sum(s_data.get('score', 0) for s_key, s_data in job_skills.items())
+
+    # Détecter les compétences du CV
+    for skill_key, skill_data in job_skills.items():
+        skill_summary = skill_data.get('summary')
+        if skill_summary and skill_summary.lower() in cv_text_lower:
+            detected_skills[skill_summary] = skill_data.get('score')
+
+    # Calculer le taux de matching
+    if total_weight > 0:
+        # Mode pondéré: basé sur les scores de l'API
+        logging.info("Calcul du matching en mode pondéré (scores API > 0).")
+        weighted_score = sum(detected_skills.values())
+        matching_rate = (weighted_score / total_weight) * 100
+    else:
+        # Mode non-pondéré: si l'API retourne des scores nuls, on fait un simple ratio
+        logging.info("Calcul du matching en mode non-pondéré (scores API nuls).")
+        num_required_skills = len(job_skills)
+        num_found_skills = len(detected_skills)
+        matching_rate = (num_found_skills / num_required_skills) * 100 if num_required_skills > 0 else 0
 
-        if not job_skills_data or 'skills' not in job_skills_data:
-            raise ValueError(f"Impossible de récupérer les soft skills pour le code ROME {rome_code}.")
-
-        job_skills = job_skills_data['skills']
-        cv_text_lower = cv_text.lower()
-        
-        detected_skills = {}
-        
-        # Calculer le poids total des compétences requises
-        total_weight = sum(s_data.get('score', 0) for s_key, s_data in job_skills.items())
-
-        # Détecter les compétences du CV
-        for skill_key, skill_data in job_skills.items():
-            skill_summary = skill_data.get('summary')
-            if skill_summary and skill_summary.lower() in cv_text_lower:
-                detected_skills[skill_summary] = skill_data.get('score')
-
-        # Calculer le taux de matching
-        if total_weight > 0:
-            # Mode pondéré: basé sur les scores de l'API
-            logging.info("Calcul du matching en mode pondéré (scores API > 0).")
-            weighted_score = sum(detected_skills.values())
-            matching_rate = (weighted_score / total_weight) * 100
-        else:
-            # Mode non-pondéré: si l'API retourne des scores nuls, on fait un simple ratio
-            logging.info("Calcul du matching en mode non-pondéré (scores API nuls).")
-            num_required_skills = len(job_skills)
-            num_found_skills = len(detected_skills)
-            matching_rate = (num_found_skills / num_required_skills) * 100 if num_required_skills > 0 else 0
-
-        return {
-            'matching_rate': round(matching_rate, 2),
-            'cv_skills': detected_skills,
-            'job_skills': {s_data.get('summary'): s_data.get('score') for s_key, s_data in job_skills.items()},
-            'job_title': job_details.get('intitule', 'N/A'),
-            'rome_code': rome_code
-        }
+    return {
+        'matching_rate': round(matching_rate, 2),
+        'cv_skills': detected_skills,
+        'job_skills': {s_data.get('summary'): s_data.get('score') for s_key, s_data in job_skills.items()},
+        'job_title': job_details.get('intitule', 'N/A'),
+        'rome_code': rome_code
+    }
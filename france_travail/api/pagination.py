@@ -0,0 +1,110 @@
+"""
+Pagination de /offres/search par fenêtres `range`.
+
+L'API Offres d'emploi v2 retourne au plus 150 offres par appel (paramètre
+`range=debut-fin`) et n'accepte pas de position au-delà de 3149. Les
+réponses partielles (206) portent un en-tête `Content-Range` de la forme
+"offres 0-149/1234", qui donne le nombre total de résultats.
+"""
+
+import logging
+import re
+
+from .base_client import raise_for_transient_status
+
+SEARCH_ENDPOINT = '/offres/search'
+MAX_WINDOW = 150
+MAX_OFFSET = 3149
+
+_CONTENT_RANGE_RE = re.compile(r'^\s*\w*\s*(\d+)-(\d+)/(\d+|\*)\s*$')
+
+
+def parse_content_range(value):
+    """
+    Analyse un en-tête Content-Range ("offres 0-149/1234").
+
+    Returns:
+        tuple (debut, fin, total) ou None si l'en-tête est absent ou invalide.
+        `total` vaut None s'il est inconnu ("*").
+    """
+    if not value:
+        return None
+    match = _CONTENT_RANGE_RE.match(value)
+    if not match:
+        return None
+    start, end, total = match.groups()
+    return int(start), int(end), None if total == '*' else int(total)
+
+
+def window_bounds(start, window=MAX_WINDOW, total=None, limit=None):
+    """
+    Calcule la fenêtre (debut, fin) commençant à `start`, ou None s'il n'y a plus rien à lire.
+
+    Args:
+        start: Position de la première offre de la fenêtre.
+        window: Taille de fenêtre (au plus MAX_WINDOW).
+        total: Nombre total de résultats, s'il est connu.
+        limit: Position (exclue) à ne pas dépasser, ex. nombre d'offres voulu.
+    """
+    window = max(1, min(window, MAX_WINDOW))
+    stop = MAX_OFFSET + 1
+    if total is not None:
+        stop = min(stop, total)
+    if limit is not None:
+        stop = min(stop, limit)
+    if start >= stop:
+        return None
+    return start, min(start + window, stop) - 1
+
+
+def range_params(params, bounds):
+    """Copie les paramètres de recherche avec la fenêtre `range` donnée."""
+    params = dict(params or {})
+    params['range'] = f"{bounds[0]}-{bounds[1]}"
+    return params
+
+
+def parse_search_page(method, url, status_code, headers, body, start=0):
+    """
+    Extrait (offres, total) d'une réponse de /offres/search.
+
+    `body` est un callable retournant le JSON décodé (évite de décoder un 204),
+    `start` la position de la première offre de la fenêtre demandée.
+    `total` vaut None si la réponse ne permet pas de le connaître.
+    Lève RateLimitedError / UpstreamUnavailableError pour une erreur passagère ;
+    une autre erreur HTTP est journalisée et traitée comme une page vide.
+    """
+    raise_for_transient_status(method, url, status_code, headers, '')
+    if status_code == 204:
+        return [], 0
+    if status_code >= 400:
+        logging.error(f"Erreur HTTP pour {method.upper()} {url}: {status_code}")
+        return [], 0
+
+    offers = (body() or {}).get('resultats', [])
+    content_range = parse_content_range(headers.get('Content-Range'))
+    total = content_range[2] if content_range else None
+    if total is None and status_code == 200:
+        # 200 : toutes les offres tiennent dans la fenêtre demandée
+        total = start + len(offers)
+    return offers, total
+
+
+def next_window(bounds, offers, total, window=MAX_WINDOW, limit=None):
+    """Fenêtre suivant `bounds` compte tenu de la page reçue, ou None si la lecture est terminée."""
+    if not offers:
+        return None
+    if total is None and len(offers) < bounds[1] - bounds[0] + 1:
+        # Total inconnu : une page incomplète est la dernière
+        return None
+    return window_bounds(bounds[1] + 1, window, total, limit)
+
+
+def remaining_windows(bounds, offers, total, window=MAX_WINDOW, limit=None):
+    """Liste des fenêtres restant à lire après la première page, quand le total est connu."""
+    windows = []
+    bounds = next_window(bounds, offers, total, window, limit)
+    while bounds is not None and total is not None:
+        windows.append(bounds)
+        bounds = window_bounds(bounds[1] + 1, window, total, limit)
+    return windows
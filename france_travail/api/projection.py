@@ -0,0 +1,83 @@
+"""
+Projection des réponses JSON sur les seuls champs utiles à l'appelant.
+
+Une projection est une liste de chemins pointés ("id", "lieuTravail.libelle",
+"resultats.entreprise.nom") : les listes sont traversées élément par élément
+et tout champ absent de la projection est supprimé. Les clients l'appliquent
+avant que la réponse n'entre dans le cache de réponses, pour que ni le cache
+ni les données stockées ensuite ne conservent des offres complètes.
+
+L'API Offres d'emploi v2 ne permet pas de choisir les champs retournés : la
+projection est faite localement. Les API ROME 4.0 acceptent le paramètre
+`champs`, à privilégier quand il est disponible.
+"""
+
+# Champs d'une offre suffisant pour les listes, le matching et le stockage local
+OFFER_SUMMARY_FIELDS = (
+    'id',
+    'intitule',
+    'description',
+    'dateCreation',
+    'dateActualisation',
+    'romeCode',
+    'romeLibelle',
+    'appellationlibelle',
+    'typeContrat',
+    'typeContratLibelle',
+    'experienceExige',
+    'experienceLibelle',
+    'competences.libelle',
+    'qualitesProfessionnelles.libelle',
+    'lieuTravail.libelle',
+    'lieuTravail.codePostal',
+    'lieuTravail.commune',
+    'lieuTravail.latitude',
+    'lieuTravail.longitude',
+    'entreprise.nom',
+    'salaire.libelle',
+    'origineOffre.urlOrigine',
+)
+
+
+def field_tree(fields):
+    """
+    Convertit une liste de chemins en arbre {champ: sous-arbre ou None}.
+    None conserve la valeur entière (un chemin plus court l'emporte).
+    """
+    tree = {}
+    for path in fields:
+        node = tree
+        parts = path.split('.')
+        for i, part in enumerate(parts):
+            if i == len(parts) - 1:
+                node[part] = None
+            elif node.get(part, {}) is None:
+                break
+            else:
+                node = node.setdefault(part, {})
+    return tree
+
+
+def project(data, fields):
+    """Retourne une copie de `data` réduite aux champs `fields` (chemins ou arbre)."""
+    if not fields:
+        return data
+    tree = fields if isinstance(fields, dict) else field_tree(fields)
+    return _apply(data, tree)
+
+
+def _apply(data, tree):
+    if tree is None:
+        return data
+    if isinstance(data, list):
+        return [_apply(item, tree) for item in data]
+    if isinstance(data, dict):
+        return {key: _apply(data[key], sub) for key, sub in tree.items() if key in data}
+    return data
+
+
+def prefixed(fields, prefix):
+    """Préfixe chaque chemin (ex. champs d'une offre -> champs de `resultats` d'une recherche)."""
+    if not fields:
+        return None
+    return tuple(f"{prefix}.{field}" for field in fields)
@@ -0,0 +1,185 @@
+"""
+Limitation de débit par seau à jetons (token bucket), partagée par API.
+
+Chaque API France Travail a son propre quota (10 appels/s pour les offres,
+2/s pour les soft skills, 1/s pour ROMEO et La Bonne Boite). Toutes les
+instances de clients d'une même API partagent le même seau : les rafales
+sont autorisées jusqu'à la capacité du seau, puis les appels sont espacés.
+
+Chaque appel réserve le prochain jeton disponible (quitte à rendre le solde
+négatif) puis attend son tour : l'ordre de service suit l'ordre d'arrivée,
+aussi bien pour les threads que pour les coroutines.
+
+Deux backends d'état sont disponibles :
+- "memory" (défaut) : seau partagé au sein du processus ;
+- "file" : état stocké dans un fichier verrouillé (flock), partagé entre
+  processus (ex. plusieurs workers uvicorn sur la même machine).
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows : le backend fichier n'est pas disponible
+    fcntl = None
+
+from .config import ClientConfig
+
+# Quotas officiels (appels par seconde) par API
+API_QUOTAS = {
+    'offres': 10,
+    'soft_skills': 2,
+    'romeo': 1,
+    'lbb': 1,
+    'contextes': 10,
+    'default': 10,
+}
+
+
+class MemoryBackend:
+    """État des seaux conservé en mémoire (partagé entre threads)."""
+
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def update(self, key, fn):
+        """Applique `fn(state) -> (new_state, result)` de manière atomique."""
+        with self._lock:
+            new_state, result = fn(self._states.get(key))
+            self._states[key] = new_state
+            return result
+
+
+class FileBackend:
+    """État des seaux stocké dans des fichiers verrouillés (partagé entre processus)."""
+
+    def __init__(self, directory):
+        if fcntl is None:
+            raise RuntimeError("Le backend 'file' nécessite fcntl (POSIX).")
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def update(self, key, fn):
+        path = os.path.join(self.directory, f"{key}.bucket")
+        with self._lock:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                raw = os.read(fd, 4096)
+                try:
+                    state = tuple(json.loads(raw)) if raw else None
+                except ValueError:
+                    state = None
+                new_state, result = fn(state)
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, json.dumps(list(new_state)).encode('ascii'))
+                return result
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+
+class TokenBucket:
+    """
+    Seau à jetons : `rate` jetons par seconde, au plus `capacity` en réserve.
+    """
+
+    def __init__(self, key, rate, capacity=None, backend=None):
+        self.key = key
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        self.backend = backend or MemoryBackend()
+
+    def _refill(self, state, now):
+        if state is None:
+            return self.capacity
+        tokens, updated = state
+        return min(self.capacity, tokens + max(0.0, now - updated) * self.rate)
+
+    def reserve(self) -> float:
+        """Réserve un jeton et retourne le temps d'attente (secondes) avant de l'utiliser."""
+        def take(state):
+            now = time.time()
+            tokens = self._refill(state, now) - 1
+            wait = 0.0 if tokens >= 0 else -tokens / self.rate
+            return (tokens, now), wait
+        return self.backend.update(self.key, take)
+
+    def try_acquire(self) -> bool:
+        """Prend un jeton seulement s'il est disponible immédiatement."""
+        def take(state):
+            now = time.time()
+            tokens = self._refill(state, now)
+            if tokens >= 1:
+                return (tokens - 1, now), True
+            return (tokens, now), False
+        return self.backend.update(self.key, take)
+
+    def time_until_available(self) -> float:
+        """Temps (secondes) avant qu'un jeton soit disponible, sans en consommer."""
+        def peek(state):
+            now = time.time()
+            tokens = self._refill(state, now)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+            return (tokens, now), wait
+        return self.backend.update(self.key, peek)
+
+    def acquire(self) -> float:
+        """Attend (bloquant) le prochain jeton et retourne le temps attendu."""
+        wait = self.reserve()
+        if wait > 0:
+            logging.info(f"Rate limiting ({self.key}): pause de {wait:.2f}s.")
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Attend le prochain jeton sans bloquer la boucle asyncio."""
+        import asyncio
+        wait = self.reserve()
+        if wait > 0:
+            logging.info(f"Rate limiting ({self.key}): pause de {wait:.2f}s.")
+            await asyncio.sleep(wait)
+        return wait
+
+
+_limiters = {}
+_registry_lock = threading.Lock()
+_backend = None
+
+
+def _default_backend():
+    global _backend
+    if _backend is None:
+        if ClientConfig.RATE_LIMIT_BACKEND == 'file':
+            _backend = FileBackend(os.path.join(ClientConfig.CACHE_DIR, 'ratelimit'))
+        else:
+            _backend = MemoryBackend()
+    return _backend
+
+
+def get_rate_limiter(api_name: str) -> TokenBucket:
+    """Retourne le seau partagé de l'API donnée (créé au premier appel)."""
+    limiter = _limiters.get(api_name)
+    if limiter is None:
+        with _registry_lock:
+            limiter = _limiters.get(api_name)
+            if limiter is None:
+                rate = API_QUOTAS.get(api_name, API_QUOTAS['default'])
+                limiter = TokenBucket(api_name, rate, backend=_default_backend())
+                _limiters[api_name] = limiter
+    return limiter
+
+
+def configure_rate_limit(api_name: str, rate: float, capacity: float = None):
+    """Modifie le quota d'une API (ex. quota négocié, tests, serveur local)."""
+    with _registry_lock:
+        API_QUOTAS[api_name] = rate
+        _limiters[api_name] = TokenBucket(api_name, rate, capacity, backend=_default_backend())
+    return _limiters[api_name]
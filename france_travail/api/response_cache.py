@@ -0,0 +1,182 @@
+"""
+Cache disque (SQLite) des réponses HTTP des API France Travail.
+
+Les réponses sont indexées par méthode, URL, paramètres, corps et scope, et
+conservées pendant une durée propre à chaque endpoint (`cache_ttls` des
+clients) : quelques minutes pour les offres, plusieurs jours pour les soft
+skills ou les contextes ROME. Une réponse expirée qui porte un ETag ou un
+Last-Modified est revalidée par une requête conditionnelle (304) plutôt que
+téléchargée à nouveau. La base est partagée entre processus (mode WAL).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from .config import ClientConfig
+
+CACHEABLE_STATUSES = {200, 203, 204, 206}
+STORED_HEADERS = ('Content-Type', 'Content-Range', 'ETag', 'Last-Modified')
+
+
+def cache_key(method, url, params=None, body=None, scope=None, fields=None):
+    """
+    Clé de cache d'une requête (l'en-tête Authorization n'en fait pas partie).
+    `fields` est la projection appliquée à la réponse stockée (voir projection).
+    """
+    parts = [method.upper(), url, params or {}, body, scope or '']
+    if fields:
+        parts.append(sorted(fields))
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def ttl_for(endpoint, cache_ttls):
+    """TTL (secondes) de l'endpoint : préfixe le plus long de `cache_ttls`, ou 0."""
+    best = None
+    for prefix in cache_ttls:
+        if endpoint.startswith(prefix) and (best is None or len(prefix) > len(best)):
+            best = prefix
+    return cache_ttls[best] if best is not None else 0
+
+
+def is_cacheable(status_code, headers):
+    """Une réponse est mise en cache si elle est réussie et n'interdit pas le stockage."""
+    if status_code not in CACHEABLE_STATUSES:
+        return False
+    return 'no-store' not in (headers.get('Cache-Control') or '').lower()
+
+
+class CachedResponse:
+    """Réponse stockée dans le cache."""
+
+    def __init__(self, status_code, headers, content, expires_at):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.expires_at = expires_at
+
+    def is_fresh(self):
+        return time.time() < self.expires_at
+
+    def validators(self):
+        """En-têtes de requête conditionnelle permettant la revalidation."""
+        validators = {}
+        if self.headers.get('ETag'):
+            validators['If-None-Match'] = self.headers['ETag']
+        if self.headers.get('Last-Modified'):
+            validators['If-Modified-Since'] = self.headers['Last-Modified']
+        return validators
+
+
+class ResponseCache:
+    """
+    Cache de réponses SQLite. `path=None` conserve la base en mémoire ;
+    `enabled=False` désactive la lecture et l'écriture.
+    """
+
+    def __init__(self, path=None, enabled=True):
+        self.path = path
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._conn = None
+        self._stats = {}
+
+    def _connection(self):
+        if self._conn is None:
+            if self.path:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path or ':memory:', check_same_thread=False, timeout=5)
+            if self.path:
+                self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, status INTEGER, headers TEXT, content BLOB, '
+                'stored_at REAL, expires_at REAL)'
+            )
+        return self._conn
+
+    def get(self, key):
+        """Retourne la réponse stockée (fraîche ou expirée) ou None."""
+        if not self.enabled:
+            return None
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    'SELECT status, headers, content, expires_at FROM responses WHERE key = ?', (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logging.warning(f"Cache de réponses illisible: {e}")
+            return None
+        if row is None:
+            return None
+        status, headers, content, expires_at = row
+        return CachedResponse(status, json.loads(headers), bytes(content or b''), expires_at)
+
+    def set(self, key, status_code, headers, content, ttl):
+        """Stocke une réponse pour `ttl` secondes."""
+        if not self.enabled:
+            return
+        kept = {name: headers[name] for name in STORED_HEADERS if headers.get(name)}
+        now = time.time()
+        try:
+            with self._lock, self._connection() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, status_code, json.dumps(kept), content or b'', now, now + ttl)
+                )
+        except sqlite3.Error as e:
+            logging.warning(f"Impossible d'écrire dans le cache de réponses: {e}")
+
+    def touch(self, key, ttl):
+        """Prolonge une réponse revalidée (304)."""
+        try:
+            with self._lock, self._connection() as conn:
+                conn.execute('UPDATE responses SET expires_at = ? WHERE key = ?', (time.time() + ttl, key))
+        except sqlite3.Error as e:
+            logging.warning(f"Impossible d'écrire dans le cache de réponses: {e}")
+
+    def purge(self, max_stale=7 * 24 * 3600):
+        """Supprime les réponses expirées depuis plus de `max_stale` secondes."""
+        with self._lock, self._connection() as conn:
+            return conn.execute('DELETE FROM responses WHERE expires_at < ?', (time.time() - max_stale,)).rowcount
+
+    def clear(self):
+        with self._lock, self._connection() as conn:
+            conn.execute('DELETE FROM responses')
+            self._stats.clear()
+
+    def record(self, api_name, outcome):
+        """Compte un accès au cache : 'hit', 'miss', 'revalidated' ou 'stale' (servie pendant une panne)."""
+        with self._lock:
+            self._stats.setdefault(api_name, Counter())[outcome] += 1
+
+    def stats(self):
+        """Retourne hits / misses / revalidations / réponses périmées et taux de succès par API."""
+        with self._lock:
+            result = {}
+            for api_name, counter in self._stats.items():
+                served = counter['hit'] + counter['revalidated']
+                total = served + counter['miss']
+                result[api_name] = {
+                    'hits': counter['hit'],
+                    'revalidated': counter['revalidated'],
+                    'misses': counter['miss'],
+                    'stale': counter['stale'],
+                    'hit_rate': round(served / total, 4) if total else None
+                }
+            return result
+
+
+# Cache partagé par tous les clients du processus
+response_cache = ResponseCache(path=ClientConfig.get_response_cache_path(), enabled=ClientConfig.RESPONSE_CACHE)
+
+
+def get_cache_stats():
+    """Statistiques du cache de réponses, par API."""
+    return response_cache.stats()
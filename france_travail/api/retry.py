@@ -0,0 +1,176 @@
+"""
+Politique de nouvelles tentatives (retry) pour les appels France Travail.
+
+- 429 : toujours rejouable (la requête n'a pas été traitée), en respectant
+  l'en-tête Retry-After quand il est présent ;
+- 502/503/504 et erreurs réseau : rejouables si la requête est idempotente ;
+- 500 : rejouable si la requête est idempotente.
+
+Une requête est idempotente si sa méthode l'est (GET, HEAD, ...) ou si son
+endpoint est déclaré comme tel par le client (ex. POST /predictionMetiers
+de ROMEO, qui ne fait qu'une lecture).
+
+Les délais suivent un backoff exponentiel avec "full jitter", et le temps
+total passé en tentatives est plafonné.
+"""
+
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+
+def parse_retry_after(value):
+    """
+    Convertit un en-tête Retry-After (secondes ou date HTTP) en secondes.
+
+    Returns:
+        float ou None si l'en-tête est absent ou invalide.
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+def is_idempotent(method, endpoint, idempotent_endpoints=()):
+    """Indique si une requête peut être rejouée sans effet de bord."""
+    if method.upper() in IDEMPOTENT_METHODS:
+        return True
+    return any(endpoint == e or endpoint.startswith(e.rstrip('/') + '/') for e in idempotent_endpoints)
+
+
+class RetryPolicy:
+    """
+    Paramètres de nouvelles tentatives.
+
+    Args:
+        max_attempts: Nombre maximal d'essais (premier appel compris).
+        base_delay: Délai de base (secondes) du backoff exponentiel.
+        max_delay: Délai maximal entre deux essais.
+        max_elapsed: Temps total maximal passé à réessayer.
+        jitter: Tire le délai au hasard dans [0, backoff] (full jitter).
+    """
+    def __init__(self, max_attempts=4, base_delay=0.5, max_delay=8.0, max_elapsed=30.0, jitter=True):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_elapsed = max_elapsed
+        self.jitter = jitter
+
+    def backoff(self, attempt):
+        """Délai avant l'essai numéro `attempt + 1` (attempt commence à 0)."""
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def start(self, method, endpoint, idempotent_endpoints=()):
+        """Crée l'état de tentative d'une requête."""
+        return RetryState(self, is_idempotent(method, endpoint, idempotent_endpoints))
+
+
+class RetryState:
+    """Suivi des tentatives d'une requête donnée."""
+
+    def __init__(self, policy, idempotent):
+        self.policy = policy
+        self.idempotent = idempotent
+        self.attempt = 0
+        self.started = time.monotonic()
+
+    def _can_retry(self, status):
+        if status == 429:
+            return True
+        if status is None or status in RETRYABLE_STATUSES:
+            return self.idempotent
+        return False
+
+    def next_delay(self, status=None, retry_after=None):
+        """
+        Retourne le délai avant le prochain essai, ou None s'il ne faut pas réessayer.
+
+        Args:
+            status: Code HTTP reçu, ou None pour une erreur réseau.
+            retry_after: Valeur (secondes) de l'en-tête Retry-After, si présente.
+        """
+        if not self._can_retry(status) or self.attempt + 1 >= self.policy.max_attempts:
+            return None
+        delay = retry_after if retry_after is not None else self.policy.backoff(self.attempt)
+        if time.monotonic() - self.started + delay > self.policy.max_elapsed:
+            return None
+        self.attempt += 1
+        return delay
+
+
+class RetryStats:
+    """
+    Compteurs de réussite / nouvelles tentatives par API (thread-safe).
+    Une requête est réussie si l'API l'a traitée (réponse finale ni 429 ni 5xx).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _entry(self, api_name):
+        return self._stats.setdefault(api_name, {
+            'requests': 0, 'successes': 0, 'failures': 0, 'retries': 0, 'statuses': Counter()
+        })
+
+    def record_retry(self, api_name, status):
+        with self._lock:
+            entry = self._entry(api_name)
+            entry['retries'] += 1
+            entry['statuses'][status or 'network_error'] += 1
+
+    def record_result(self, api_name, success, status=None):
+        with self._lock:
+            entry = self._entry(api_name)
+            entry['requests'] += 1
+            entry['successes' if success else 'failures'] += 1
+            if not success:
+                entry['statuses'][status or 'network_error'] += 1
+
+    def snapshot(self):
+        """Retourne les statistiques par API, avec le taux de réussite."""
+        with self._lock:
+            result = {}
+            for api_name, entry in self._stats.items():
+                requests = entry['requests']
+                result[api_name] = {
+                    'requests': requests,
+                    'successes': entry['successes'],
+                    'failures': entry['failures'],
+                    'retries': entry['retries'],
+                    'success_rate': round(entry['successes'] / requests, 4) if requests else None,
+                    'statuses': dict(entry['statuses'])
+                }
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+# Politique et statistiques partagées par tous les clients
+default_policy = RetryPolicy()
+retry_stats = RetryStats()
+
+
+def get_retry_stats():
+    """Statistiques de réussite des appels France Travail, par API."""
+    return retry_stats.snapshot()
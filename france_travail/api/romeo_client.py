@@ -1,20 +1,48 @@
 import logging
 from .base_client import BaseClient
 
+ROMEO_BASE_URL = "https://api.francetravail.io/partenaire/romeo/v2"
+ROMEO_SCOPE = "api_romeov2"
+PREDICTION_ENDPOINT = "/predictionMetiers"
+ROMEO_CACHE_TTLS = {PREDICTION_ENDPOINT: 24 * 3600}
+
+
+def _build_prediction_payload(intitule: str, contexte: str = None, nb_results: int = 3):
+    """Construit le corps de requête attendu par /predictionMetiers."""
+    payload = {
+        "appellations": [
+            {
+                "intitule": intitule,
+                "identifiant": "cli_request_1"
+            }
+        ],
+        "options": {
+            "nomAppelant": "france_travail_cli",
+            "nbResultats": nb_results
+        }
+    }
+    if contexte:
+        payload["appellations"][0]["contexte"] = contexte
+    return payload
+
 class RomeoClient(BaseClient):
     """
     Client pour l'API ROMEO v2 de France Travail.
     Permet de rapprocher un texte libre (intitulé de poste) à des appellations et codes ROME.
     """
+    api_name = 'romeo'
+    # POST en lecture seule : rejouable en cas de 5xx
+    idempotent_endpoints = (PREDICTION_ENDPOINT,)
+    cache_ttls = ROMEO_CACHE_TTLS
+
     def __init__(self, client_id=None, client_secret=None, simulation=False):
         super().__init__(
             client_id=client_id,
             client_secret=client_secret,
-            base_url="https://api.francetravail.io/partenaire/romeo/v2",
-            scope="api_romeov2",
+            base_url=ROMEO_BASE_URL,
+            scope=ROMEO_SCOPE,
             simulation=simulation
         )
-        self.request_delay = 1.0
 
     def predict_metiers(self, intitule: str, contexte: str = None, nb_results: int = 3):
         """
@@ -28,21 +56,7 @@ class RomeoClient(BaseClient):
         Returns:
             list: Une liste de prédictions ou None en cas d'erreur.
         """
-        endpoint = "/predictionMetiers"
-        payload = {
-            "appellations": [
-                {
-                    "intitule": intitule,
-                    "identifiant": "cli_request_1"
-                }
-            ],
-            "options": {
-                "nomAppelant": "france_travail_cli",
-                "nbResultats": nb_results
-            }
-        }
-        if contexte:
-            payload["appellations"][0]["contexte"] = contexte
+        payload = _build_prediction_payload(intitule, contexte, nb_results)
 
         logging.info(f"Recherche ROMEO pour l'intitulé : '{intitule}'")
-        return self._make_request("POST", endpoint, json=payload)
+        return self._make_request("POST", PREDICTION_ENDPOINT, json=payload)
@@ -0,0 +1,200 @@
+"""
+Ordonnancement par priorité des appels France Travail, devant le rate limiter.
+
+Les appels interactifs (un utilisateur qui ouvre une offre, /match/{job_id})
+et les traitements de masse (synchronisation nocturne, matching groupé)
+partagent le même quota par API. Quand des appels attendent un jeton, le
+scheduler sert d'abord la classe la plus prioritaire, sauf si une classe
+n'a pas obtenu sa part minimale des derniers jetons (`min_shares`) : un
+batch ne peut donc pas affamer les appels interactifs, ni l'inverse.
+
+La priorité d'un appel est celle du contexte courant (contextvars), fixée
+avec `request_priority('batch')` ; elle suit les coroutines asyncio, et
+`propagate_priority` la transmet aux threads d'un ThreadPoolExecutor.
+"""
+
+import contextvars
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+from .config import ClientConfig
+from .rate_limiter import get_rate_limiter
+
+INTERACTIVE = 'interactive'
+BATCH = 'batch'
+# Classes de priorité, de la plus prioritaire à la moins prioritaire
+PRIORITIES = (INTERACTIVE, BATCH)
+
+# Attente minimale (secondes) entre deux vérifications d'un appel en file
+MIN_WAIT = 0.005
+
+_current_priority = contextvars.ContextVar('france_travail_priority', default=INTERACTIVE)
+
+
+def current_priority():
+    """Priorité des appels émis dans le contexte courant."""
+    return _current_priority.get()
+
+
+@contextmanager
+def request_priority(priority):
+    """Fixe la priorité des appels France Travail émis dans le bloc."""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Priorité inconnue: {priority} (attendu: {', '.join(PRIORITIES)})")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def propagate_priority(fn):
+    """Enveloppe `fn` pour l'exécuter dans un autre thread avec la priorité courante."""
+    priority = current_priority()
+
+    def run(*args, **kwargs):
+        with request_priority(priority):
+            return fn(*args, **kwargs)
+    return run
+
+
+class RequestScheduler:
+    """
+    File d'attente par priorité devant un seau à jetons (thread-safe).
+
+    Args:
+        limiter: Seau à jetons de l'API (voir rate_limiter.TokenBucket).
+        min_shares: Part minimale des jetons garantie à chaque classe sous contention.
+        window: Nombre de jetons récents pris en compte pour le calcul des parts.
+    """
+
+    def __init__(self, limiter, min_shares=None, window=100):
+        self.limiter = limiter
+        self.min_shares = min_shares if min_shares is not None else ClientConfig.SCHEDULER_MIN_SHARES
+        self._cond = threading.Condition()
+        self._queues = {priority: deque() for priority in PRIORITIES}
+        self._recent = deque(maxlen=window)
+        self._stats = {priority: Counter() for priority in PRIORITIES}
+        self._wait_time = Counter()
+
+    def _next_class(self):
+        """Classe à servir : la plus en retard sur sa part minimale, sinon la plus prioritaire."""
+        waiting = [priority for priority in PRIORITIES if self._queues[priority]]
+        if len(waiting) > 1 and self._recent:
+            total = len(self._recent)
+            deficits = {p: self.min_shares.get(p, 0) - self._recent.count(p) / total for p in waiting}
+            starved = max(waiting, key=deficits.get)
+            if deficits[starved] > 0:
+                return starved
+        return waiting[0] if waiting else None
+
+    def _enqueue(self, priority):
+        ticket = object()
+        queue = self._queues[priority]
+        queue.append(ticket)
+        stats = self._stats[priority]
+        stats['max_queued'] = max(stats['max_queued'], len(queue))
+        return ticket
+
+    def _dequeue(self, priority, ticket):
+        try:
+            self._queues[priority].remove(ticket)
+        except ValueError:
+            pass
+        self._cond.notify_all()
+
+    def _is_turn(self, priority, ticket):
+        return self._next_class() == priority and self._queues[priority][0] is ticket
+
+    def _try_grant(self, priority, ticket, started):
+        """Sert `ticket` si c'est son tour et qu'un jeton est disponible (sous le verrou)."""
+        if not self._is_turn(priority, ticket) or not self.limiter.try_acquire():
+            return False
+        self._queues[priority].popleft()
+        self._recent.append(priority)
+        self._stats[priority]['granted'] += 1
+        self._wait_time[priority] += time.monotonic() - started
+        self._cond.notify_all()
+        return True
+
+    def _delay(self):
+        """Attente avant la prochaine vérification (sous le verrou)."""
+        return max(MIN_WAIT, self.limiter.time_until_available())
+
+    def acquire(self, priority=None) -> float:
+        """Attend (bloquant) un jeton pour la priorité donnée et retourne le temps attendu."""
+        priority = priority or current_priority()
+        started = time.monotonic()
+        with self._cond:
+            ticket = self._enqueue(priority)
+            try:
+                while not self._try_grant(priority, ticket, started):
+                    self._cond.wait(self._delay())
+            except BaseException:
+                self._dequeue(priority, ticket)
+                raise
+        return time.monotonic() - started
+
+    async def acquire_async(self, priority=None) -> float:
+        """Attend un jeton sans bloquer la boucle asyncio."""
+        import asyncio
+        priority = priority or current_priority()
+        started = time.monotonic()
+        with self._cond:
+            ticket = self._enqueue(priority)
+        try:
+            while True:
+                with self._cond:
+                    if self._try_grant(priority, ticket, started):
+                        break
+                    delay = self._delay()
+                await asyncio.sleep(delay)
+        except BaseException:
+            with self._cond:
+                self._dequeue(priority, ticket)
+            raise
+        return time.monotonic() - started
+
+    def snapshot(self):
+        """Profondeur des files, jetons servis et attente moyenne, par priorité."""
+        with self._cond:
+            result = {}
+            for priority in PRIORITIES:
+                stats = self._stats[priority]
+                granted = stats['granted']
+                result[priority] = {
+                    'queued': len(self._queues[priority]),
+                    'max_queued': stats['max_queued'],
+                    'granted': granted,
+                    'avg_wait': round(self._wait_time[priority] / granted, 4) if granted else None
+                }
+            return result
+
+
+_schedulers = {}
+_registry_lock = threading.Lock()
+
+
+def scheduler_for(limiter) -> RequestScheduler:
+    """Retourne le scheduler partagé du seau `limiter` (créé au premier appel)."""
+    scheduler = _schedulers.get(limiter.key)
+    if scheduler is None or scheduler.limiter is not limiter:
+        with _registry_lock:
+            scheduler = _schedulers.get(limiter.key)
+            if scheduler is None or scheduler.limiter is not limiter:
+                scheduler = _schedulers[limiter.key] = RequestScheduler(limiter)
+    return scheduler
+
+
+def get_scheduler(api_name: str) -> RequestScheduler:
+    """Retourne le scheduler de l'API donnée (quota de rate_limiter.API_QUOTAS)."""
+    return scheduler_for(get_rate_limiter(api_name))
+
+
+def get_scheduler_stats():
+    """Files d'attente par API et par priorité, pour les métriques."""
+    with _registry_lock:
+        schedulers = dict(_schedulers)
+    return {key: scheduler.snapshot() for key, scheduler in schedulers.items()}
@@ -0,0 +1,226 @@
+"""
+Pool de sessions HTTP partagées entre les clients France Travail.
+
+Chaque hôte (schéma + domaine) dispose d'une unique `requests.Session` dont
+l'adaptateur conserve les connexions TCP/TLS ouvertes (keep-alive). Tous les
+clients qui appellent le même hôte réutilisent donc les mêmes connexions au
+lieu de refaire une poignée de main TLS à chaque appel.
+
+Les clients httpx asynchrones sont liés à une boucle asyncio : il y en a un
+par couple (boucle, hôte), et ceux des boucles fermées sont oubliés.
+
+Une cassette (voir cassette.py) peut être installée sur toutes les sessions
+pour enregistrer ou rejouer les échanges.
+"""
+
+import atexit
+import logging
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import ClientConfig
+
+_sessions = {}
+_async_sessions = {}  # (boucle asyncio, hôte) -> httpx.AsyncClient
+_lock = threading.Lock()
+_cassette = None
+_cassette_loaded = False
+
+
+def _host_key(url: str) -> str:
+    """Retourne la clé d'un hôte ('https://api.francetravail.io')."""
+    parts = urlsplit(url or '')
+    return f"{parts.scheme or 'https'}://{parts.netloc}"
+
+
+def _active_cassette():
+    """Cassette installée, ou celle configurée par FRANCE_TRAVAIL_CASSETTE (chargée une fois)."""
+    global _cassette, _cassette_loaded
+    if not _cassette_loaded:
+        _cassette_loaded = True
+        if ClientConfig.CASSETTE:
+            from .cassette import Cassette
+            _cassette = Cassette(ClientConfig.CASSETTE, ClientConfig.CASSETTE_MODE, ClientConfig.CASSETTE_LATENCY)
+            if _cassette.mode == 'record':
+                atexit.register(_cassette.save)
+    return _cassette
+
+
+def _mount_adapter(session):
+    """Monte l'adaptateur HTTP (ou celui de la cassette active) sur une session."""
+    pool_kwargs = dict(
+        pool_connections=ClientConfig.POOL_CONNECTIONS,
+        pool_maxsize=ClientConfig.POOL_MAXSIZE,
+        pool_block=ClientConfig.POOL_BLOCK,
+        max_retries=0
+    )
+    cassette = _active_cassette()
+    if cassette is not None:
+        from .cassette import CassetteAdapter
+        adapter = CassetteAdapter(cassette, **pool_kwargs)
+    else:
+        adapter = HTTPAdapter(**pool_kwargs)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+
+def _build_session() -> requests.Session:
+    """Crée une session avec un pool de connexions dimensionné selon la configuration."""
+    session = requests.Session()
+    _mount_adapter(session)
+    if not ClientConfig.KEEP_ALIVE:
+        session.headers['Connection'] = 'close'
+    return session
+
+
+def get_session(url: str) -> requests.Session:
+    """
+    Retourne la session partagée pour l'hôte de l'URL donnée.
+
+    Args:
+        url (str): URL de base (ou complète) de l'API appelée.
+
+    Returns:
+        requests.Session: La session associée à cet hôte.
+    """
+    key = _host_key(url)
+    session = _sessions.get(key)
+    if session is None:
+        with _lock:
+            session = _sessions.get(key)
+            if session is None:
+                logging.debug(f"Création d'une session HTTP partagée pour {key}")
+                session = _build_session()
+                _sessions[key] = session
+    return session
+
+
+def get_async_session(url: str):
+    """
+    Retourne le client httpx asynchrone partagé pour l'hôte de l'URL donnée.
+
+    httpx n'est importé qu'à la première utilisation pour ne pas alourdir
+    les clients synchrones. Le client est propre à la boucle asyncio courante
+    (chaque asyncio.run en crée un nouveau) : un client ne peut pas servir
+    dans une autre boucle que celle où ses connexions ont été ouvertes.
+    """
+    import asyncio
+    import httpx
+
+    key = (asyncio.get_running_loop(), _host_key(url))
+    session = _async_sessions.get(key)
+    if session is None or session.is_closed:
+        with _lock:
+            session = _async_sessions.get(key)
+            if session is None or session.is_closed:
+                _forget_closed_loops()
+                logging.debug(f"Création d'un client HTTP asynchrone partagé pour {key[1]}")
+                limits = httpx.Limits(
+                    max_connections=ClientConfig.POOL_MAXSIZE,
+                    max_keepalive_connections=ClientConfig.POOL_MAXSIZE if ClientConfig.KEEP_ALIVE else 0
+                )
+                cassette = _active_cassette()
+                if cassette is not None:
+                    from .cassette import cassette_transport
+                    session = httpx.AsyncClient(transport=cassette_transport(cassette), timeout=get_async_timeout())
+                else:
+                    session = httpx.AsyncClient(limits=limits, timeout=get_async_timeout())
+                _async_sessions[key] = session
+    return session
+
+
+def _forget_closed_loops():
+    """Oublie les clients des boucles fermées (appelé sous `_lock`)."""
+    for key in [key for key in _async_sessions if key[0].is_closed()]:
+        del _async_sessions[key]
+
+
+def get_async_timeout():
+    """Retourne le timeout httpx équivalent à la configuration synchrone."""
+    import httpx
+    return httpx.Timeout(ClientConfig.READ_TIMEOUT, connect=ClientConfig.CONNECT_TIMEOUT)
+
+
+def configure_pool(pool_connections=None, pool_maxsize=None, pool_block=None,
+                   keep_alive=None, connect_timeout=None, read_timeout=None):
+    """
+    Modifie la configuration du pool. Les sessions existantes sont fermées
+    et seront recréées avec les nouveaux paramètres au prochain appel.
+    """
+    if pool_connections is not None:
+        ClientConfig.POOL_CONNECTIONS = pool_connections
+    if pool_maxsize is not None:
+        ClientConfig.POOL_MAXSIZE = pool_maxsize
+    if pool_block is not None:
+        ClientConfig.POOL_BLOCK = pool_block
+    if keep_alive is not None:
+        ClientConfig.KEEP_ALIVE = keep_alive
+    if connect_timeout is not None:
+        ClientConfig.CONNECT_TIMEOUT = connect_timeout
+    if read_timeout is not None:
+        ClientConfig.READ_TIMEOUT = read_timeout
+    close_sessions()
+
+
+def install_cassette(cassette):
+    """
+    Installe (ou retire, avec None) une cassette sur toutes les sessions partagées.
+
+    Les sessions synchrones existantes sont équipées immédiatement ; les clients
+    httpx existants sont fermés dans leur boucle et recréés au prochain appel.
+    """
+    global _cassette, _cassette_loaded
+    with _lock:
+        _cassette, _cassette_loaded = cassette, True
+        sessions = list(_sessions.values())
+        async_sessions = list(_async_sessions.items())
+        _async_sessions.clear()
+    for session in sessions:
+        _mount_adapter(session)
+    _close_in_their_loop(async_sessions)
+
+
+def _close_in_their_loop(async_sessions):
+    """
+    Ferme des clients httpx retirés du pool depuis du code synchrone : la
+    fermeture est confiée à leur boucle si elle tourne, sinon exécutée dans
+    celle-ci. Les connexions des boucles déjà fermées sont perdues avec elles.
+    """
+    if not async_sessions:
+        return
+    import asyncio
+
+    for (loop, host), session in async_sessions:
+        if loop.is_closed() or session.is_closed:
+            continue
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.aclose(), loop)
+            continue
+        try:
+            loop.run_until_complete(session.aclose())
+        except RuntimeError as e:
+            logging.warning(f"Client HTTP asynchrone pour {host} non fermé: {e}")
+
+
+def close_sessions():
+    """Ferme toutes les sessions partagées et libère leurs connexions."""
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+async def aclose_async_sessions():
+    """Ferme les clients httpx asynchrones partagés de la boucle courante."""
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    with _lock:
+        sessions = [_async_sessions.pop(key) for key in list(_async_sessions) if key[0] is loop]
+        _forget_closed_loops()
+    for session in sessions:
+        await session.aclose()
@@ -0,0 +1,113 @@
+"""
+Regroupement des requêtes identiques simultanées (single-flight).
+
+Quand plusieurs threads ou coroutines émettent la même requête idempotente
+en même temps (même méthode, URL, paramètres, corps et scope), un seul appel
+part vers l'API : les autres attendent sa réponse brute, que chacun décode
+ensuite de son côté (aucun objet décodé n'est partagé).
+"""
+
+import threading
+from collections import Counter
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Regroupement des appels identiques entre threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = Counter()
+
+    def do(self, key, fn):
+        """Exécute `fn()` une seule fois pour tous les appelants simultanés de même clé."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            self._stats['calls' if leader else 'shared'] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def stats(self):
+        """Nombre d'appels effectués et de requêtes servies par un appel déjà en cours."""
+        with self._lock:
+            return {'calls': self._stats['calls'], 'shared': self._stats['shared']}
+
+
+class AsyncSingleFlight:
+    """Regroupement des appels identiques entre coroutines d'une même boucle."""
+
+    def __init__(self):
+        self._calls = {}
+        self._stats = Counter()
+
+    async def do(self, key, fn):
+        """Attend `await fn()` une seule fois pour toutes les coroutines simultanées de même clé."""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        future = self._calls.get(loop_key)
+        if future is not None:
+            self._stats['shared'] += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # L'appel partagé a été annulé : on le relance pour nous-mêmes
+                return await self.do(key, fn)
+
+        future = self._calls[loop_key] = loop.create_future()
+        # Évite l'avertissement "exception never retrieved" s'il n'y a aucun autre appelant
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._stats['calls'] += 1
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            del self._calls[loop_key]
+
+    def stats(self):
+        return {'calls': self._stats['calls'], 'shared': self._stats['shared']}
+
+
+# Instances partagées par tous les clients du processus
+in_flight = SingleFlight()
+async_in_flight = AsyncSingleFlight()
+
+
+def get_coalescing_stats():
+    """Statistiques de regroupement des requêtes (synchrones et asynchrones)."""
+    sync_stats, async_stats = in_flight.stats(), async_in_flight.stats()
+    return {name: sync_stats[name] + async_stats[name] for name in sync_stats}
@@ -2,20 +2,37 @@
 import logging
 from .base_client import BaseClient
 
+SOFT_SKILLS_BASE_URL = "https://api.francetravail.io/partenaire/matchviasoftskills/v1"
+SOFT_SKILLS_SCOPE = "api_matchviasoftskillsv1"
+JOB_SKILLS_ENDPOINT = "/professions/job_skills"
+# Les soft skills d'un code ROME sont stables : une semaine de cache
+SOFT_SKILLS_CACHE_TTLS = {JOB_SKILLS_ENDPOINT: 7 * 24 * 3600}
+
+
+def _is_valid_rome_code(rome_code) -> bool:
+    if not isinstance(rome_code, str) or len(rome_code) != 5:
+        logging.error(f"Code ROME invalide fourni: {rome_code}")
+        return False
+    return True
+
 class SoftSkillsClient(BaseClient):
     """
     Client pour l'API Match via Soft Skills v1 de France Travail.
     Permet d'obtenir la liste des compétences comportementales pour un métier donné.
     """
+    api_name = 'soft_skills'
+    # POST en lecture seule : rejouable en cas de 5xx
+    idempotent_endpoints = (JOB_SKILLS_ENDPOINT,)
+    cache_ttls = SOFT_SKILLS_CACHE_TTLS
+
     def __init__(self, client_id=None, client_secret=None, simulation=False):
         super().__init__(
             client_id=client_id,
             client_secret=client_secret,
-            base_url="https://api.francetravail.io/partenaire/matchviasoftskills/v1",
-            scope="api_matchviasoftskillsv1",
+            base_url=SOFT_SKILLS_BASE_URL,
+            scope=SOFT_SKILLS_SCOPE,
             simulation=simulation
         )
-        self.request_delay = 1.0 / 2  # 2 appels/seconde
 
     def get_skills_for_job(self, rome_code: str):
         """
@@ -27,13 +44,11 @@ class SoftSkillsClient(BaseClient):
         Returns:
             dict: Un dictionnaire contenant les compétences ou None en cas d'erreur.
         """
-        if not isinstance(rome_code, str) or len(rome_code) != 5:
-            logging.error(f"Code ROME invalide fourni: {rome_code}")
+        if not _is_valid_rome_code(rome_code):
             return None
 
-        endpoint = "/professions/job_skills"
         params = {"code": rome_code}
 
         logging.info(f"Récupération des soft skills pour le code ROME: {rome_code}")
         # L'API attend un POST avec le code ROME en paramètre de requête.
-        return self._make_request("POST", endpoint, params=params)
+        return self._make_request("POST", JOB_SKILLS_ENDPOINT, params=params)
@@ -0,0 +1,197 @@
+"""
+Cache de tokens OAuth partagé par tous les clients France Travail.
+
+Les tokens sont indexés par (client_id, scope) et renouvelés un peu avant leur
+expiration (`expires_in`). Un seul appelant renouvelle un token donné pendant
+que les autres attendent son résultat (single-flight), aussi bien entre threads
+qu'entre coroutines. Un petit cache disque optionnel permet aux invocations CLI
+et aux sous-processus (scrapers) de réutiliser un token encore valide.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou inter-processus
+    fcntl = None
+
+from .config import ClientConfig
+
+
+def _cache_key(client_id: str, scope: str) -> str:
+    """Clé normalisée : l'ordre et le séparateur des scopes n'importent pas."""
+    scopes = ' '.join(sorted((scope or '').replace(',', ' ').split()))
+    return f"{client_id}|{scopes}"
+
+
+class TokenStore:
+    """
+    Stockage des tokens OAuth en mémoire, avec persistance disque optionnelle.
+    """
+    def __init__(self, path=None, refresh_margin=None):
+        self.path = path
+        self.refresh_margin = ClientConfig.TOKEN_REFRESH_MARGIN if refresh_margin is None else refresh_margin
+        self._tokens = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._async_locks = {}
+
+    def _is_fresh(self, entry) -> bool:
+        return bool(entry) and time.time() < entry['expires_at'] - self.refresh_margin
+
+    def _lock_for(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _async_lock_for(self, key):
+        import asyncio
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            return self._async_locks.setdefault((key, id(loop)), asyncio.Lock())
+
+    def get_entry(self, client_id: str, scope: str):
+        """Retourne l'entrée valide ({'access_token', 'expires_at'}) ou None."""
+        key = _cache_key(client_id, scope)
+        entry = self._tokens.get(key)
+        if self._is_fresh(entry):
+            return entry
+        entry = self._read_disk().get(key)
+        if self._is_fresh(entry):
+            self._tokens[key] = entry
+            return entry
+        return None
+
+    def peek(self, client_id: str, scope: str):
+        """Retourne un token encore valide sans jamais déclencher de renouvellement."""
+        entry = self.get_entry(client_id, scope)
+        return entry['access_token'] if entry else None
+
+    def store(self, client_id: str, scope: str, token_data: dict):
+        """Enregistre la réponse OAuth (access_token, expires_in) et retourne le token."""
+        access_token = token_data.get('access_token')
+        if not access_token:
+            return None
+        expires_in = float(token_data.get('expires_in') or 1499)
+        entry = {'access_token': access_token, 'expires_at': time.time() + expires_in}
+        key = _cache_key(client_id, scope)
+        self._tokens[key] = entry
+        self._write_disk(key, entry)
+        return access_token
+
+    def invalidate(self, client_id: str, scope: str, access_token=None):
+        """
+        Oublie le token courant (ex. après un 401). Si `access_token` est fourni,
+        le token n'est oublié que s'il s'agit toujours de celui-ci : un autre
+        appelant l'a peut-être déjà renouvelé.
+        """
+        key = _cache_key(client_id, scope)
+        entry = self._tokens.get(key)
+        if entry and (access_token is None or entry['access_token'] == access_token):
+            self._tokens.pop(key, None)
+            self._write_disk(key, None)
+
+    def get_token(self, client_id: str, scope: str, fetch):
+        """
+        Retourne un token valide, en appelant `fetch()` si besoin.
+
+        Args:
+            fetch: Fonction sans argument retournant la réponse OAuth (dict) ou None.
+
+        Returns:
+            str: Le token d'accès, ou None si l'authentification a échoué.
+        """
+        token = self.peek(client_id, scope)
+        if token:
+            return token
+
+        key = _cache_key(client_id, scope)
+        with self._lock_for(key):
+            # Un autre thread a pu renouveler le token pendant l'attente
+            token = self.peek(client_id, scope)
+            if token:
+                return token
+            with self._disk_lock():
+                token = self.peek(client_id, scope)
+                if token:
+                    return token
+                token_data = fetch()
+                return self.store(client_id, scope, token_data) if token_data else None
+
+    async def get_token_async(self, client_id: str, scope: str, fetch):
+        """Équivalent asynchrone de get_token ; `fetch` est une coroutine."""
+        token = self.peek(client_id, scope)
+        if token:
+            return token
+
+        key = _cache_key(client_id, scope)
+        async with self._async_lock_for(key):
+            token = self.peek(client_id, scope)
+            if token:
+                return token
+            token_data = await fetch()
+            return self.store(client_id, scope, token_data) if token_data else None
+
+    # --- Persistance disque ---
+
+    def _read_disk(self):
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Cache de tokens illisible ({self.path}): {e}")
+            return {}
+
+    def _write_disk(self, key, entry):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            data = {k: v for k, v in self._read_disk().items() if self._is_fresh(v)}
+            if entry is None:
+                data.pop(key, None)
+            else:
+                data[key] = entry
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.warning(f"Impossible d'écrire le cache de tokens ({self.path}): {e}")
+
+    def _disk_lock(self):
+        """Verrou inter-processus pendant un renouvellement (no-op sans cache disque)."""
+        return _FileLock(f"{self.path}.lock" if self.path and fcntl else None)
+
+
+class _FileLock:
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+
+    def __enter__(self):
+        if self.path:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            except OSError as e:
+                logging.warning(f"Verrou du cache de tokens indisponible: {e}")
+                self._fd = None
+        return self
+
+    def __exit__(self, *exc):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+# Instance partagée par tous les clients du processus
+token_store = TokenStore(path=ClientConfig.get_token_cache_path())
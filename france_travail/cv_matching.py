@@ -5,14 +5,76 @@ Ce module fournit une classe pour analyser et faire correspondre les compétence
 d'un CV avec les offres d'emploi de l'API France Travail.
 """
 
-import re
+import functools
+import hashlib
 import json
+import logging
+import threading
 import time
 from typing import Dict, List, Optional, Any, Counter as CounterType
 from datetime import datetime
-from collections import Counter
+from collections import Counter, OrderedDict
 import requests
 
+from .api.circuit_breaker import get_breaker, guarded_request
+from .api.config import ClientConfig
+from .api.exceptions import CircuitOpenError
+from .api.pagination import SEARCH_ENDPOINT
+from .api.session_pool import get_session
+from .api.token_cache import token_store
+from .api.scheduler import get_scheduler
+from .offer_index import get_offer_index
+from .text_analysis import KeywordMatcher
+
+class MarketProfileCache:
+    """Cache LRU avec TTL des profils de demande du marché, par signature de mots-clés"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.time():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def set(self, key, profile):
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, profile)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Partagé par tous les services (analyze_cv_job_match en crée un par appel)
+market_profiles = MarketProfileCache(ClientConfig.MARKET_PROFILE_CACHE_SIZE, ClientConfig.MARKET_PROFILE_TTL)
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """NumPy (déclaré dans requirements.txt, importé à la demande), ou None s'il n'est pas installé"""
+    try:
+        import numpy
+    except ImportError:
+        logging.warning("NumPy n'est pas installé : les taux de matching sont calculés offre par offre.")
+        return None
+    return numpy
+
+
 class CVMatchingService:
     """Service de matching CV utilisant l'API France Travail"""
     
@@ -26,8 +88,12 @@ class CVMatchingService:
         self.client_id = client_id
         self.client_secret = client_secret
         self.access_token = None
-        self.base_url = "https://api.francetravail.io/partenaire"
-        self.auth_url = "https://francetravail.io/connexion/oauth2/access_token?realm=%2Fpartenaire"
+        self.base_url = ClientConfig.resolve_url("https://api.francetravail.io/partenaire")
+        self.session = get_session(self.base_url)
+        self.auth_url = ClientConfig.resolve_url("https://francetravail.io/connexion/oauth2/access_token?realm=%2Fpartenaire", auth=True)
+        self.scope = 'o2dsoffre api_offresdemploiv2'
+        # Raison de la dernière recherche d'offres en échec (circuit ouvert, API indisponible)
+        self.degraded_reason = None
         
         # Base de données des soft skills avec mots-clés français
         self.soft_skills_db = {
@@ -82,41 +148,66 @@ class CVMatchingService:
             }
         }
     
+    @property
+    def soft_skills_db(self) -> Dict[str, Dict[str, Any]]:
+        """Soft skills (poids et mots-clés) ; la remplacer reconstruit le matcher et l'empreinte"""
+        return self._soft_skills_db
+    
+    @soft_skills_db.setter
+    def soft_skills_db(self, soft_skills_db: Dict[str, Dict[str, Any]]):
+        self._soft_skills_db = soft_skills_db
+        self.invalidate_soft_skills()
+    
+    def invalidate_soft_skills(self):
+        """À appeler après une modification en place de soft_skills_db"""
+        self._matcher = None
+        self._fingerprint = None
+    
     def authenticate(self) -> bool:
-        """Authentification avec l'API France Travail
+        """Authentification avec l'API France Travail (token partagé via token_store)
         
         Returns:
             bool: True si l'authentification a réussi, False sinon
         """
+        self.access_token = token_store.get_token(self.client_id, self.scope, self._fetch_token)
+        return bool(self.access_token)
+    
+    def _fetch_token(self) -> Optional[Dict]:
+        """Demande un nouveau token à l'API France Travail
+        
+        Returns:
+            La réponse OAuth (access_token, expires_in) ou None en cas d'échec
+        """
         payload = {
             'client_id': self.client_id,
             'client_secret': self.client_secret,
             'grant_type': 'client_credentials',
-            'scope': 'o2dsoffre api_offresdemploiv2'
+            'scope': self.scope
         }
         
         headers = {'Content-Type': 'application/x-www-form-urlencoded'}
         payload_str = '&'.join([f"{k}={v}" for k, v in payload.items()])
         
         try:
-            response = requests.post(self.auth_url, headers=headers, data=payload_str, timeout=10)
+            response = get_session(self.auth_url).post(self.auth_url, headers=headers, data=payload_str, timeout=10)
             if response.status_code == 200:
-                data = response.json()
-                self.access_token = data.get('access_token')
-                return True
+                return response.json()
             else:
                 print(f"Erreur d'authentification: {response.status_code}")
-                return False
+                return None
         except requests.exceptions.RequestException as e:
             print(f"Erreur de connexion lors de l'authentification: {e}")
-            return False
+            return None
         except json.JSONDecodeError as e:
             print(f"Erreur lors de l'analyse de la réponse d'authentification: {e}")
-            return False
+            return None
     
     def search_similar_jobs(self, job_text: str, limit: int = 10) -> List[Dict]:
         """Recherche d'offres similaires basée sur le texte de l'offre
         
+        L'index BM25 de l'entrepôt local (offer_index) est interrogé en premier
+        sur le texte complet ; l'API n'est appelée que s'il est vide.
+        
         Args:
             job_text: Texte de l'offre d'emploi
             limit: Nombre maximum d'offres à retourner
@@ -124,7 +215,13 @@ class CVMatchingService:
         Returns:
             Liste des offres d'emploi similaires
         """
-        if not self.access_token and not self.authenticate():
+        index = get_offer_index()
+        if index is not None and len(index):
+            similar_jobs = index.search_offers(job_text, k=limit)
+            if similar_jobs:
+                return similar_jobs
+        
+        if not self.authenticate():
             return []
         
         # Extraction des mots-clés de l'offre
@@ -143,15 +240,25 @@ class CVMatchingService:
         }
         
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=15)
+            # Même quota et même disjoncteur que OffresClient (API Offres d'emploi v2)
+            get_scheduler('offres').acquire()
+            breaker = get_breaker('offres', SEARCH_ENDPOINT)
+            response = guarded_request(self.session, 'GET', url, breaker, headers=headers, params=params, timeout=15)
             if response.status_code in [200, 206]:
                 data = response.json()
                 return data.get('resultats', [])
             else:
                 print(f"Erreur recherche offres: {response.status_code}")
+                if response.status_code >= 500:
+                    self.degraded_reason = 'upstream_unavailable'
                 return []
+        except CircuitOpenError as e:
+            print(f"{e}, analyse sans données marché")
+            self.degraded_reason = 'circuit_open'
+            return []
         except requests.exceptions.RequestException as e:
             print(f"Erreur réseau lors de la recherche d'offres: {e}")
+            self.degraded_reason = 'upstream_unavailable'
             return []
         except json.JSONDecodeError as e:
             print(f"Erreur lors de l'analyse de la réponse des offres: {e}")
@@ -194,22 +301,19 @@ class CVMatchingService:
         Returns:
             Dictionnaire des compétences avec leurs scores
         """
-        skills_scores = {}
-        text_lower = text.lower()
-        
-        for skill_id, skill_data in self.soft_skills_db.items():
-            score = 0
-            keywords = skill_data['keywords']
-            
-            for keyword in keywords:
-                # Compte les occurrences du mot-clé
-                occurrences = len(re.findall(r'\b' + re.escape(keyword) + r'\b', text_lower))
-                score += occurrences * 15  # Chaque occurrence = 15 points
-            
-            # Normalisation du score (max 100)
-            skills_scores[skill_id] = min(score, 100)
+        # Tous les mots-clés de toutes les compétences comptés en une passe
+        occurrences = self._soft_skills_matcher().count_groups(text)
         
-        return skills_scores
+        # Chaque occurrence = 15 points, normalisé à 100 au maximum
+        return {skill_id: min(occurrences.get(skill_id, 0) * 15, 100) for skill_id in self.soft_skills_db}
+    
+    def _soft_skills_matcher(self) -> KeywordMatcher:
+        """Matcher des mots-clés de soft_skills_db, construit au premier usage (voir invalidate_soft_skills)"""
+        if self._matcher is None:
+            self._matcher = KeywordMatcher({
+                skill_id: skill_data['keywords'] for skill_id, skill_data in self.soft_skills_db.items()
+            })
+        return self._matcher
     
     def enrich_skills_with_market_data(self, base_skills: Dict[str, float], market_jobs: List[Dict]) -> Dict[str, float]:
         """Enrichit l'analyse des compétences avec les données du marché
@@ -221,9 +325,20 @@ class CVMatchingService:
         Returns:
             Dictionnaire des compétences enrichi avec les données du marché
         """
-        enriched_skills = base_skills.copy()
+        return self._enrich_with_profile(base_skills, self.market_profile(market_jobs))
+    
+    def market_profile(self, market_jobs: List[Dict]) -> Dict[str, Any]:
+        """Profil de demande du marché : compétences détectées dans chaque offre
+        
+        Les compétences de chaque offre ne sont extraites qu'une fois ; le profil
+        sert à l'enrichissement et aux compétences les plus demandées.
         
-        # Analyse des descriptions d'offres similaires
+        Args:
+            market_jobs: Liste des offres d'emploi du marché
+            
+        Returns:
+            {'total_jobs': nombre d'offres, 'demand': Counter des offres par compétence}
+        """
         market_skills_demand = Counter()
         
         for job in market_jobs:
@@ -234,10 +349,16 @@ class CVMatchingService:
                 if score > 20:  # Seuil de pertinence
                     market_skills_demand[skill] += 1
         
+        return {'total_jobs': len(market_jobs), 'demand': market_skills_demand}
+    
+    def _enrich_with_profile(self, base_skills: Dict[str, float], profile: Dict[str, Any]) -> Dict[str, float]:
+        """Ajuste les scores selon un profil de demande du marché"""
+        enriched_skills = base_skills.copy()
+        
         # Ajustement des scores basé sur la demande du marché
-        total_jobs = len(market_jobs)
+        total_jobs = profile['total_jobs']
         if total_jobs > 0:
-            for skill, demand_count in market_skills_demand.items():
+            for skill, demand_count in profile['demand'].items():
                 market_importance = (demand_count / total_jobs) * 100
                 
                 # Augmente le score si la compétence est très demandée
@@ -246,6 +367,36 @@ class CVMatchingService:
         
         return enriched_skills
     
+    def skills_fingerprint(self) -> str:
+        """Empreinte du contenu de soft_skills_db, clé des caches qui en dépendent
+        
+        Calculée au premier usage, puis après chaque remplacement de la base
+        ou appel à invalidate_soft_skills.
+        """
+        if self._fingerprint is None:
+            self._fingerprint = hashlib.sha1(json.dumps(self.soft_skills_db, sort_keys=True).encode('utf-8')).hexdigest()
+        return self._fingerprint
+    
+    def _cached_market_profile(self, job_text: str) -> Dict[str, Any]:
+        """Profil du marché des offres similaires à l'offre (cache market_profiles)
+        
+        La clé est ce dont dépend search_similar_jobs : le texte complet quand
+        l'index local est interrogé, la signature de mots-clés pour l'API.
+        Un profil obtenu en mode dégradé (circuit ouvert, API indisponible)
+        n'est pas mis en cache.
+        """
+        index = get_offer_index()
+        if index is not None and len(index):
+            key = ('local', job_text, self.skills_fingerprint())
+        else:
+            key = ('api', self._extract_job_keywords(job_text), self.skills_fingerprint())
+        profile = market_profiles.get(key)
+        if profile is None:
+            profile = self.market_profile(self.search_similar_jobs(job_text, limit=5))
+            if not self.degraded_reason:
+                market_profiles.set(key, profile)
+        return profile
+    
     def calculate_matching_rate(self, cv_skills: Dict[str, float], job_skills: Dict[str, float]) -> float:
         """Calcule le taux de matching entre CV et offre
         
@@ -272,6 +423,99 @@ class CVMatchingService:
         
         return (matching_score / total_weight * 100) if total_weight > 0 else 0
     
+    def skill_vector(self, skills: Dict[str, float]) -> List[float]:
+        """Scores des compétences dans l'ordre de soft_skills_db"""
+        return [skills.get(skill_id, 0) for skill_id in self.soft_skills_db]
+    
+    def _matching_rates(self, cv_skills: Dict[str, float], jobs_skills):
+        """Taux de matching (tableau NumPy si disponible, liste sinon)"""
+        np = _numpy()
+        if np is not None and isinstance(jobs_skills, np.ndarray):
+            jobs = jobs_skills
+        else:
+            rows = [self.skill_vector(job) if isinstance(job, dict) else list(job) for job in jobs_skills]
+            if np is None:
+                return [self.calculate_matching_rate(cv_skills, dict(zip(self.soft_skills_db, row))) for row in rows]
+            jobs = np.asarray(rows, dtype=float).reshape(-1, len(self.soft_skills_db))
+        
+        cv = np.asarray(self.skill_vector(cv_skills), dtype=float)
+        weights = np.asarray([skill_data['weight'] for skill_data in self.soft_skills_db.values()])
+        # Mêmes règles que calculate_matching_rate, pour toutes les offres à la fois
+        required = jobs > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            compatibility = np.where(required, np.minimum(cv / jobs, 1), 0)
+        total_weight = required @ weights
+        matching_score = compatibility @ weights
+        return np.where(total_weight > 0, matching_score * 100 / np.where(total_weight > 0, total_weight, 1), 0)
+    
+    def batch_matching_rates(self, cv_skills: Dict[str, float], jobs_skills) -> List[float]:
+        """Calcule le taux de matching d'un CV avec N offres en une opération vectorisée
+        
+        Args:
+            cv_skills: Compétences extraites du CV
+            jobs_skills: Compétences de chaque offre (dicts, ou matrice offres × compétences
+                dans l'ordre de skill_vector)
+            
+        Returns:
+            Taux de matching (0-100), dans l'ordre des offres
+        """
+        rates = self._matching_rates(cv_skills, jobs_skills)
+        return [float(rate) for rate in rates]
+    
+    def rank_jobs(self, cv_skills: Dict[str, float], jobs_skills, k: int = 10) -> List[tuple]:
+        """Retourne les k meilleures offres pour un CV
+        
+        Args:
+            cv_skills: Compétences extraites du CV
+            jobs_skills: Compétences de chaque offre (voir batch_matching_rates)
+            k: Nombre d'offres retournées
+            
+        Returns:
+            Couples (indice de l'offre, taux de matching), du meilleur au moins bon
+        """
+        rates = self._matching_rates(cv_skills, jobs_skills)
+        np = _numpy()
+        if np is None:
+            order = sorted(range(len(rates)), key=lambda i: -rates[i])[:k]
+        else:
+            order = np.argsort(-rates, kind='stable')[:k]
+        return [(int(i), float(rates[i])) for i in order]
+    
+    def rank_offers(self, cv_text: str, offers: List[Dict], k: int = 10) -> List[Dict]:
+        """Classe des offres (format API) pour un CV, sans appel à l'API
+        
+        Args:
+            cv_text: Texte du CV
+            offers: Offres d'emploi
+            k: Nombre d'offres retournées
+            
+        Returns:
+            Les k meilleures offres, avec leur 'matching_rate'
+        """
+        cv_skills = self.extract_soft_skills(cv_text)
+        jobs_skills = [self.extract_soft_skills(f"{offer.get('intitule', '')} {offer.get('description', '')}")
+                       for offer in offers]
+        return [dict(offers[i], matching_rate=round(rate, 1)) for i, rate in self.rank_jobs(cv_skills, jobs_skills, k)]
+    
+    def rank_local_offers(self, cv_text: str, k: int = 10) -> List[Dict]:
+        """Classe toutes les offres de l'entrepôt local pour un CV
+        
+        Les compétences des offres sont extraites une fois et tenues à jour
+        par skill_matrix ; seul le CV est analysé à chaque appel.
+        
+        Args:
+            cv_text: Texte du CV
+            k: Nombre d'offres retournées
+            
+        Returns:
+            Les k meilleures offres, avec leur 'matching_rate'
+        """
+        from .skill_matrix import get_offer_skill_matrix
+        matrix = get_offer_skill_matrix(self)
+        if matrix is None:
+            return []
+        return matrix.rank_offers(self.extract_soft_skills(cv_text), k)
+    
     def generate_recommendations(self, cv_skills: Dict[str, float], job_skills: Dict[str, float]) -> List[Dict]:
         """Génère des recommandations d'amélioration
         
@@ -338,11 +582,12 @@ class CVMatchingService:
         cv_skills = self.extract_soft_skills(cv_text)
         job_skills = self.extract_soft_skills(job_text)
         
-        # Recherche d'offres similaires pour enrichir l'analyse
-        similar_jobs = self.search_similar_jobs(job_text, limit=5)
+        # Profil du marché (offres similaires), partagé par les offres de même signature
+        self.degraded_reason = None
+        profile = self._cached_market_profile(job_text)
         
         # Enrichissement avec données marché
-        enriched_job_skills = self.enrich_skills_with_market_data(job_skills, similar_jobs)
+        enriched_job_skills = self._enrich_with_profile(job_skills, profile)
         
         # Calcul du taux de matching
         matching_rate = self.calculate_matching_rate(cv_skills, enriched_job_skills)
@@ -352,10 +597,12 @@ class CVMatchingService:
         
         # Insights marché
         market_insights = {
-            'similar_jobs_found': len(similar_jobs),
-            'top_demanded_skills': self._get_top_market_skills(similar_jobs),
-            'market_trend': 'high' if len(similar_jobs) > 10 else 'medium'
+            'similar_jobs_found': profile['total_jobs'],
+            'top_demanded_skills': self._top_skills_from_profile(profile),
+            'market_trend': 'high' if profile['total_jobs'] > 10 else 'medium'
         }
+        if self.degraded_reason:
+            market_insights['degraded_reason'] = self.degraded_reason
         
         return {
             'matching_rate': round(matching_rate, 1),
@@ -375,17 +622,11 @@ class CVMatchingService:
         Returns:
             Liste des compétences les plus demandées
         """
-        skill_demand = Counter()
-        
-        for job in jobs:
-            description = f"{job.get('description', '')} {job.get('intitule', '')}"
-            detected_skills = self.extract_soft_skills(description)
-            
-            for skill, score in detected_skills.items():
-                if score > 20:
-                    skill_demand[skill] += 1
-        
-        return [skill.replace('_', ' ').title() for skill, _ in skill_demand.most_common(3)]
+        return self._top_skills_from_profile(self.market_profile(jobs))
+    
+    def _top_skills_from_profile(self, profile: Dict[str, Any]) -> List[str]:
+        """Les 3 compétences les plus demandées d'un profil du marché"""
+        return [skill.replace('_', ' ').title() for skill, _ in profile['demand'].most_common(3)]
 
 
 def analyze_cv_job_match(cv_text: str, job_text: str, client_id: str, client_secret: str) -> Dict[str, Any]:
@@ -1,5 +1,4 @@
-import PyPDF2
-import docx
+# PyPDF2 et python-docx ne sont importés qu'à la lecture d'un fichier de ce format
 
 class CVParser:
     """Classe pour extraire le texte brut de fichiers CV (PDF, DOCX, TXT)."""
@@ -19,6 +18,7 @@ class CVParser:
 
     def _extract_from_pdf(self, file_path: str) -> str:
         """Extrait le texte d'un fichier PDF."""
+        import PyPDF2
         try:
             with open(file_path, 'rb') as pdf_file:
                 reader = PyPDF2.PdfReader(pdf_file)
@@ -34,6 +34,7 @@ class CVParser:
 
     def _extract_from_docx(self, file_path: str) -> str:
         """Extrait le texte d'un fichier DOCX."""
+        import docx
         try:
             doc = docx.Document(file_path)
             text = "\n".join([para.text for para in doc.paragraphs])
@@ -0,0 +1,301 @@
+"""
+Index géographique des offres et des entreprises La Bonne Boite.
+
+Les points sont rangés dans une grille de cellules de `cell_size` degrés
+(à la manière d'un geohash) : une recherche par rayon ou par rectangle ne
+lit que les cellules qui recouvrent la zone, puis filtre à la distance
+exacte (haversine) et, le cas échéant, par code ROME.
+
+- Offres : indexées depuis `lieuTravail.latitude/longitude` de l'entrepôt
+  local, et tenues à jour par abonnement à `OfferStore.subscribe`.
+- Entreprises : les réponses de La Bonne Boite sont enregistrées avec la
+  zone interrogée (code ROME, centre, rayon). Une recherche entièrement
+  contenue dans une zone déjà interrogée depuis moins de COMPANY_AREA_TTL
+  est servie localement. Les zones expirées sont oubliées, et une zone
+  interrogée à nouveau retire les entreprises que La Bonne Boite n'y
+  renvoie plus.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+
+from .api.config import ClientConfig
+from .offer_store import get_offer_store
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+# Taille des cellules en degrés (~11 km en latitude)
+CELL_SIZE = 0.1
+# Durée (secondes) pendant laquelle une zone La Bonne Boite interrogée fait foi
+COMPANY_AREA_TTL = 24 * 3600
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Distance orthodromique en kilomètres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi, dlambda = phi2 - phi1, math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def _split_codes(rome_codes):
+    if not rome_codes:
+        return None
+    if isinstance(rome_codes, str):
+        rome_codes = rome_codes.split(',')
+    return {code.strip() for code in rome_codes if code.strip()} or None
+
+
+class GeoIndex:
+    """
+    Grille de points (identifiant, latitude, longitude, codes ROME, élément).
+    """
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells = defaultdict(set)
+        self._points = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._points)
+
+    def _cell(self, latitude, longitude):
+        return math.floor(latitude / self.cell_size), math.floor(longitude / self.cell_size)
+
+    def add(self, item_id, latitude, longitude, rome_codes=(), item=None):
+        with self._lock:
+            self.remove(item_id)
+            self._points[item_id] = (latitude, longitude, frozenset(rome_codes), item)
+            self._cells[self._cell(latitude, longitude)].add(item_id)
+
+    def rome_codes(self, item_id):
+        point = self._points.get(item_id)
+        return point[2] if point else frozenset()
+
+    def set_rome_codes(self, item_id, rome_codes):
+        with self._lock:
+            point = self._points.get(item_id)
+            if point is not None:
+                self._points[item_id] = (point[0], point[1], frozenset(rome_codes), point[3])
+
+    def remove(self, item_id):
+        with self._lock:
+            point = self._points.pop(item_id, None)
+            if point is None:
+                return
+            cell = self._cell(point[0], point[1])
+            self._cells[cell].discard(item_id)
+            if not self._cells[cell]:
+                del self._cells[cell]
+
+    def _candidates(self, south, west, north, east, rome_codes):
+        codes = _split_codes(rome_codes)
+        (i_min, j_min), (i_max, j_max) = self._cell(south, west), self._cell(north, east)
+        for i in range(i_min, i_max + 1):
+            for j in range(j_min, j_max + 1):
+                for item_id in self._cells.get((i, j), ()):
+                    latitude, longitude, item_codes, item = self._points[item_id]
+                    if south <= latitude <= north and west <= longitude <= east \
+                            and (codes is None or codes & item_codes):
+                        yield item_id, latitude, longitude, item
+
+    def within_bbox(self, south, west, north, east, rome_codes=None, limit=None):
+        """Éléments dans le rectangle donné (degrés), filtrés par codes ROME."""
+        with self._lock:
+            items = [item for _, _, _, item in self._candidates(south, west, north, east, rome_codes)]
+        return items[:limit] if limit else items
+
+    def within_radius(self, latitude, longitude, distance_km, rome_codes=None, limit=None):
+        """
+        Éléments à moins de `distance_km` du point, filtrés par codes ROME.
+
+        Returns:
+            list: Couples (élément, distance en km), du plus proche au plus éloigné.
+        """
+        dlat = distance_km / KM_PER_DEGREE
+        dlon = distance_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 1e-6))
+        results = []
+        with self._lock:
+            for _, lat, lon, item in self._candidates(latitude - dlat, longitude - dlon,
+                                                      latitude + dlat, longitude + dlon, rome_codes):
+                distance = haversine_km(latitude, longitude, lat, lon)
+                if distance <= distance_km:
+                    results.append((item, distance))
+        results.sort(key=lambda result: result[1])
+        return results[:limit] if limit else results
+
+
+def offer_location(offer):
+    """(latitude, longitude) du lieu de travail d'une offre, ou None."""
+    lieu = offer.get('lieuTravail') or {}
+    if lieu.get('latitude') is None or lieu.get('longitude') is None:
+        return None
+    return float(lieu['latitude']), float(lieu['longitude'])
+
+
+class OfferGeoIndex(GeoIndex):
+    """Index géographique des offres actives de l'entrepôt."""
+
+    def add_offer(self, offer):
+        location = offer_location(offer)
+        if location is None:
+            self.remove(offer.get('id'))
+            return
+        codes = (offer['romeCode'],) if offer.get('romeCode') else ()
+        self.add(offer['id'], location[0], location[1], codes, offer)
+
+    def update(self, changed, deleted):
+        """Écouteur d'OfferStore : applique les offres modifiées et supprimées."""
+        with self._lock:
+            for offer in changed:
+                self.add_offer(offer)
+            for offer_id in deleted:
+                self.remove(offer_id)
+
+    def nearby(self, latitude, longitude, distance_km, rome_codes=None, limit=50):
+        """Offres à moins de `distance_km`, avec leur 'distance' (km)."""
+        return [dict(offer, distance=round(distance, 1))
+                for offer, distance in self.within_radius(latitude, longitude, distance_km, rome_codes, limit)]
+
+
+def build_offer_geo_index(store):
+    index = OfferGeoIndex()
+    store.subscribe(index.update)
+    for offer in store.iter_offers():
+        index.add_offer(offer)
+    return index
+
+
+def company_location(company):
+    """(latitude, longitude) d'une entreprise La Bonne Boite, ou None."""
+    latitude = company.get('lat', company.get('latitude'))
+    longitude = company.get('lon', company.get('longitude'))
+    if latitude is None or longitude is None:
+        return None
+    return float(latitude), float(longitude)
+
+
+class CompanyLocator:
+    """
+    Entreprises La Bonne Boite connues et zones déjà interrogées.
+
+    Args:
+        store: Entrepôt où les entreprises sont conservées.
+        ttl: Durée de validité (secondes) d'une zone interrogée.
+    """
+
+    def __init__(self, store, ttl=COMPANY_AREA_TTL):
+        self.store = store
+        self.ttl = ttl
+        self.index = GeoIndex()
+        self._areas = defaultdict(list)
+        self._lock = threading.Lock()
+        for company, latitude, longitude, rome_codes in store.iter_companies():
+            self.index.add(company['siret'], latitude, longitude, rome_codes, company)
+        since = time.time() - ttl
+        store.prune_company_areas(since)
+        for rome_code, latitude, longitude, distance, fetched_at in store.company_areas(since):
+            self._areas[rome_code].append((latitude, longitude, distance, fetched_at))
+
+    def covers(self, rome_code, latitude, longitude, distance_km):
+        """True si la zone demandée est contenue dans une zone récente déjà interrogée."""
+        since = time.time() - self.ttl
+        with self._lock:
+            return any(
+                fetched_at >= since and haversine_km(latitude, longitude, lat, lon) + distance_km <= radius
+                for lat, lon, radius, fetched_at in self._areas.get(rome_code, ())
+            )
+
+    def search(self, rome_codes, latitude, longitude, distance_km):
+        """
+        Entreprises à moins de `distance_km` (avec leur 'distance'), ou None si
+        la zone n'a pas encore été interrogée pour tous les codes ROME.
+        """
+        codes = _split_codes(rome_codes) or set()
+        if not codes or not all(self.covers(code, latitude, longitude, distance_km) for code in codes):
+            return None
+        return [dict(company, distance=round(distance, 1))
+                for company, distance in self.index.within_radius(latitude, longitude, distance_km, codes)]
+
+    def record(self, rome_codes, latitude, longitude, distance_km, companies):
+        """
+        Enregistre la réponse de La Bonne Boite pour une zone. Les entreprises
+        connues dans la zone qu'elle ne contient plus perdent les codes ROME
+        interrogés (et sont oubliées s'il ne leur en reste aucun).
+        """
+        codes = _split_codes(rome_codes) or set()
+        located = []
+        returned = defaultdict(set)
+        for company in companies or []:
+            location = company_location(company)
+            if location is None or not company.get('siret'):
+                continue
+            matched = company.get('matched_rome_code')
+            company_codes = (matched,) if matched else tuple(codes)
+            located.append((company, location[0], location[1], company_codes))
+            for code in company_codes:
+                returned[code].add(company['siret'])
+        now = time.time()
+        self.store.upsert_companies(located, seen_at=now)
+        for company, lat, lon, company_codes in located:
+            known = self.index.rome_codes(company['siret'])
+            self.index.add(company['siret'], lat, lon, known | set(company_codes), company)
+
+        stale = {}
+        for code in codes:
+            for company, _ in self.index.within_radius(latitude, longitude, distance_km, {code}):
+                if company['siret'] not in returned[code]:
+                    stale.setdefault(company['siret'], set()).add(code)
+        updates = []
+        for siret, removed in stale.items():
+            remaining = self.index.rome_codes(siret) - removed
+            if remaining:
+                self.index.set_rome_codes(siret, remaining)
+            else:
+                self.index.remove(siret)
+            updates.append((siret, remaining))
+        self.store.set_company_codes(updates)
+
+        since = now - self.ttl
+        with self._lock:
+            self.store.prune_company_areas(since)
+            for code in list(self._areas):
+                self._areas[code] = [area for area in self._areas[code] if area[3] >= since]
+                if not self._areas[code]:
+                    del self._areas[code]
+            for code in codes:
+                self.store.add_company_area(code, latitude, longitude, distance_km, now)
+                self._areas[code].append((latitude, longitude, distance_km, now))
+
+
+_offer_geo_index = None
+_company_locator = None
+_geo_lock = threading.Lock()
+
+
+def get_offer_geo_index():
+    """
+    Index géographique partagé des offres, ou None si aucune synchronisation
+    n'a eu lieu. Tenu à jour des synchronisations d'un autre processus.
+    """
+    global _offer_geo_index
+    with _geo_lock:
+        if _offer_geo_index is None:
+            if not os.path.exists(ClientConfig.OFFER_STORE):
+                return None
+            _offer_geo_index = build_offer_geo_index(get_offer_store())
+    get_offer_store().refresh()
+    return _offer_geo_index
+
+
+def get_company_locator():
+    """Entreprises La Bonne Boite partagées du processus (entrepôt FRANCE_TRAVAIL_OFFER_STORE)."""
+    global _company_locator
+    with _geo_lock:
+        if _company_locator is None:
+            _company_locator = CompanyLocator(get_offer_store())
+        return _company_locator
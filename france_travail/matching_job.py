@@ -0,0 +1,243 @@
+"""
+Matching de masse : les meilleures offres de l'entrepôt local pour chaque CV.
+
+Pour l'e-mail hebdomadaire « vos meilleures offres », chaque CV est comparé à
+toutes les offres actives avec les règles de CVMatchingService
+(extract_soft_skills, calculate_matching_rate), sans aucun appel HTTP :
+
+- les compétences de chaque offre sont extraites une fois par exécution
+  (skill_matrix) ;
+- les CV sont découpés en blocs répartis sur un pool de processus ; chaque
+  processus reçoit la matrice des offres une seule fois, lit les CV de ses
+  blocs, calcule leurs compétences (cache SQLite indexé par l'empreinte du
+  texte : un CV inchangé n'est pas réanalysé) puis les classe ;
+- au plus quelques blocs par processus sont en attente à la fois, et le top-k
+  de chaque utilisateur est transmis au puits (base de données) dès que son
+  bloc est terminé.
+
+Usage :
+    python -m france_travail.matching_job --top 20 --workers 4
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from .api.config import ClientConfig
+from .cv_matching import CVMatchingService
+from .offer_store import get_offer_store
+from .skill_matrix import build_offer_skill_matrix
+
+# Nombre de CV par tâche envoyée au pool de processus
+BLOCK_SIZE = 64
+# Blocs soumis et non terminés, par processus du pool
+PENDING_PER_WORKER = 2
+
+
+class SkillVectorCache:
+    """
+    Vecteurs de compétences déjà calculés, par empreinte du texte et de la
+    base de compétences. `path=None` conserve le cache en mémoire.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def __getstate__(self):
+        # Transmis aux processus du pool : chacun ouvre sa propre connexion
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+    def _connection(self):
+        if self._conn is None:
+            if self.path:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path or ':memory:', check_same_thread=False, timeout=5)
+            if self.path:
+                self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS vectors (key TEXT PRIMARY KEY, vector TEXT)')
+        return self._conn
+
+    def get_or_compute(self, service, text):
+        """Vecteur de compétences du texte (skill_vector de extract_soft_skills)."""
+        key = hashlib.sha1(f"{service.skills_fingerprint()}\0{text}".encode('utf-8')).hexdigest()
+        with self._lock:
+            row = self._connection().execute('SELECT vector FROM vectors WHERE key = ?', (key,)).fetchone()
+        if row:
+            return json.loads(row[0])
+        vector = service.skill_vector(service.extract_soft_skills(text))
+        with self._lock, self._connection() as conn:
+            conn.execute('INSERT OR REPLACE INTO vectors VALUES (?, ?)', (key, json.dumps(vector)))
+        return vector
+
+
+# --- Processus du pool : état reçu une fois par processus --- #
+
+_worker = {}
+
+
+def _init_worker(soft_skills_db, offer_ids, matrix, k, vector_cache, read_cv):
+    service = CVMatchingService(None, None)
+    service.soft_skills_db = soft_skills_db
+    _worker.update(service=service, offer_ids=offer_ids, matrix=matrix, k=k,
+                   vector_cache=vector_cache, read_cv=read_cv)
+
+
+def _score_block(block):
+    """
+    Top-k (id d'offre, taux) de chaque CV d'un bloc [(user_id, CV)], le CV
+    étant un texte ou ce que lit `read_cv`. Les CV illisibles sont ignorés.
+    """
+    service, offer_ids, read_cv = _worker['service'], _worker['offer_ids'], _worker['read_cv']
+    results = []
+    for user_id, cv in block:
+        try:
+            cv_text = read_cv(cv) if read_cv else cv
+        except Exception as e:
+            logging.error(f"CV illisible pour l'utilisateur {user_id} ({cv}): {e}")
+            continue
+        vector = _worker['vector_cache'].get_or_compute(service, cv_text)
+        cv_skills = dict(zip(service.soft_skills_db, vector))
+        top = service.rank_jobs(cv_skills, _worker['matrix'], _worker['k'])
+        results.append((user_id, [(offer_ids[i], rate) for i, rate in top]))
+    return results
+
+
+_cv_parser = None
+
+
+def read_cv_file(path):
+    """Texte d'un CV déposé (lu dans le processus qui le classe)."""
+    global _cv_parser
+    if _cv_parser is None:
+        from .cv_parser import CVParser
+        _cv_parser = CVParser()
+    return _cv_parser.extract_text_from_file(path)
+
+
+def recommendation(offer, rate):
+    """Ligne de recommandation (format de UserDatabase.save_recommendations)."""
+    return {
+        'offer_id': offer['id'],
+        'matching_rate': round(rate, 1),
+        'title': offer.get('intitule'),
+        'company': (offer.get('entreprise') or {}).get('nom'),
+        'location': (offer.get('lieuTravail') or {}).get('libelle'),
+        'offer_url': (offer.get('origineOffre') or {}).get('urlOrigine'),
+    }
+
+
+class MatchingJob:
+    """
+    Calcule les k meilleures offres de chaque utilisateur.
+
+    Args:
+        store: Entrepôt des offres actives.
+        service: CVMatchingService (base de compétences), créé par défaut.
+        k: Nombre d'offres retenues par utilisateur.
+        workers: Processus du pool (0 : calcul dans le processus courant).
+        block_size: Nombre de CV par tâche.
+        vector_cache: Cache des vecteurs de compétences des CV (partagé par
+            les processus s'il est sur disque).
+        read_cv: Fonction (importable) donnant le texte d'un CV ; sans elle,
+            les CV transmis à `run` sont déjà des textes.
+    """
+
+    def __init__(self, store, service=None, k=20, workers=None, block_size=BLOCK_SIZE, vector_cache=None,
+                 read_cv=None):
+        self.store = store
+        self.service = service or CVMatchingService(None, None)
+        self.k = k
+        self.workers = os.cpu_count() if workers is None else workers
+        self.block_size = block_size
+        self.vector_cache = vector_cache or SkillVectorCache()
+        self.read_cv = read_cv
+
+    def _blocks(self, cvs):
+        block = []
+        for item in cvs:
+            block.append(item)
+            if len(block) >= self.block_size:
+                yield block
+                block = []
+        if block:
+            yield block
+
+    def run(self, cvs, sink):
+        """
+        Args:
+            cvs: Couples (user_id, texte du CV ou argument de `read_cv`), lus au fur et à mesure.
+            sink: Appelé avec (user_id, recommandations) dès qu'un utilisateur est traité.
+
+        Returns:
+            int: Nombre d'utilisateurs traités.
+        """
+        offer_ids, matrix = build_offer_skill_matrix(self.service, self.store, follow=False).matrix()
+        if not offer_ids:
+            logging.warning("Aucune offre active dans l'entrepôt : rien à recommander.")
+            return 0
+        initargs = (self.service.soft_skills_db, offer_ids, matrix, self.k, self.vector_cache, self.read_cv)
+        logging.info(f"Matching de masse contre {len(offer_ids)} offres ({self.workers or 1} processus).")
+
+        if not self.workers:
+            _init_worker(*initargs)
+            results = (_score_block(block) for block in self._blocks(cvs))
+            return self._emit(results, sink)
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=initargs) as executor:
+            return self._emit(self._pooled_results(executor, cvs), sink)
+
+    def _pooled_results(self, executor, cvs):
+        """Résultats des blocs dans l'ordre où ils se terminent, avec un nombre borné de blocs en attente."""
+        pending = set()
+        for block in self._blocks(cvs):
+            pending.add(executor.submit(_score_block, block))
+            if len(pending) >= self.workers * PENDING_PER_WORKER:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+    def _emit(self, results, sink):
+        processed = 0
+        for block in results:
+            for user_id, top in block:
+                offers = ((self.store.get(offer_id), rate) for offer_id, rate in top)
+                sink(user_id, [recommendation(offer, rate) for offer, rate in offers if offer is not None])
+                processed += 1
+        return processed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calcule les meilleures offres de chaque utilisateur ayant un CV.")
+    parser.add_argument('--top', type=int, default=20, help="Nombre d'offres retenues par utilisateur.")
+    parser.add_argument('--workers', type=int, default=None, help='Nombre de processus (0 : aucun pool).')
+    args = parser.parse_args()
+
+    from database.user_database import UserDatabase
+
+    db = UserDatabase()
+    cvs = ((user['id'], user['cv_path']) for user in db.get_users_with_cv())
+    vector_cache = SkillVectorCache(os.path.join(ClientConfig.CACHE_DIR, 'skill_vectors.sqlite'))
+    job = MatchingJob(get_offer_store(), k=args.top, workers=args.workers, vector_cache=vector_cache,
+                      read_cv=read_cv_file)
+    try:
+        processed = job.run(cvs, db.save_recommendations)
+    finally:
+        db.close()
+    print(f"{processed} utilisateurs traités.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,378 @@
+"""
+Serveur local imitant les API France Travail, pour les tests de charge et
+les benchmarks hors ligne.
+
+Il émule l'émission de tokens OAuth, /offres/search (pagination 206 +
+Content-Range), /offres/{id}, Match via Soft Skills, ROMEO, La Bonne Boite
+et les contextes de travail ROME, avec une latence, un taux d'erreurs 5xx et
+des quotas (429 + Retry-After) configurables.
+
+Les clients y sont redirigés par FRANCE_TRAVAIL_API_URL (voir ClientConfig) :
+seul l'hôte change, les chemins restent ceux des vraies API.
+
+Usage :
+    python -m france_travail.mock_server --port 8080 --latency 0.05 --error-rate 0.01
+    export FRANCE_TRAVAIL_API_URL=http://127.0.0.1:8080
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+# Métiers utilisés pour générer les offres fictives : (code ROME, libellé, soft skills)
+METIERS = [
+    ('M1805', 'Développeur Python', ['Rigueur', 'Autonomie', 'Travail en équipe']),
+    ('M1805', 'Développeur Full Stack', ['Curiosité', 'Autonomie', 'Sens de la communication']),
+    ('M1403', 'Data Analyst', ['Rigueur', 'Capacité d\'analyse', 'Sens de la communication']),
+    ('D1102', 'Boulanger', ['Rigueur', 'Ponctualité', 'Résistance au stress']),
+    ('G1602', 'Cuisinier', ['Réactivité', 'Travail en équipe', 'Résistance au stress']),
+    ('K2111', 'Formateur', ['Pédagogie', 'Sens de la communication', 'Patience']),
+    ('J1506', 'Infirmier', ['Empathie', 'Rigueur', 'Résistance au stress']),
+    ('M1607', 'Secrétaire', ['Organisation', 'Discrétion', 'Sens de la communication']),
+]
+VILLES = [
+    ('75 - PARIS 11', 48.8589, 2.3800),
+    ('69 - LYON 03', 45.7597, 4.8422),
+    ('33 - BORDEAUX', 44.8378, -0.5792),
+    ('31 - TOULOUSE', 43.6047, 1.4442),
+    ('59 - LILLE', 50.6292, 3.0573),
+]
+CONTRATS = ['CDI', 'CDD', 'MIS', 'SAI']
+CONTEXTES = [
+    {'code': '100', 'libelle': 'Travail en équipe', 'categorie': 'CONDITIONS_TRAVAIL'},
+    {'code': '101', 'libelle': 'Horaires décalés', 'categorie': 'HORAIRE_ET_DUREE_TRAVAIL'},
+    {'code': '102', 'libelle': 'Travail en extérieur', 'categorie': 'LIEUX_ET_DEPLACEMENTS'},
+]
+MAX_WINDOW = 150
+MAX_OFFSET = 3149
+
+
+def generate_offers(count, seed=0):
+    """Génère `count` offres déterministes au format de l'API Offres d'emploi v2."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    offers = []
+    for i in range(count):
+        code, intitule, skills = METIERS[i % len(METIERS)]
+        ville, lat, lon = VILLES[rng.randrange(len(VILLES))]
+        offers.append({
+            'id': f"{100000 + i}M",
+            'intitule': f"{intitule} H/F",
+            'description': f"Nous recherchons un(e) {intitule.lower()}. Qualités attendues : {', '.join(skills).lower()}.",
+            'dateCreation': (start + timedelta(hours=i)).strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+            'romeCode': code,
+            'romeLibelle': intitule,
+            'lieuTravail': {'libelle': ville, 'latitude': lat, 'longitude': lon},
+            'entreprise': {'nom': f"Entreprise {i % 97}"},
+            'typeContrat': CONTRATS[rng.randrange(len(CONTRATS))],
+            'experienceLibelle': rng.choice(['Débutant accepté', '2 ans', '5 ans']),
+            'salaire': {'libelle': f"Annuel de {rng.randrange(22, 55)}000 Euros"},
+            'competences': [{'code': str(300000 + j), 'libelle': skill} for j, skill in enumerate(skills)],
+            'origineOffre': {'origine': '1', 'urlOrigine': f"https://candidat.francetravail.fr/offres/recherche/detail/{100000 + i}M"},
+        })
+    return offers
+
+
+def soft_skills_for(code):
+    """Soft skills fictives (format Match via Soft Skills) pour un code ROME."""
+    skills = next((s for c, _, s in METIERS if c == code), ['Autonomie', 'Rigueur'])
+    return {
+        'uuid': str(uuid.uuid5(uuid.NAMESPACE_URL, code)),
+        'code': code,
+        'skills': {
+            f"skill_{i}": {'summary': summary, 'details': summary, 'score': len(skills) - i}
+            for i, summary in enumerate(skills)
+        }
+    }
+
+
+class MockState:
+    """Configuration et compteurs partagés par les threads du serveur."""
+
+    def __init__(self, latency=0.0, error_rate=0.0, quota=None, offers=1000, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.quota = quota
+        self.offers = generate_offers(offers, seed)
+        self.offers_by_id = {offer['id']: offer for offer in self.offers}
+        self.tokens = set()
+        self.random = random.Random(seed)
+        self.stats = Counter()
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def over_quota(self, api):
+        """Compte l'appel dans la seconde courante et indique si le quota de l'API est dépassé."""
+        if not self.quota:
+            return False
+        second = int(time.time())
+        with self._lock:
+            window_second, count = self._windows.get(api, (second, 0))
+            if window_second != second:
+                count = 0
+            self._windows[api] = (second, count + 1)
+            return count + 1 > self.quota
+
+    def should_fail(self):
+        with self._lock:
+            return self.error_rate > 0 and self.random.random() < self.error_rate
+
+    def record(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Routage des requêtes vers les API simulées (les chemins réels sont conservés)."""
+
+    server_version = 'FranceTravailMock/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    ROUTES = [
+        ('POST', re.compile(r'/connexion/oauth2/access_token$'), 'token', 'token'),
+        ('GET', re.compile(r'/offresdemploi/v2/offres/search$'), 'offres', 'search'),
+        ('GET', re.compile(r'/offresdemploi/v2/offres/(?P<id>[^/]+)$'), 'offres', 'offer'),
+        ('POST', re.compile(r'/professions/job_skills$'), 'soft_skills', 'soft_skills'),
+        ('POST', re.compile(r'/predictionMetiers$'), 'romeo', 'romeo'),
+        ('GET', re.compile(r'/labonneboite/v1/entreprises$'), 'lbb', 'lbb'),
+        ('GET', re.compile(r'/situations-travail/version$'), 'contextes', 'version'),
+        ('GET', re.compile(r'/situations-travail/contexte-travail(?:/(?P<code>[^/]+))?$'), 'contextes', 'contextes'),
+        ('GET', re.compile(r'/__stats$'), None, 'stats'),
+    ]
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def _dispatch(self, method):
+        parts = urlsplit(self.path)
+        self.query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        length = int(self.headers.get('Content-Length') or 0)
+        self.body = self.rfile.read(length) if length else b''
+
+        for route_method, pattern, api, name in self.ROUTES:
+            match = pattern.search(parts.path)
+            if route_method != method or not match:
+                continue
+            self.state.record(name)
+            if self.state.latency:
+                time.sleep(self.state.latency)
+            if api and api != 'token':
+                if self.headers.get('Authorization', '')[len('Bearer '):] not in self.state.tokens:
+                    return self._send_json(401, {'message': 'Token invalide'})
+                if self.state.over_quota(api):
+                    self.state.record('429')
+                    return self._send_json(429, {'message': 'Quota dépassé'}, {'Retry-After': '1'})
+                if self.state.should_fail():
+                    self.state.record('503')
+                    return self._send_json(503, {'message': 'Service indisponible (simulé)'})
+            return getattr(self, f'_handle_{name}')(**match.groupdict())
+
+        self._send_json(404, {'message': f"Route inconnue: {method} {parts.path}"})
+
+    def _send_json(self, status, payload=None, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8') if payload is not None else b''
+        self.send_response(status)
+        if body:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    # --- Routes --- #
+
+    def _handle_token(self):
+        form = {k: v[-1] for k, v in parse_qs(self.body.decode('utf-8')).items()}
+        if not form.get('client_id') or not form.get('client_secret'):
+            return self._send_json(400, {'error': 'invalid_client'})
+        token = uuid.uuid4().hex
+        self.state.tokens.add(token)
+        self._send_json(200, {
+            'access_token': token,
+            'token_type': 'Bearer',
+            'expires_in': 1499,
+            'scope': form.get('scope', '')
+        })
+
+    def _handle_search(self):
+        offers = self.state.offers
+        if self.query.get('codeROME'):
+            codes = set(self.query['codeROME'].split(','))
+            offers = [o for o in offers if o['romeCode'] in codes]
+        if self.query.get('motsCles'):
+            words = self.query['motsCles'].lower().replace(',', ' ').split()
+            offers = [o for o in offers if all(w in (o['intitule'] + ' ' + o['description']).lower() for w in words)]
+        if self.query.get('minCreationDate'):
+            offers = [o for o in offers if o['dateCreation'] >= self.query['minCreationDate']]
+        if self.query.get('maxCreationDate'):
+            offers = [o for o in offers if o['dateCreation'] <= self.query['maxCreationDate']]
+
+        start, end = 0, MAX_WINDOW - 1
+        if self.query.get('range'):
+            try:
+                start, end = (int(x) for x in self.query['range'].split('-'))
+            except ValueError:
+                return self._send_json(400, {'message': 'Paramètre range invalide'})
+        if end < start or end - start + 1 > MAX_WINDOW or end > MAX_OFFSET:
+            return self._send_json(400, {'message': 'Paramètre range invalide'})
+        if not offers or start >= len(offers):
+            return self._send_json(204)
+
+        page = offers[start:end + 1]
+        last = start + len(page) - 1
+        status = 200 if start == 0 and last == len(offers) - 1 else 206
+        self._send_json(status, {'resultats': page}, {
+            'Content-Range': f"offres {start}-{last}/{len(offers)}",
+            'Accept-Range': 'offres 150'
+        })
+
+    def _handle_offer(self, id):
+        offer = self.state.offers_by_id.get(id)
+        if offer is None:
+            return self._send_json(404, {'message': f"Offre {id} introuvable"})
+        self._send_json(200, offer, {'ETag': f'"{id}-v1"'})
+
+    def _handle_soft_skills(self):
+        code = self.query.get('code', '')
+        if len(code) != 5:
+            return self._send_json(400, {'message': 'Code ROME invalide'})
+        self._send_json(200, soft_skills_for(code), {'ETag': f'"{code}-v1"'})
+
+    def _handle_romeo(self):
+        try:
+            payload = json.loads(self.body or b'{}')
+        except ValueError:
+            return self._send_json(400, {'message': 'JSON invalide'})
+        nb = payload.get('options', {}).get('nbResultats', 3)
+        results = []
+        for item in payload.get('appellations', []):
+            intitule = item.get('intitule', '').lower()
+            ranked = sorted(METIERS, key=lambda m: -sum(w in m[1].lower() for w in intitule.split()))
+            results.append({
+                'intitule': item.get('intitule'),
+                'identifiant': item.get('identifiant'),
+                'metiersRome': [
+                    {'codeRome': code, 'libelleRome': libelle, 'libelleAppellation': libelle,
+                     'codeAppellation': str(10000 + i), 'scorePrediction': round(0.9 - 0.2 * i, 2)}
+                    for i, (code, libelle, _) in enumerate(ranked[:nb])
+                ]
+            })
+        self._send_json(200, results)
+
+    def _handle_lbb(self):
+        codes = (self.query.get('rome_codes') or '').split(',')
+        companies = [
+            {'nom': f"Entreprise {code} {i}", 'siret': f"{12345678900000 + i}", 'matched_rome_code': code,
+             'stars': 4.5 - i, 'city': VILLES[i % len(VILLES)][0],
+             'lat': VILLES[i % len(VILLES)][1], 'lon': VILLES[i % len(VILLES)][2]}
+            for code in codes if code for i in range(3)
+        ]
+        self._send_json(200, {'companies_count': len(companies), 'companies': companies, 'entreprises': companies})
+
+    def _handle_version(self):
+        self._send_json(200, {'version': '460', 'lastModifiedDate': '2025-01-01T00:00:00Z'},
+                        {'Last-Modified': 'Wed, 01 Jan 2025 00:00:00 GMT'})
+
+    def _handle_contextes(self, code=None):
+        if code is None:
+            return self._send_json(200, CONTEXTES)
+        contexte = next((c for c in CONTEXTES if c['code'] == code), None)
+        if contexte is None:
+            return self._send_json(404, {'message': f"Contexte {code} introuvable"})
+        self._send_json(200, contexte)
+
+    def _handle_stats(self):
+        with self.state._lock:
+            stats = dict(self.state.stats)
+        self._send_json(200, stats)
+
+
+class MockFranceTravailServer:
+    """
+    Serveur simulé démarré dans un thread (utilisable comme gestionnaire de contexte).
+
+    Args:
+        host, port: Adresse d'écoute (port 0 = port libre choisi par le système).
+        latency: Latence ajoutée à chaque requête (secondes).
+        error_rate: Proportion de réponses 503 (0 à 1).
+        quota: Nombre d'appels par seconde et par API au-delà duquel répondre 429.
+        offers: Nombre d'offres générées.
+        seed: Graine des données et des erreurs aléatoires.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, error_rate=0.0, quota=None, offers=1000, seed=0):
+        self.httpd = ThreadingHTTPServer((host, port), MockHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = MockState(latency, error_rate, quota, offers, seed)
+        self._thread = None
+
+    @property
+    def state(self):
+        return self.httpd.state
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur local imitant les API France Travail.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0, help="Latence par requête (secondes)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Proportion de réponses 503 (0 à 1)")
+    parser.add_argument('--quota', type=int, default=None, help="Appels/seconde par API avant 429")
+    parser.add_argument('--offers', type=int, default=1000, help="Nombre d'offres générées")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = MockFranceTravailServer(args.host, args.port, args.latency, args.error_rate, args.quota, args.offers, args.seed)
+    print(f"🚀 Serveur France Travail simulé sur {server.url}")
+    print(f"   export FRANCE_TRAVAIL_API_URL={server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Arrêt du serveur.")
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+"""
+Facettes (comptages par valeur) des offres de l'entrepôt local.
+
+Pour chaque facette (type de contrat, code ROME, département, expérience,
+tranche de salaire), l'index garde l'ensemble des offres par valeur. Les
+ensembles sont tenus à jour par abonnement à `OfferStore.subscribe`, sans
+recalcul complet.
+
+Les comptages filtrés suivent la logique habituelle des filtres à facettes :
+les valeurs d'une même facette se cumulent (OU), les facettes se combinent
+(ET), et les comptages d'une facette ignorent son propre filtre pour que
+l'utilisateur voie les autres valeurs possibles.
+"""
+
+import os
+import re
+import threading
+from collections import defaultdict
+
+from .api.config import ClientConfig
+from .offer_store import get_offer_store
+
+FACETS = ('typeContrat', 'romeCode', 'departement', 'experience', 'salaire')
+
+# Tranches de salaire annuel brut (bornes inférieures, en euros)
+SALARY_BANDS = ((0, '< 25k'), (25000, '25-35k'), (35000, '35-45k'), (45000, '45-60k'), (60000, '60k+'))
+SALARY_RE = re.compile(r'(Annuel|Mensuel|Horaire) de ([\d.,]+)')
+# Facteurs de conversion vers un salaire annuel
+SALARY_PERIODS = {'Annuel': 1, 'Mensuel': 12, 'Horaire': 1607}
+DEPARTEMENT_RE = re.compile(r'^(97\d|2[AB]|\d{2})\b')
+UNKNOWN = 'Non précisé'
+
+
+def salary_band(offer):
+    """Tranche du salaire annuel de l'offre (d'après salaire.libelle)."""
+    match = SALARY_RE.search((offer.get('salaire') or {}).get('libelle') or '')
+    if not match:
+        return UNKNOWN
+    try:
+        amount = float(match.group(2).replace(',', '.')) * SALARY_PERIODS[match.group(1)]
+    except ValueError:
+        return UNKNOWN
+    return [label for floor, label in SALARY_BANDS if amount >= floor][-1]
+
+
+def departement(offer):
+    """Département du lieu de travail ("75 - PARIS 11" ou code postal)."""
+    lieu = offer.get('lieuTravail') or {}
+    match = DEPARTEMENT_RE.match(lieu.get('libelle') or '')
+    if match:
+        return match.group(1)
+    code = lieu.get('codePostal') or lieu.get('commune') or ''
+    return code[:3] if code.startswith('97') else code[:2] or UNKNOWN
+
+
+def facet_values(offer):
+    """Valeurs des facettes d'une offre."""
+    return {
+        'typeContrat': offer.get('typeContrat') or UNKNOWN,
+        'romeCode': offer.get('romeCode') or UNKNOWN,
+        'departement': departement(offer),
+        'experience': offer.get('experienceLibelle') or UNKNOWN,
+        'salaire': salary_band(offer),
+    }
+
+
+def _as_set(values):
+    if isinstance(values, str):
+        values = values.split(',')
+    return {value.strip() for value in values if value.strip()}
+
+
+def _normalize_filters(filters):
+    return {facet: _as_set(values) for facet, values in (filters or {}).items() if facet in FACETS and values}
+
+
+class OfferFacets:
+    """Ensembles d'offres par valeur de facette."""
+
+    def __init__(self, store=None):
+        self.store = store
+        self._ids = defaultdict(lambda: defaultdict(set))
+        self._values = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._values)
+
+    def add(self, offer):
+        offer_id = offer.get('id')
+        if not offer_id:
+            return
+        values = facet_values(offer)
+        with self._lock:
+            self.remove(offer_id)
+            for facet, value in values.items():
+                self._ids[facet][value].add(offer_id)
+            self._values[offer_id] = values
+
+    def remove(self, offer_id):
+        with self._lock:
+            values = self._values.pop(offer_id, None)
+            for facet, value in (values or {}).items():
+                self._ids[facet][value].discard(offer_id)
+                if not self._ids[facet][value]:
+                    del self._ids[facet][value]
+
+    def update(self, changed, deleted):
+        """Écouteur d'OfferStore : applique les offres modifiées et supprimées."""
+        with self._lock:
+            for offer in changed:
+                self.add(offer)
+            for offer_id in deleted:
+                self.remove(offer_id)
+
+    def _filtered(self, filters, skip=None):
+        """Identifiants des offres satisfaisant les filtres (sauf la facette `skip`), ou None si aucun filtre."""
+        result = None
+        for facet, values in filters.items():
+            if facet == skip:
+                continue
+            ids = set().union(*(self._ids[facet].get(value, ()) for value in values))
+            result = ids if result is None else result & ids
+        return result
+
+    def counts(self, filters=None):
+        """
+        Comptages des facettes, éventuellement filtrés.
+
+        Args:
+            filters: {facette: valeur(s)} (liste ou chaîne séparée par des virgules).
+
+        Returns:
+            dict: {'total': nombre d'offres filtrées, 'facets': {facette: {valeur: nombre}}}
+        """
+        filters = _normalize_filters(filters)
+        with self._lock:
+            matching = self._filtered(filters)
+            facets = {}
+            for facet in FACETS:
+                base = self._filtered(filters, skip=facet)
+                counts = {value: len(ids) if base is None else len(ids & base)
+                          for value, ids in self._ids[facet].items()}
+                facets[facet] = dict(sorted(((v, n) for v, n in counts.items() if n), key=lambda item: -item[1]))
+            total = len(self._values) if matching is None else len(matching)
+        return {'total': total, 'facets': facets}
+
+    def offers(self, filters=None, limit=20):
+        """Offres de l'entrepôt satisfaisant les filtres."""
+        filters = _normalize_filters(filters)
+        with self._lock:
+            matching = self._filtered(filters)
+            ids = list(self._values if matching is None else matching)[:limit]
+        return [offer for offer in map(self.store.get, ids) if offer is not None] if self.store else []
+
+
+def build_offer_facets(store):
+    facets = OfferFacets(store)
+    store.subscribe(facets.update)
+    for offer in store.iter_offers():
+        facets.add(offer)
+    return facets
+
+
+_facets = None
+_facets_lock = threading.Lock()
+
+
+def get_offer_facets():
+    """
+    Facettes partagées de l'entrepôt local, ou None si aucune synchronisation
+    n'a eu lieu. Tenues à jour des synchronisations d'un autre processus.
+    """
+    global _facets
+    with _facets_lock:
+        if _facets is None:
+            if not os.path.exists(ClientConfig.OFFER_STORE):
+                return None
+            _facets = build_offer_facets(get_offer_store())
+    get_offer_store().refresh()
+    return _facets
@@ -0,0 +1,160 @@
+"""
+Index inversé en texte intégral des offres de l'entrepôt local (BM25).
+
+Chaque offre est indexée sur son intitulé (pondéré) et sa description,
+analysés par text_analysis (accents, mots vides, racines). L'index est tenu
+en mémoire et suit l'entrepôt : abonné à `OfferStore.subscribe`, il indexe
+les offres insérées ou modifiées et retire les offres supprimées au fil des
+synchronisations, sans reconstruction.
+
+La recherche (offres similaires, recherche libre) ne parcourt que les listes
+des termes de la requête les plus discriminants et ne fait aucun appel à
+l'API France Travail.
+"""
+
+import heapq
+import math
+import os
+import threading
+from collections import Counter, defaultdict
+
+from .api.config import ClientConfig
+from .offer_store import get_offer_store
+from .text_analysis import tokenize
+
+# Un terme de l'intitulé compte comme TITLE_WEIGHT occurrences dans la description
+TITLE_WEIGHT = 3
+# Termes de requête retenus (les plus rares) : borne le coût d'une requête longue
+MAX_QUERY_TERMS = 32
+
+
+def offer_terms(offer):
+    """Fréquences des termes indexés d'une offre."""
+    terms = Counter(tokenize(offer.get('description')))
+    for term in tokenize(offer.get('intitule')):
+        terms[term] += TITLE_WEIGHT
+    return terms
+
+
+class OfferIndex:
+    """
+    Index BM25 d'offres d'emploi.
+
+    Args:
+        store: Entrepôt d'où relire les offres trouvées (optionnel).
+        k1: Saturation de la fréquence des termes.
+        b: Normalisation par la longueur des documents.
+    """
+
+    def __init__(self, store=None, k1=1.2, b=0.75):
+        self.store = store
+        self.k1 = k1
+        self.b = b
+        self._postings = defaultdict(dict)
+        self._lengths = {}
+        self._doc_terms = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def add(self, offer):
+        """Indexe (ou réindexe) une offre."""
+        offer_id = offer.get('id')
+        if not offer_id:
+            return
+        terms = offer_terms(offer)
+        with self._lock:
+            self.remove(offer_id)
+            for term, frequency in terms.items():
+                self._postings[term][offer_id] = frequency
+            length = sum(terms.values())
+            self._lengths[offer_id] = length
+            self._doc_terms[offer_id] = tuple(terms)
+            self._total_length += length
+
+    def remove(self, offer_id):
+        with self._lock:
+            length = self._lengths.pop(offer_id, None)
+            if length is None:
+                return
+            self._total_length -= length
+            for term in self._doc_terms.pop(offer_id):
+                del self._postings[term][offer_id]
+                if not self._postings[term]:
+                    del self._postings[term]
+
+    def update(self, changed, deleted):
+        """Écouteur d'OfferStore : applique les offres modifiées et supprimées."""
+        with self._lock:
+            for offer in changed:
+                self.add(offer)
+            for offer_id in deleted:
+                self.remove(offer_id)
+
+    def _idf(self, term):
+        df = len(self._postings.get(term, ()))
+        return math.log(1 + (len(self._lengths) - df + 0.5) / (df + 0.5))
+
+    def search(self, query, k=10, exclude=()):
+        """
+        Retourne les `k` meilleures offres pour la requête.
+
+        Returns:
+            list: Couples (id, score), du plus pertinent au moins pertinent.
+        """
+        with self._lock:
+            if not self._lengths:
+                return []
+            terms = [t for t in set(tokenize(query)) if t in self._postings]
+            terms = heapq.nlargest(MAX_QUERY_TERMS, terms, key=self._idf)
+            average = self._total_length / len(self._lengths)
+            scores = defaultdict(float)
+            for term in terms:
+                idf = self._idf(term)
+                for offer_id, frequency in self._postings[term].items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[offer_id] / average)
+                    scores[offer_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+        for offer_id in exclude:
+            scores.pop(offer_id, None)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def search_offers(self, query, k=10, exclude=()):
+        """Comme `search`, mais retourne les offres de l'entrepôt (avec leur 'score')."""
+        offers = []
+        for offer_id, score in self.search(query, k, exclude):
+            offer = self.store.get(offer_id) if self.store else None
+            if offer is not None:
+                offers.append(dict(offer, score=round(score, 3)))
+        return offers
+
+
+def build_offer_index(store):
+    """Indexe les offres actives de l'entrepôt et suit ses modifications."""
+    index = OfferIndex(store)
+    # Abonnement avant le parcours : une synchronisation concurrente n'est pas perdue
+    store.subscribe(index.update)
+    for offer in store.iter_offers():
+        index.add(offer)
+    return index
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_offer_index():
+    """
+    Index partagé de l'entrepôt local, ou None si aucune synchronisation n'a eu
+    lieu. Les modifications faites par offer_sync depuis l'appel précédent y
+    sont appliquées (OfferStore.refresh).
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            if not os.path.exists(ClientConfig.OFFER_STORE):
+                return None
+            _index = build_offer_index(get_offer_store())
+    get_offer_store().refresh()
+    return _index
@@ -0,0 +1,339 @@
+"""
+Entrepôt local (SQLite) des offres d'emploi France Travail.
+
+Les offres récupérées par `OffresClient` sont conservées sur disque, avec
+leur date de création et d'actualisation, les recherches (scopes) qui les
+ont ramenées et, le cas échéant, leur date de suppression. La recherche et
+le matching peuvent ainsi lire localement au lieu d'appeler /offres/search
+à chaque requête utilisateur. L'entrepôt est alimenté par offer_sync.
+
+Les entreprises La Bonne Boite déjà rencontrées y sont aussi conservées,
+avec les zones (code ROME, centre, rayon) déjà interrogées (voir geo_index).
+
+Les index dérivés (texte intégral, géographique, facettes) s'abonnent aux
+modifications avec `subscribe`. Chaque écriture incrémente un numéro de
+génération enregistré dans la base : `refresh` transmet aux abonnés les
+offres modifiées par un autre processus (offer_sync) depuis la dernière
+lecture.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from .api.config import ClientConfig
+from .api.json_codec import loads, dumps
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS offers ('
+    'id TEXT PRIMARY KEY, date_creation TEXT, date_actualisation TEXT, rome_code TEXT, '
+    'type_contrat TEXT, data BLOB, first_seen REAL, last_seen REAL, deleted_at REAL, generation INTEGER DEFAULT 0)',
+    'CREATE INDEX IF NOT EXISTS offers_creation ON offers (date_creation)',
+    'CREATE INDEX IF NOT EXISTS offers_rome ON offers (rome_code)',
+    'CREATE TABLE IF NOT EXISTS offer_scopes ('
+    'scope TEXT, offer_id TEXT, last_seen REAL, PRIMARY KEY (scope, offer_id))',
+    'CREATE TABLE IF NOT EXISTS sync_state ('
+    'scope TEXT PRIMARY KEY, watermark TEXT, last_sync REAL, last_full_sync REAL)',
+    'CREATE TABLE IF NOT EXISTS companies ('
+    'siret TEXT PRIMARY KEY, latitude REAL, longitude REAL, rome_codes TEXT, data BLOB, last_seen REAL)',
+    'CREATE TABLE IF NOT EXISTS company_areas ('
+    'rome_code TEXT, latitude REAL, longitude REAL, distance REAL, fetched_at REAL)',
+    'CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value INTEGER)',
+    "INSERT OR IGNORE INTO store_meta VALUES ('generation', 0)",
+)
+
+
+def offer_version(offer):
+    """Date de la dernière modification connue d'une offre."""
+    return offer.get('dateActualisation') or offer.get('dateCreation')
+
+
+class OfferStore:
+    """
+    Entrepôt d'offres SQLite. `path=None` conserve la base en mémoire.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._listeners = []
+        # Dernière génération transmise aux abonnés
+        self._seen_generation = None
+
+    def _connection(self):
+        if self._conn is None:
+            if self.path:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path or ':memory:', check_same_thread=False, timeout=5)
+            if self.path:
+                conn.execute('PRAGMA journal_mode=WAL')
+            with conn:
+                for statement in SCHEMA:
+                    conn.execute(statement)
+                columns = {row[1] for row in conn.execute('PRAGMA table_info(offers)')}
+                if 'generation' not in columns:
+                    # Entrepôt créé avant l'ajout des générations
+                    conn.execute('ALTER TABLE offers ADD COLUMN generation INTEGER DEFAULT 0')
+                conn.execute('CREATE INDEX IF NOT EXISTS offers_generation ON offers (generation)')
+            self._conn = conn
+            self._seen_generation = self._generation(conn)
+        return self._conn
+
+    @staticmethod
+    def _generation(conn):
+        return conn.execute("SELECT value FROM store_meta WHERE key = 'generation'").fetchone()[0]
+
+    def _next_generation(self, conn):
+        """Incrémente la génération dans la transaction d'écriture en cours."""
+        conn.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'generation'")
+        generation = self._generation(conn)
+        if generation == self._seen_generation + 1:
+            # Aucune écriture d'un autre processus entre-temps : les abonnés sont à jour
+            self._seen_generation = generation
+        return generation
+
+    def subscribe(self, listener):
+        """Appelle `listener(offres modifiées, ids supprimés)` après chaque écriture."""
+        self._listeners.append(listener)
+
+    def _notify(self, changed, deleted):
+        if not changed and not deleted:
+            return
+        for listener in self._listeners:
+            try:
+                listener(changed, deleted)
+            except Exception as e:
+                logging.error(f"Erreur lors de la mise à jour d'un index d'offres: {e}")
+
+    def upsert(self, offers, scope=None, seen_at=None):
+        """
+        Insère ou met à jour des offres (dict au format de l'API).
+
+        Returns:
+            dict: Nombre d'offres 'inserted', 'updated' et 'unchanged'.
+        """
+        seen_at = seen_at or time.time()
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        changed = []
+        generation = None
+        with self._lock, self._connection() as conn:
+            for offer in offers:
+                offer_id = offer.get('id')
+                if not offer_id:
+                    continue
+                data = dumps(offer)
+                row = conn.execute('SELECT data, deleted_at FROM offers WHERE id = ?', (offer_id,)).fetchone()
+                if (row is None or bytes(row[0]) != data or row[1] is not None) and generation is None:
+                    generation = self._next_generation(conn)
+                if row is None:
+                    conn.execute(
+                        'INSERT INTO offers VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL, ?)',
+                        (offer_id, offer.get('dateCreation'), offer_version(offer), offer.get('romeCode'),
+                         offer.get('typeContrat'), data, seen_at, seen_at, generation)
+                    )
+                    counts['inserted'] += 1
+                    changed.append(offer)
+                elif bytes(row[0]) != data or row[1] is not None:
+                    conn.execute(
+                        'UPDATE offers SET date_creation = ?, date_actualisation = ?, rome_code = ?, '
+                        'type_contrat = ?, data = ?, last_seen = ?, deleted_at = NULL, generation = ? WHERE id = ?',
+                        (offer.get('dateCreation'), offer_version(offer), offer.get('romeCode'),
+                         offer.get('typeContrat'), data, seen_at, generation, offer_id)
+                    )
+                    counts['updated'] += 1
+                    changed.append(offer)
+                else:
+                    conn.execute('UPDATE offers SET last_seen = ? WHERE id = ?', (seen_at, offer_id))
+                    counts['unchanged'] += 1
+                if scope is not None:
+                    conn.execute('INSERT OR REPLACE INTO offer_scopes VALUES (?, ?, ?)', (scope, offer_id, seen_at))
+        self._notify(changed, [])
+        return counts
+
+    def mark_deleted(self, scope, seen_before, created_since=None, skipped=(), deleted_at=None):
+        """
+        Marque supprimées les offres du scope qui n'ont pas été revues depuis
+        `seen_before` (fin d'une synchronisation complète). Retourne leurs ids.
+
+        `created_since` (date de l'API) limite la suppression aux offres créées
+        depuis cette date, et `skipped` exclut des plages de création
+        (min, max) dont les résultats étaient incomplets.
+        """
+        deleted_at = deleted_at or time.time()
+        with self._lock, self._connection() as conn:
+            query = ('SELECT o.id FROM offers o JOIN offer_scopes s ON s.offer_id = o.id '
+                     'WHERE s.scope = ? AND s.last_seen < ? AND o.deleted_at IS NULL')
+            params = [scope, seen_before]
+            # Dates de création ramenées au format des filtres de l'API (à la seconde)
+            created = "substr(o.date_creation, 1, 19) || 'Z'"
+            if created_since is not None:
+                query += f' AND {created} >= ?'
+                params.append(created_since)
+            for window in skipped:
+                query += f' AND {created} NOT BETWEEN ? AND ?'
+                params.extend(window)
+            ids = [row[0] for row in conn.execute(query, params)]
+            if ids:
+                generation = self._next_generation(conn)
+                conn.executemany('UPDATE offers SET deleted_at = ?, generation = ? WHERE id = ?',
+                                 [(deleted_at, generation, i) for i in ids])
+        self._notify([], ids)
+        return ids
+
+    def refresh(self):
+        """
+        Transmet aux abonnés les offres modifiées ou supprimées par un autre
+        processus depuis la dernière lecture (une seule requête si rien n'a changé).
+        """
+        with self._lock:
+            conn = self._connection()
+            generation = self._generation(conn)
+            if generation == self._seen_generation:
+                return
+            rows = conn.execute(
+                'SELECT id, data, deleted_at FROM offers WHERE generation > ?', (self._seen_generation,)
+            ).fetchall()
+            self._seen_generation = generation
+        changed = [loads(data) for _, data, deleted_at in rows if deleted_at is None]
+        deleted = [offer_id for offer_id, _, deleted_at in rows if deleted_at is not None]
+        logging.info(f"Entrepôt d'offres modifié par un autre processus: {len(changed)} offres à jour, {len(deleted)} supprimées.")
+        self._notify(changed, deleted)
+
+    def get(self, offer_id):
+        """Retourne une offre active, ou None."""
+        with self._lock:
+            row = self._connection().execute(
+                'SELECT data FROM offers WHERE id = ? AND deleted_at IS NULL', (offer_id,)
+            ).fetchone()
+        return loads(row[0]) if row else None
+
+    def search(self, rome_code=None, type_contrat=None, created_since=None, keywords=None, limit=50):
+        """Offres actives filtrées, des plus récentes aux plus anciennes."""
+        clauses, params = ['deleted_at IS NULL'], []
+        if rome_code:
+            clauses.append('rome_code = ?')
+            params.append(rome_code)
+        if type_contrat:
+            clauses.append('type_contrat = ?')
+            params.append(type_contrat)
+        if created_since:
+            clauses.append('date_creation >= ?')
+            params.append(created_since)
+        query = f"SELECT data FROM offers WHERE {' AND '.join(clauses)} ORDER BY date_creation DESC"
+        words = (keywords or '').lower().split()
+        results = []
+        with self._lock:
+            for (data,) in self._connection().execute(query, params):
+                offer = loads(data)
+                text = f"{offer.get('intitule', '')} {offer.get('description', '')}".lower()
+                if all(word in text for word in words):
+                    results.append(offer)
+                    if limit and len(results) >= limit:
+                        break
+        return results
+
+    def iter_offers(self, include_deleted=False):
+        """Parcourt toutes les offres (actives par défaut)."""
+        query = 'SELECT data FROM offers' + ('' if include_deleted else ' WHERE deleted_at IS NULL')
+        with self._lock:
+            rows = self._connection().execute(query).fetchall()
+        for (data,) in rows:
+            yield loads(data)
+
+    def count(self):
+        with self._lock:
+            return self._connection().execute('SELECT COUNT(*) FROM offers WHERE deleted_at IS NULL').fetchone()[0]
+
+    def get_state(self, scope):
+        """Retourne {'watermark', 'last_sync', 'last_full_sync'} du scope, ou None."""
+        with self._lock:
+            row = self._connection().execute(
+                'SELECT watermark, last_sync, last_full_sync FROM sync_state WHERE scope = ?', (scope,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'watermark': row[0], 'last_sync': row[1], 'last_full_sync': row[2]}
+
+    def set_state(self, scope, watermark, last_sync, last_full_sync=None):
+        state = self.get_state(scope) or {}
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)',
+                (scope, watermark, last_sync, last_full_sync or state.get('last_full_sync'))
+            )
+
+    def upsert_companies(self, companies, seen_at=None):
+        """
+        Enregistre des entreprises La Bonne Boite.
+
+        Args:
+            companies: Couples (entreprise, latitude, longitude, codes ROME).
+        """
+        seen_at = seen_at or time.time()
+        with self._lock, self._connection() as conn:
+            for company, latitude, longitude, rome_codes in companies:
+                row = conn.execute('SELECT rome_codes FROM companies WHERE siret = ?', (company['siret'],)).fetchone()
+                codes = set(rome_codes) | set(row[0].split(',') if row and row[0] else ())
+                conn.execute(
+                    'INSERT OR REPLACE INTO companies VALUES (?, ?, ?, ?, ?, ?)',
+                    (company['siret'], latitude, longitude, ','.join(sorted(codes)), dumps(company), seen_at)
+                )
+
+    def iter_companies(self):
+        """Parcourt les entreprises : (entreprise, latitude, longitude, codes ROME)."""
+        with self._lock:
+            rows = self._connection().execute('SELECT data, latitude, longitude, rome_codes FROM companies').fetchall()
+        for data, latitude, longitude, rome_codes in rows:
+            yield loads(data), latitude, longitude, tuple(filter(None, rome_codes.split(',')))
+
+    def set_company_codes(self, companies):
+        """
+        Remplace les codes ROME d'entreprises déjà connues.
+
+        Args:
+            companies: Couples (siret, codes ROME) ; une entreprise sans code est supprimée.
+        """
+        with self._lock, self._connection() as conn:
+            for siret, rome_codes in companies:
+                if rome_codes:
+                    conn.execute('UPDATE companies SET rome_codes = ? WHERE siret = ?',
+                                 (','.join(sorted(rome_codes)), siret))
+                else:
+                    conn.execute('DELETE FROM companies WHERE siret = ?', (siret,))
+
+    def add_company_area(self, rome_code, latitude, longitude, distance, fetched_at=None):
+        """Mémorise une zone déjà interrogée auprès de La Bonne Boite."""
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                'INSERT INTO company_areas VALUES (?, ?, ?, ?, ?)',
+                (rome_code, latitude, longitude, distance, fetched_at or time.time())
+            )
+
+    def prune_company_areas(self, before):
+        """Oublie les zones interrogées avant `before`."""
+        with self._lock, self._connection() as conn:
+            conn.execute('DELETE FROM company_areas WHERE fetched_at < ?', (before,))
+
+    def company_areas(self, since=0):
+        """Zones interrogées depuis `since` : (code ROME, latitude, longitude, rayon, date)."""
+        with self._lock:
+            return self._connection().execute(
+                'SELECT rome_code, latitude, longitude, distance, fetched_at FROM company_areas WHERE fetched_at >= ?',
+                (since,)
+            ).fetchall()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_offer_store():
+    """Entrepôt partagé du processus (FRANCE_TRAVAIL_OFFER_STORE)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = OfferStore(ClientConfig.OFFER_STORE)
+        return _store
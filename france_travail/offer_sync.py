@@ -0,0 +1,195 @@
+"""
+Synchronisation incrémentale de l'entrepôt d'offres (offer_store).
+
+Chaque recherche synchronisée (scope) garde un filigrane : la date de la
+dernière synchronisation. Une synchronisation incrémentale ne demande que
+les offres créées depuis ce filigrane (filtres minCreationDate /
+maxCreationDate de l'API, avec un recouvrement pour les offres indexées en
+retard). L'API Offres d'emploi v2 ne permet pas de filtrer par date de
+modification : les offres actualisées et les offres supprimées sont
+réconciliées lors d'une synchronisation complète (au plus tard toutes les
+`full_interval` secondes), qui relit les `history_days` derniers jours et
+marque supprimées les offres du scope créées sur cette période qui n'ont
+pas été revues. Les offres plus anciennes ne sont pas relues et restent en
+l'état.
+
+Une plage de dates ramenant plus de 3150 offres (limite de pagination de
+l'API) est découpée en sous-plages ; une plage qui ne peut plus l'être
+(moins de MIN_SPAN) est incomplète et aucune de ses offres n'est marquée
+supprimée. Les appels sont émis en priorité batch.
+Si une plage ne peut pas être lue (authentification refusée, erreur HTTP),
+la synchronisation s'interrompt sans marquer d'offre supprimée ni avancer
+le filigrane.
+
+Usage :
+    python -m france_travail.offer_sync --mots-cles python --departement 75
+    python -m france_travail.offer_sync --rome M1805 --full
+"""
+
+import argparse
+import json
+import logging
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from .api.pagination import MAX_OFFSET
+from .api.projection import OFFER_SUMMARY_FIELDS
+from .api.scheduler import request_priority, BATCH
+from .offer_store import get_offer_store
+
+API_DATE_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+# Nombre maximal d'offres accessibles pour une même recherche
+MAX_RESULTS = MAX_OFFSET + 1
+# Plus petite plage de dates découpée (en deçà, les offres excédentaires sont perdues)
+MIN_SPAN = timedelta(minutes=1)
+
+
+def format_api_date(value):
+    return value.astimezone(timezone.utc).strftime(API_DATE_FORMAT)
+
+
+def parse_api_date(value):
+    return datetime.strptime(value[:19], '%Y-%m-%dT%H:%M:%S').replace(tzinfo=timezone.utc)
+
+
+def scope_for(params):
+    """Identifiant stable d'une recherche synchronisée."""
+    return json.dumps(params or {}, sort_keys=True, ensure_ascii=False)
+
+
+class OfferSync:
+    """
+    Synchronise les offres d'une recherche dans un entrepôt.
+
+    Args:
+        client: OffresClient.
+        store: OfferStore.
+        params: Paramètres de recherche (motsCles, codeROME, departement...).
+        fields: Champs conservés pour chaque offre (None : offres complètes).
+        history_days: Profondeur (jours) d'une synchronisation complète.
+        overlap: Recouvrement (secondes) avec la synchronisation précédente.
+        full_interval: Délai (secondes) au-delà duquel la synchronisation est complète.
+    """
+
+    def __init__(self, client, store, params=None, fields=OFFER_SUMMARY_FIELDS,
+                 history_days=31, overlap=3600, full_interval=24 * 3600):
+        self.client = client
+        self.store = store
+        self.params = dict(params or {})
+        self.scope = scope_for(self.params)
+        self.fields = fields
+        self.history_days = history_days
+        self.overlap = overlap
+        self.full_interval = full_interval
+
+    def _search_params(self, start, end):
+        params = dict(self.params)
+        params['minCreationDate'] = format_api_date(start)
+        params['maxCreationDate'] = format_api_date(end)
+        return params
+
+    def _is_full_due(self, state):
+        if state is None or not state['watermark'] or not state['last_full_sync']:
+            return True
+        return time.time() - state['last_full_sync'] >= self.full_interval
+
+    def date_windows(self, start, end, truncated=None):
+        """
+        Découpe [start, end] en plages de création de moins de MAX_RESULTS offres chacune.
+
+        Les plages qui dépassent encore MAX_RESULTS sont ajoutées à la liste
+        `truncated` si elle est fournie.
+        """
+        pending = [(start, end)]
+        while pending:
+            window_start, window_end = pending.pop()
+            total = self.client.count_search(self._search_params(window_start, window_end))
+            if not total:
+                continue
+            if total > MAX_RESULTS and window_end - window_start > MIN_SPAN:
+                middle = window_start + (window_end - window_start) / 2
+                # Plage la plus ancienne traitée en premier
+                pending.append((middle, window_end))
+                pending.append((window_start, middle))
+                continue
+            if total > MAX_RESULTS:
+                logging.warning(f"{total} offres entre {window_start} et {window_end}: seules {MAX_RESULTS} sont accessibles.")
+                if truncated is not None:
+                    truncated.append((window_start, window_end))
+            yield window_start, window_end
+
+    def run(self, full=None):
+        """
+        Lance une synchronisation (complète si `full`, ou si elle est due).
+
+        Returns:
+            dict: Offres insérées, mises à jour, inchangées et supprimées.
+
+        Raises:
+            FranceTravailAPIError: Une plage n'a pas pu être lue ; ni les
+                suppressions ni le filigrane ne sont alors enregistrés.
+        """
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        state = self.store.get_state(self.scope)
+        if full is None:
+            full = self._is_full_due(state)
+        if full:
+            start = now - timedelta(days=self.history_days)
+        else:
+            start = parse_api_date(state['watermark']) - timedelta(seconds=self.overlap)
+
+        logging.info(f"Synchronisation {'complète' if full else 'incrémentale'} des offres {self.params} depuis {start}.")
+        started = time.time()
+        stats = Counter()
+        truncated = []
+        with request_priority(BATCH):
+            for window_start, window_end in self.date_windows(start, now, truncated):
+                offers = self.client.search_all(self._search_params(window_start, window_end), fields=self.fields,
+                                                strict=True)
+                stats.update(self.store.upsert(offers, scope=self.scope, seen_at=started))
+        deleted = []
+        if full:
+            skipped = [(format_api_date(window_start), format_api_date(window_end))
+                       for window_start, window_end in truncated]
+            deleted = self.store.mark_deleted(self.scope, started, created_since=format_api_date(start),
+                                              skipped=skipped)
+
+        finished = time.time()
+        self.store.set_state(self.scope, format_api_date(now), finished, finished if full else None)
+        result = {
+            'full': full,
+            'inserted': stats['inserted'],
+            'updated': stats['updated'],
+            'unchanged': stats['unchanged'],
+            'deleted': len(deleted),
+            'duration': round(finished - started, 2)
+        }
+        logging.info(f"Synchronisation terminée: {result}")
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synchronise l'entrepôt local d'offres France Travail.")
+    parser.add_argument('--mots-cles', help='Mots-clés de la recherche synchronisée.')
+    parser.add_argument('--rome', help='Code(s) ROME, séparés par des virgules.')
+    parser.add_argument('--departement', help='Département(s), séparés par des virgules.')
+    parser.add_argument('--full', action='store_true', help='Force une synchronisation complète.')
+    parser.add_argument('--history-days', type=int, default=31, help='Profondeur (jours) d\'une synchronisation complète.')
+    args = parser.parse_args()
+
+    from .api.factory import get_client
+
+    params = {}
+    if args.mots_cles:
+        params['motsCles'] = args.mots_cles
+    if args.rome:
+        params['codeROME'] = args.rome
+    if args.departement:
+        params['departement'] = args.departement
+    sync = OfferSync(get_client('offres'), get_offer_store(), params, history_days=args.history_days)
+    print(json.dumps(sync.run(full=True if args.full else None), ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -8,12 +8,105 @@ Ce module utilise les nouvelles APIs ROME 4.0 pour :
 - Accéder aux contextes de travail et fiches métiers
 """
 
-import requests
 import json
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import re
 
+import requests
+
+from .api.circuit_breaker import get_breaker, guarded_request
+from .api.config import ClientConfig
+from .api.exceptions import CircuitOpenError
+from .api.session_pool import get_session
+from .api.token_cache import token_store
+
+
+# Seuil de similarité (Jaccard sur les mots) au-delà duquel deux compétences correspondent
+SIMILARITY_THRESHOLD = 0.7
+
+
+class _SubstringIndex:
+    """
+    Chaînes indexées par trigrammes : les tests d'inclusion (« texte dans une
+    des chaînes », « une des chaînes dans le texte ») ne vérifient que les
+    candidates au lieu de parcourir toute la liste.
+    """
+
+    def __init__(self, strings):
+        self.strings = list(strings)
+        self._grams = {}     # trigramme -> indices des chaînes qui le contiennent
+        self._prefixes = {}  # trois premiers caractères -> indices des chaînes
+        self._short = []     # chaînes de moins de trois caractères, toujours vérifiées
+        for i, string in enumerate(self.strings):
+            if len(string) < 3:
+                self._short.append(i)
+                continue
+            self._prefixes.setdefault(string[:3], []).append(i)
+            for j in range(len(string) - 2):
+                self._grams.setdefault(string[j:j + 3], set()).add(i)
+
+    def any_containing(self, text: str) -> bool:
+        """Vrai si `text` est inclus dans au moins une des chaînes."""
+        if len(text) < 3:
+            return any(text in string for string in self.strings)
+        candidates = None
+        for j in range(len(text) - 2):
+            ids = self._grams.get(text[j:j + 3])
+            if not ids:
+                return False
+            if candidates is None or len(ids) < len(candidates):
+                candidates = ids
+        return any(text in self.strings[i] for i in candidates)
+
+    def any_contained_in(self, text: str) -> bool:
+        """Vrai si au moins une des chaînes est incluse dans `text`."""
+        if any(self.strings[i] in text for i in self._short):
+            return True
+        for j in range(len(text) - 2):
+            for i in self._prefixes.get(text[j:j + 3], ()):
+                if text.startswith(self.strings[i], j):
+                    return True
+        return False
+
+
+class CompetenceIndex:
+    """
+    Index des compétences d'un métier ROME 4.0, construit une fois par code
+    ROME et réutilisé pour chaque utilisateur comparé à ce métier.
+
+    Pour chaque catégorie, les inclusions passent par un index de trigrammes et
+    la similarité n'est calculée que pour les compétences partageant au moins
+    un mot avec la compétence de l'utilisateur (condition nécessaire pour
+    dépasser le seuil). Le résultat est celui de la comparaison exhaustive.
+    """
+
+    def __init__(self, metier_competences: Dict[str, List[str]]):
+        self.metier_competences = {category: list(comps) for category, comps in metier_competences.items()}
+        self._categories = {}
+        for category, rome_competences in self.metier_competences.items():
+            competences = [comp.lower().strip() for comp in rome_competences]
+            words = {}
+            for i, comp in enumerate(competences):
+                for word in set(comp.lower().split()):
+                    words.setdefault(word, set()).add(i)
+            self._categories[category] = (competences, _SubstringIndex(competences), words)
+
+    def matches(self, category: str, user_skill: str, similarity) -> bool:
+        """
+        Vrai si `user_skill` (en minuscules) correspond à une compétence de la
+        catégorie : égalité, inclusion dans un sens ou dans l'autre, ou
+        similarité supérieure au seuil.
+        """
+        competences, substrings, words = self._categories[category]
+        if substrings.any_containing(user_skill) or substrings.any_contained_in(user_skill):
+            return True
+        candidates = set()
+        for word in set(user_skill.lower().split()):
+            candidates.update(words.get(word, ()))
+        return any(similarity(user_skill, competences[i]) > SIMILARITY_THRESHOLD for i in candidates)
+
+
 class FranceTravailROME4API:
     """
     Client pour les APIs ROME 4.0 de France Travail.
@@ -27,8 +120,11 @@ class FranceTravailROME4API:
         self.token_expiry = None
         
         # URLs pour ROME 4.0
-        self.auth_url = "https://entreprise.pole-emploi.fr/connexion/oauth2/access_token"
-        self.base_url = "https://api.francetravail.io/partenaire"
+        self.auth_url = ClientConfig.resolve_url("https://entreprise.pole-emploi.fr/connexion/oauth2/access_token", auth=True)
+        self.base_url = ClientConfig.resolve_url("https://api.francetravail.io/partenaire")
+        self.session = get_session(self.base_url)
+        # Scopes pour ROME 4.0
+        self.scope = 'api_rome-metiersv1 api_rome-competencesv1 api_rome-contextesv1 api_rome-fichesv1'
         
         # Endpoints ROME 4.0
         self.endpoints = {
@@ -45,14 +141,26 @@ class FranceTravailROME4API:
             'contextes': {},
             'fiches': {}
         }
+        # Index des compétences par code ROME, réutilisés d'un matching à l'autre
+        self.competence_indexes = {}
+
+        # Raison du dernier repli (circuit ouvert, API indisponible), reprise dans les résultats simulés
+        self.degraded_reason = None
     
     def authenticate(self) -> bool:
-        """Authentification avec les scopes ROME 4.0."""
+        """Authentification avec les scopes ROME 4.0 (token partagé via token_store)."""
+        self.access_token = token_store.get_token(self.client_id, self.scope, self._fetch_token)
+        if not self.access_token:
+            return False
+        entry = token_store.get_entry(self.client_id, self.scope)
+        if entry:
+            self.token_expiry = datetime.fromtimestamp(entry['expires_at'] - token_store.refresh_margin)
+        return True
+    
+    def _fetch_token(self) -> Optional[Dict]:
+        """Demande un nouveau token à l'API et retourne la réponse OAuth."""
         import base64
         
-        if self.is_token_valid():
-            return True
-        
         auth_string = f"{self.client_id}:{self.client_secret}"
         base64_auth = base64.b64encode(auth_string.encode('ascii')).decode('ascii')
         
@@ -62,15 +170,14 @@ class FranceTravailROME4API:
             'Accept': 'application/json'
         }
         
-        # Scopes pour ROME 4.0
         data = {
             'grant_type': 'client_credentials',
-            'scope': 'api_rome-metiersv1 api_rome-competencesv1 api_rome-contextesv1 api_rome-fichesv1',
+            'scope': self.scope,
             'realm': '/partenaire'
         }
         
         try:
-            response = requests.post(
+            response = get_session(self.auth_url).post(
                 f"{self.auth_url}?realm=%2Fpartenaire",
                 headers=headers,
                 data=data,
@@ -78,12 +185,8 @@ class FranceTravailROME4API:
             )
             
             if response.status_code == 200:
-                token_data = response.json()
-                self.access_token = token_data.get('access_token')
-                expires_in = token_data.get('expires_in', 3600)
-                self.token_expiry = datetime.now() + timedelta(seconds=expires_in - 60)
                 print("✅ Authentification ROME 4.0 réussie")
-                return True
+                return response.json()
             else:
                 print(f"❌ Erreur d'authentification: {response.status_code}")
                 print(f"Response: {response.text}")
@@ -91,22 +194,45 @@ class FranceTravailROME4API:
         except Exception as e:
             print(f"❌ Exception authentification: {e}")
         
-        return False
+        return None
     
+    def _get(self, endpoint: str, url: str, **kwargs):
+        """
+        GET protégé par le disjoncteur de l'endpoint ROME 4.0 : échoue immédiatement
+        (CircuitOpenError) tant que l'API est considérée en panne.
+        """
+        breaker = get_breaker('rome4', self.endpoints[endpoint])
+        try:
+            response = guarded_request(self.session, 'GET', url, breaker, timeout=15, **kwargs)
+        except CircuitOpenError:
+            self.degraded_reason = 'circuit_open'
+            raise
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            self.degraded_reason = 'upstream_unavailable'
+            raise
+        if response.status_code >= 500:
+            self.degraded_reason = 'upstream_unavailable'
+        return response
+
     def is_token_valid(self) -> bool:
         """Vérifie la validité du token."""
         if not self.access_token or not self.token_expiry:
             return False
         return datetime.now() < self.token_expiry
     
-    def get_competences_referentiel(self, limit: int = 100) -> List[Dict]:
+    def get_competences_referentiel(self, limit: int = 100, champs: str = None) -> List[Dict]:
         """
         Récupère la liste des compétences du référentiel ROME 4.0.
+
+        Args:
+            limit: Nombre maximal de compétences.
+            champs: Champs à retourner, séparés par des virgules (ex: "code,libelle").
+                    Par défaut, tous les champs sont retournés.
         """
         if not self.authenticate():
             return []
         
-        cache_key = f"competences_ref_{limit}"
+        cache_key = f"competences_ref_{limit}_{champs or ''}"
         if cache_key in self.cache['competences']:
             return self.cache['competences'][cache_key]
         
@@ -118,9 +244,11 @@ class FranceTravailROME4API:
         try:
             url = f"{self.base_url}{self.endpoints['competences']}"
             params = {'limit': limit} if limit else {}
+            if champs:
+                params['champs'] = champs
             
             print(f"🔍 Récupération du référentiel compétences (limit: {limit})")
-            response = requests.get(url, headers=headers, params=params, timeout=15)
+            response = self._get('competences', url, headers=headers, params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -156,7 +284,7 @@ class FranceTravailROME4API:
             url = f"{self.base_url}{self.endpoints['metiers']}/{rome_code.upper()}"
             
             print(f"🔍 Récupération détails métier {rome_code}")
-            response = requests.get(url, headers=headers, timeout=15)
+            response = self._get('metiers', url, headers=headers)
             
             if response.status_code == 200:
                 metier_data = response.json()
@@ -192,7 +320,7 @@ class FranceTravailROME4API:
             url = f"{self.base_url}{self.endpoints['fiches']}/{rome_code.upper()}"
             
             print(f"🔍 Récupération fiche métier {rome_code}")
-            response = requests.get(url, headers=headers, timeout=15)
+            response = self._get('fiches', url, headers=headers)
             
             if response.status_code == 200:
                 fiche_data = response.json()
@@ -229,7 +357,7 @@ class FranceTravailROME4API:
             params = {'codeRome': rome_code.upper()}
             
             print(f"🔍 Récupération contextes travail {rome_code}")
-            response = requests.get(url, headers=headers, params=params, timeout=15)
+            response = self._get('contextes', url, headers=headers, params=params)
             
             if response.status_code == 200:
                 contextes_data = response.json()
@@ -321,6 +449,7 @@ class FranceTravailROME4API:
         Matching avancé utilisant les données structurées ROME 4.0.
         """
         print(f"🎯 Matching ROME 4.0 pour {rome_code}")
+        self.degraded_reason = None
         
         # 1. Récupération des compétences du métier
         metier_competences = self.extract_competences_from_metier(rome_code)
@@ -350,22 +479,15 @@ class FranceTravailROME4API:
         total_weighted_score = 0
         total_weight = 0
         
+        index = self._competence_index(rome_code, metier_competences)
         for category, rome_competences in metier_competences.items():
             if not rome_competences:
                 continue
                 
-            rome_competences_lower = [comp.lower().strip() for comp in rome_competences]
-            category_matches = []
-            
-            for user_skill in user_skills_lower:
-                for rome_comp in rome_competences_lower:
-                    # Matching exact et partiel
-                    if (user_skill == rome_comp or 
-                        user_skill in rome_comp or 
-                        rome_comp in user_skill or
-                        self._similarity_score(user_skill, rome_comp) > 0.7):
-                        category_matches.append(user_skill)
-                        break
+            category_matches = [
+                user_skill for user_skill in user_skills_lower
+                if index.matches(category, user_skill, self._similarity_score)
+            ]
             
             matches_by_category[category] = list(set(category_matches))
             
@@ -383,11 +505,12 @@ class FranceTravailROME4API:
         for matches in matches_by_category.values():
             all_matches.update(matches)
         
+        found = _SubstringIndex(all_matches)
         missing_skills = []
         for category, rome_competences in metier_competences.items():
             for rome_comp in rome_competences[:3]:  # Top 3 par catégorie
-                if not any(match in rome_comp.lower() or rome_comp.lower() in match 
-                          for match in all_matches):
+                rome_comp_lower = rome_comp.lower()
+                if not (found.any_contained_in(rome_comp_lower) or found.any_containing(rome_comp_lower)):
                     missing_skills.append(f"{rome_comp} ({category})")
         
         # 6. Contextes de travail
@@ -411,6 +534,14 @@ class FranceTravailROME4API:
         
         return result
     
+    def _competence_index(self, rome_code: str, metier_competences: Dict[str, List[str]]) -> CompetenceIndex:
+        """Index des compétences du métier, reconstruit si elles ont changé."""
+        key = rome_code.upper()
+        index = self.competence_indexes.get(key)
+        if index is None or index.metier_competences != metier_competences:
+            index = self.competence_indexes[key] = CompetenceIndex(metier_competences)
+        return index
+    
     def _similarity_score(self, str1: str, str2: str) -> float:
         """Calcul de similarité simple entre deux chaînes."""
         if not str1 or not str2:
@@ -462,7 +593,7 @@ class FranceTravailROME4API:
         
         score = len(matches) / len(skills) if skills else 0
         
-        return {
+        result = {
             'match_score': round(score, 2),
             'matching_skills': matches,
             'expected_competences': expected,
@@ -470,3 +601,6 @@ class FranceTravailROME4API:
             'source': 'simulation_rome4',
             'api_version': '4.0_fallback'
         }
+        if self.degraded_reason:
+            result['degraded_reason'] = self.degraded_reason
+        return result
@@ -0,0 +1,120 @@
+"""
+Matrice des compétences (soft skills) des offres de l'entrepôt local.
+
+Les scores de compétences de chaque offre (CVMatchingService.extract_soft_skills
+sur l'intitulé et la description) sont calculés une seule fois, à l'arrivée
+de l'offre dans l'entrepôt, puis rangés dans une matrice offres × compétences.
+Classer un CV contre toute la base revient alors à une opération vectorisée
+(CVMatchingService.batch_matching_rates) et à la relecture des k meilleures
+offres.
+"""
+
+import os
+import threading
+
+from .api.config import ClientConfig
+from .offer_store import get_offer_store
+
+
+def offer_text(offer):
+    return f"{offer.get('intitule', '')} {offer.get('description', '')}"
+
+
+class OfferSkillMatrix:
+    """
+    Vecteurs de compétences des offres, pour un CVMatchingService donné.
+
+    Args:
+        service: CVMatchingService (base de compétences et extraction).
+        store: Entrepôt d'où relire les offres classées (optionnel).
+    """
+
+    def __init__(self, service, store=None):
+        self.service = service
+        self.store = store
+        self._vectors = {}
+        self._matrix = None
+        self._ids = None
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._vectors)
+
+    def add(self, offer):
+        if not offer.get('id'):
+            return
+        vector = self.service.skill_vector(self.service.extract_soft_skills(offer_text(offer)))
+        with self._lock:
+            self._vectors[offer['id']] = vector
+            self._matrix = None
+
+    def remove(self, offer_id):
+        with self._lock:
+            if self._vectors.pop(offer_id, None) is not None:
+                self._matrix = None
+
+    def update(self, changed, deleted):
+        """Écouteur d'OfferStore : applique les offres modifiées et supprimées."""
+        for offer in changed:
+            self.add(offer)
+        for offer_id in deleted:
+            self.remove(offer_id)
+
+    def matrix(self):
+        """(identifiants, matrice offres × compétences), reconstruite après modification."""
+        with self._lock:
+            if self._matrix is None:
+                from .cv_matching import _numpy
+                np = _numpy()
+                self._ids = list(self._vectors)
+                rows = list(self._vectors.values())
+                self._matrix = np.asarray(rows, dtype=float).reshape(-1, len(self.service.soft_skills_db)) \
+                    if np is not None else rows
+            return self._ids, self._matrix
+
+    def rank(self, cv_skills, k=10):
+        """Couples (id de l'offre, taux de matching) des k meilleures offres."""
+        ids, matrix = self.matrix()
+        if not ids:
+            return []
+        return [(ids[i], rate) for i, rate in self.service.rank_jobs(cv_skills, matrix, k)]
+
+    def rank_offers(self, cv_skills, k=10):
+        """Les k meilleures offres de l'entrepôt, avec leur 'matching_rate'."""
+        offers = []
+        for offer_id, rate in self.rank(cv_skills, k):
+            offer = self.store.get(offer_id) if self.store else None
+            if offer is not None:
+                offers.append(dict(offer, matching_rate=round(rate, 1)))
+        return offers
+
+
+def build_offer_skill_matrix(service, store, follow=True):
+    """Matrice des offres actives ; `follow` la tient à jour des modifications de l'entrepôt."""
+    matrix = OfferSkillMatrix(service, store)
+    if follow:
+        store.subscribe(matrix.update)
+    for offer in store.iter_offers():
+        matrix.add(offer)
+    return matrix
+
+
+# Une matrice par base de compétences (les services par défaut partagent la même)
+_matrices = {}
+_matrices_lock = threading.Lock()
+
+
+def get_offer_skill_matrix(service):
+    """
+    Matrice partagée de l'entrepôt local pour la base de compétences du
+    service, ou None. Tenue à jour des synchronisations d'un autre processus.
+    """
+    key = service.skills_fingerprint()
+    with _matrices_lock:
+        if key not in _matrices:
+            if not os.path.exists(ClientConfig.OFFER_STORE):
+                return None
+            _matrices[key] = build_offer_skill_matrix(service, get_offer_store())
+        matrix = _matrices[key]
+    get_offer_store().refresh()
+    return matrix
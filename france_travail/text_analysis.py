@@ -0,0 +1,129 @@
+"""
+Analyse de texte française pour l'indexation des offres.
+
+Normalisation (minuscules, accents supprimés), découpage en mots, mots vides
+et racinisation légère : « développeur », « développeuse », « développement »
+et « développer » donnent tous la racine « developp ».
+
+KeywordMatcher compte un ensemble de mots-clés en une seule passe sur le texte.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+
+STOP_WORDS = frozenset("""
+a afin ai au aux avec avez avoir c ca ce ces cet cette chez d dans de des du
+elle en est et etc etre eu f h il ils je l la le les leur leurs lui m ma mais
+me meme mes moi mon n ne nos notre nous on ou par pas peu plus pour qu que qui
+s sa sans se ses si son sont sur ta te tes toi ton tous tout toute toutes tu
+un une vos votre vous y
+""".split())
+
+# Suffixes supprimés après le pluriel (le plus long d'abord), sans accents
+SUFFIXES = (
+    'issement', 'atrice', 'ateur', 'ation', 'ement', 'euse', 'ique', 'iste',
+    'isme', 'able', 'ance', 'ence', 'ment', 'eur', 'ite', 'ive', 'eux', 'ee',
+    'er', 'ez', 'if', 'e', 'x',
+)
+MIN_STEM_LENGTH = 3
+
+
+def normalize(text):
+    """Minuscules sans accents ni ligatures."""
+    text = unicodedata.normalize('NFKD', text.lower().replace('œ', 'oe').replace('æ', 'ae'))
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+
+@lru_cache(maxsize=50000)
+def stem(word):
+    """Racinise un mot normalisé : pluriel, puis premier suffixe applicable."""
+    if word.endswith('aux') and len(word) > MIN_STEM_LENGTH + 2:
+        word = word[:-3] + 'al'
+    elif word.endswith('s') and not word.endswith('ss') and len(word) > MIN_STEM_LENGTH + 1:
+        word = word[:-1]
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text):
+    """Découpe un texte en racines, mots vides exclus."""
+    if not text:
+        return []
+    return [stem(word) for word in WORD_RE.findall(normalize(text)) if word not in STOP_WORDS]
+
+
+def _whole_word(keyword):
+    return re.compile(r'\b' + re.escape(keyword) + r'\b')
+
+
+def _can_overlap(a, b):
+    """
+    Vrai si une occurrence de `b` (mot entier) peut être incluse dans une
+    occurrence de `a`, ou commencer avant sa fin (suffixe de `a` = préfixe de `b`).
+    """
+    pattern_a, pattern_b = _whole_word(a), _whole_word(b)
+    if pattern_b.search(a):
+        return True
+    for i in range(1, len(a)):
+        suffix = a[i:]
+        if len(suffix) < len(b) and b.startswith(suffix):
+            joined = a + b[len(suffix):]
+            if pattern_a.match(joined) and pattern_b.match(joined, i):
+                return True
+    return False
+
+
+class KeywordMatcher:
+    """
+    Compte en une seule passe les occurrences de plusieurs mots-clés (mots
+    entiers, comme `\\b<mot-clé>\\b`) et les agrège par groupe.
+
+    Une alternance ne retient qu'un mot-clé par position : les mots-clés dont
+    les occurrences peuvent se chevaucher (« chef » et « chef de projet »)
+    sont donc comptés chacun par leur propre expression, pour obtenir les
+    mêmes comptes qu'une expression par mot-clé.
+
+    Args:
+        groups: {groupe: [mots-clés en minuscules]} ; un mot-clé peut appartenir à plusieurs groupes.
+    """
+
+    def __init__(self, groups):
+        self._groups = {}
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                self._groups.setdefault(keyword, []).append(group)
+        keywords = list(self._groups)
+        overlapping = {a for a in keywords for b in keywords
+                       if a != b and (_can_overlap(a, b) or _can_overlap(b, a))}
+        # Les plus longs d'abord : à position égale, l'alternance retient le mot entier
+        alternatives = sorted((k for k in keywords if k not in overlapping), key=len, reverse=True)
+        self._pattern = re.compile(r'\b(?:' + '|'.join(map(re.escape, alternatives)) + r')\b') if alternatives else None
+        self._separate = {keyword: _whole_word(keyword) for keyword in overlapping}
+
+    def count(self, text):
+        """Occurrences de chaque mot-clé présent dans le texte (en minuscules)."""
+        counts = {}
+        if not text:
+            return counts
+        text = text.lower()
+        if self._pattern is not None:
+            for keyword in self._pattern.findall(text):
+                counts[keyword] = counts.get(keyword, 0) + 1
+        for keyword, pattern in self._separate.items():
+            occurrences = len(pattern.findall(text))
+            if occurrences:
+                counts[keyword] = occurrences
+        return counts
+
+    def count_groups(self, text):
+        """Occurrences cumulées des mots-clés de chaque groupe."""
+        totals = {}
+        for keyword, occurrences in self.count(text).items():
+            for group in self._groups[keyword]:
+                totals[group] = totals.get(group, 0) + occurrences
+        return totals
@@ -124,3 +124,17 @@ def afficher_offres(offres: List[Dict], limit: int = 5, show_details: bool = Fal
     
     if len(offres) > limit:
         print(f"\n... et {len(offres) - limit} offres supplémentaires (limité à {limit} affichages).")
+
+def afficher_facettes(facettes: Dict[str, Any], limit: int = 5) -> None:
+    """
+    Affiche les comptages par facette (voir offer_facets.OfferFacets.counts).
+    
+    Args:
+        facettes: Résultat de OfferFacets.counts
+        limit: Nombre maximum de valeurs affichées par facette
+    """
+    print(f"\n{'='*30} {facettes.get('total', 0)} OFFRES {'='*30}")
+    for facette, valeurs in facettes.get('facets', {}).items():
+        print(f"\n{facette}:")
+        for valeur, nombre in list(valeurs.items())[:limit]:
+            print(f"  - {valeur}: {nombre}")
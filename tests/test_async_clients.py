@@ -0,0 +1,103 @@
+"""
+Tests pour les clients asynchrones France Travail (httpx).
+"""
+import asyncio
+import unittest
+from unittest.mock import patch
+import os
+import sys
+
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.api import AsyncOffresClient, AsyncSoftSkillsClient, AsyncRomeoClient
+from france_travail.api.token_cache import TokenStore
+from france_travail.api.exceptions import UpstreamUnavailableError
+from france_travail.api.retry import RetryPolicy
+from france_travail.api.response_cache import ResponseCache
+
+
+def make_transport(calls):
+    """Transport httpx simulant l'authentification, les offres et les soft skills."""
+    def handler(request):
+        calls.append((request.method, request.url.path))
+        if request.url.path.endswith('/access_token'):
+            return httpx.Response(200, json={'access_token': 'tok', 'expires_in': 1499})
+        assert request.headers['Authorization'] == 'Bearer tok'
+        if request.url.path.endswith('/offres/123'):
+            return httpx.Response(200, json={'id': '123', 'intitule': 'Boulanger', 'romeCode': 'D1102'})
+        if request.url.path.endswith('/professions/job_skills'):
+            return httpx.Response(200, json={'skills': {
+                's1': {'summary': 'Rigueur', 'score': 3},
+                's2': {'summary': 'Autonomie', 'score': 1},
+            }})
+        if request.url.path.endswith('/predictionMetiers'):
+            return httpx.Response(400, text='boom')
+        if request.url.path.endswith('/offres/indispo'):
+            return httpx.Response(503, text='maintenance')
+        return httpx.Response(404)
+    return httpx.MockTransport(handler)
+
+
+class TestAsyncClients(unittest.TestCase):
+    """Vérifie que les clients asynchrones reproduisent la sémantique synchrone."""
+
+    def setUp(self):
+        self.calls = []
+        self.session = httpx.AsyncClient(transport=make_transport(self.calls))
+        cache = ResponseCache()
+        for patcher in (
+            patch('france_travail.api.base_client.response_cache', cache),
+            patch('france_travail.api.async_base_client.response_cache', cache),
+            patch('france_travail.api.async_base_client.get_async_session', return_value=self.session),
+            patch('france_travail.api.async_base_client.token_store', TokenStore()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_analyze_cv_match(self):
+        """Le matching asynchrone donne le même résultat que la version synchrone."""
+        async def run():
+            skills = AsyncSoftSkillsClient(client_id='id', client_secret='secret')
+            offres = AsyncOffresClient(skills, client_id='id', client_secret='secret')
+            return await offres.analyze_cv_match("Rigueur et ponctualité", "123")
+
+        result = asyncio.run(run())
+        self.assertEqual(result['rome_code'], 'D1102')
+        self.assertEqual(result['matching_rate'], 75.0)
+        self.assertEqual(result['cv_skills'], {'Rigueur': 3})
+
+    def test_http_error_returns_none(self):
+        """Une erreur HTTP retourne None, comme BaseClient."""
+        async def run():
+            romeo = AsyncRomeoClient(client_id='id', client_secret='secret')
+            return await romeo.predict_metiers("boulanger")
+
+        self.assertIsNone(asyncio.run(run()))
+
+    def test_persistent_5xx_raises(self):
+        """Un 5xx persistant lève UpstreamUnavailableError après les nouvelles tentatives."""
+        async def run():
+            skills = AsyncSoftSkillsClient(client_id='id', client_secret='secret')
+            offres = AsyncOffresClient(skills, client_id='id', client_secret='secret')
+            offres.retry_policy = RetryPolicy(max_attempts=2, base_delay=0, jitter=False)
+            return await offres.get_job_details('indispo')
+
+        with self.assertRaises(UpstreamUnavailableError):
+            asyncio.run(run())
+        self.assertEqual([path for _, path in self.calls].count('/partenaire/offresdemploi/v2/offres/indispo'), 2)
+
+    def test_simulation_does_not_call_api(self):
+        """Le mode simulation ne fait aucun appel réseau."""
+        async def run():
+            skills = AsyncSoftSkillsClient(client_id='id', client_secret='secret', simulation=True)
+            offres = AsyncOffresClient(skills, client_id='id', client_secret='secret', simulation=True)
+            return await offres.search_jobs({'motsCles': 'python'})
+
+        self.assertEqual(asyncio.run(run())['resultats'][0]['id'], 'sim-123')
+        self.assertEqual(self.calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Tests pour le calcul vectorisé des taux de matching d'un CV contre N offres.
+"""
+import os
+import random
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.cv_matching import CVMatchingService, _numpy
+from france_travail.mock_server import generate_offers
+from france_travail.offer_store import OfferStore
+from france_travail.skill_matrix import build_offer_skill_matrix
+
+CV_TEXT = "Manager d'équipe, communication et organisation, résolution de problèmes."
+
+
+def random_skills(service, rng):
+    return {skill_id: rng.choice([0, 0, 15, 30, 45, 100]) for skill_id in service.soft_skills_db}
+
+
+class TestBatchMatchingRates(unittest.TestCase):
+    """Vérifie l'équivalence avec calculate_matching_rate et le classement."""
+
+    def setUp(self):
+        self.service = CVMatchingService('id', 'secret')
+        rng = random.Random(0)
+        self.cv_skills = random_skills(self.service, rng)
+        self.jobs = [random_skills(self.service, rng) for _ in range(200)] + [{}]
+
+    def test_same_rates_as_pairwise(self):
+        expected = [self.service.calculate_matching_rate(self.cv_skills, job) for job in self.jobs]
+        for rates in (self.service.batch_matching_rates(self.cv_skills, self.jobs),
+                      self._without_numpy(self.service.batch_matching_rates, self.cv_skills, self.jobs)):
+            self.assertEqual(len(rates), len(expected))
+            for rate, reference in zip(rates, expected):
+                self.assertAlmostEqual(rate, reference, places=9)
+
+    def test_top_k(self):
+        expected = sorted(range(len(self.jobs)),
+                          key=lambda i: -self.service.calculate_matching_rate(self.cv_skills, self.jobs[i]))[:5]
+        ranked = self.service.rank_jobs(self.cv_skills, self.jobs, k=5)
+        self.assertEqual([i for i, _ in ranked], expected)
+        fallback = self._without_numpy(self.service.rank_jobs, self.cv_skills, self.jobs, k=5)
+        self.assertEqual([i for i, _ in fallback], expected)
+
+    def test_rank_offers(self):
+        offers = [{'id': '1', 'intitule': 'Cuisinier', 'description': 'Rigueur.'},
+                  {'id': '2', 'intitule': 'Chef d\'équipe', 'description': 'Management et communication.'}]
+        ranked = self.service.rank_offers(CV_TEXT, offers, k=1)
+        self.assertEqual(ranked[0]['id'], '2')
+        self.assertIn('matching_rate', ranked[0])
+
+    def test_missing_numpy_logged_once(self):
+        _numpy.cache_clear()
+        self.addCleanup(_numpy.cache_clear)
+        with patch.dict(sys.modules, {'numpy': None}), self.assertLogs(level='WARNING') as logs:
+            self.service.batch_matching_rates(self.cv_skills, self.jobs)
+            self.service.rank_jobs(self.cv_skills, self.jobs)
+        self.assertEqual(len(logs.records), 1)
+
+    def _without_numpy(self, method, *args, **kwargs):
+        with patch('france_travail.cv_matching._numpy', return_value=None):
+            return method(*args, **kwargs)
+
+
+class TestOfferSkillMatrix(unittest.TestCase):
+    """Vérifie le classement contre l'entrepôt local."""
+
+    def test_rank_store_and_follow_updates(self):
+        service = CVMatchingService('id', 'secret')
+        store = OfferStore()
+        store.upsert(generate_offers(5000), scope='s', seen_at=1)
+        matrix = build_offer_skill_matrix(service, store)
+        cv_skills = service.extract_soft_skills(CV_TEXT)
+
+        matrix.rank(cv_skills)
+        start = time.perf_counter()
+        top = matrix.rank_offers(cv_skills, k=10)
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertEqual(len(top), 10)
+        self.assertEqual([o['matching_rate'] for o in top], sorted((o['matching_rate'] for o in top), reverse=True))
+
+        best = {'id': 'best', 'intitule': 'Manager', 'description': 'communication organisation résolution équipe'}
+        store.upsert([best], scope='s', seen_at=2)
+        rates = dict(matrix.rank(cv_skills, k=len(matrix)))
+        self.assertEqual(len(rates), 5001)
+        self.assertAlmostEqual(rates['best'], service.calculate_matching_rate(cv_skills, service.extract_soft_skills(
+            f"{best['intitule']} {best['description']}")))
+        store.mark_deleted('s', 2)
+        self.assertEqual(len(matrix), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
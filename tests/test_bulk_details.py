@@ -0,0 +1,130 @@
+"""
+Tests pour la récupération groupée des détails d'offres.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import httpx
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.api import OffresClient, AsyncOffresClient
+from france_travail.api.exceptions import RateLimitedError
+from france_travail.api.response_cache import ResponseCache
+from france_travail.api.rate_limiter import TokenBucket
+from france_travail.api.token_cache import TokenStore
+
+
+class SlowSession:
+    """Session requests simulant /offres/{id} avec une latence fixe."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.paths = []
+        self.lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        with self.lock:
+            self.paths.append(url.rsplit('/', 1)[-1])
+        time.sleep(self.delay)
+        response = requests.Response()
+        job_id = url.rsplit('/', 1)[-1]
+        response.status_code = 404 if job_id == 'inconnue' else 200
+        response._content = b'{"id": "%s"}' % job_id.encode()
+        return response
+
+
+def make_client():
+    client = OffresClient(soft_skills_client=None, client_id='id', client_secret='secret')
+    client.session = SlowSession()
+    client.rate_limiter = TokenBucket('test_bulk', rate=1000, capacity=100)
+    client._authenticate = lambda force=False: True
+    return client
+
+
+class TestJobDetailsMany(unittest.TestCase):
+    """Vérifie le dédoublonnage, le cache et la parallélisation."""
+
+    def setUp(self):
+        cache = ResponseCache()
+        for target in ('base_client', 'async_base_client'):
+            patcher = patch(f'france_travail.api.{target}.response_cache', cache)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_dedup_and_parallel(self):
+        client = make_client()
+        ids = [str(i) for i in range(8)] * 2
+        start = time.monotonic()
+        results = dict(client.get_job_details_many(ids, max_workers=8))
+        elapsed = time.monotonic() - start
+        self.assertEqual(results, {str(i): {'id': str(i)} for i in range(8)})
+        self.assertEqual(sorted(client.session.paths), sorted(str(i) for i in range(8)))
+        # 8 requêtes de 50 ms en parallèle : bien moins que 400 ms
+        self.assertLess(elapsed, 0.3)
+
+    def test_cache_served_first(self):
+        client = make_client()
+        client.get_job_details('1')
+        results = list(client.get_job_details_many(['2', '1']))
+        self.assertEqual(results[0], ('1', {'id': '1'}))
+        self.assertEqual(client.session.paths, ['1', '2'])
+
+    def test_missing_offer_is_none(self):
+        client = make_client()
+        self.assertEqual(dict(client.get_job_details_many(['inconnue'])), {'inconnue': None})
+
+    def test_error_for_one_offer_keeps_the_others(self):
+        client = make_client()
+        get_job_details = client.get_job_details
+
+        def flaky(job_id, fields=None):
+            if job_id == 'quota':
+                raise RateLimitedError("quota dépassé")
+            return get_job_details(job_id, fields)
+
+        client.get_job_details = flaky
+        with self.assertLogs(level='ERROR'):
+            results = dict(client.get_job_details_many(['1', 'quota', '2'], max_workers=1))
+        self.assertEqual(results, {'1': {'id': '1'}, 'quota': None, '2': {'id': '2'}})
+
+    def test_async_error_for_one_offer_keeps_the_others(self):
+        async def get_job_details(job_id, fields=None):
+            if job_id == 'quota':
+                raise RateLimitedError("quota dépassé")
+            return {'id': job_id}
+
+        async def run():
+            client = AsyncOffresClient(None, client_id='id', client_secret='secret')
+            client.get_job_details = get_job_details
+            return {job_id: details async for job_id, details in client.get_job_details_many(['a', 'quota', 'b'])}
+
+        with self.assertLogs(level='ERROR'):
+            results = asyncio.run(run())
+        self.assertEqual(results, {'a': {'id': 'a'}, 'quota': None, 'b': {'id': 'b'}})
+
+    def test_async(self):
+        def handler(request):
+            if request.url.path.endswith('/access_token'):
+                return httpx.Response(200, json={'access_token': 'tok', 'expires_in': 1499})
+            return httpx.Response(200, json={'id': request.url.path.rsplit('/', 1)[-1]})
+
+        async def run():
+            session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            with patch('france_travail.api.async_base_client.get_async_session', return_value=session), \
+                    patch('france_travail.api.async_base_client.token_store', TokenStore()):
+                client = AsyncOffresClient(None, client_id='id', client_secret='secret')
+                client.rate_limiter = TokenBucket('test_bulk', rate=1000, capacity=100)
+                return {job_id: details async for job_id, details in client.get_job_details_many(['a', 'b', 'a'])}
+
+        self.assertEqual(asyncio.run(run()), {'a': {'id': 'a'}, 'b': {'id': 'b'}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Tests pour l'enregistrement et le rejeu de cassettes HTTP.
+"""
+import asyncio
+import gzip
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.api import OffresClient, SoftSkillsClient, AsyncSoftSkillsClient
+from france_travail.api.cassette import (use_cassette, interaction_key, cassette_transport, Cassette,
+                                         CassetteMissError, REDACTED_TOKEN)
+from france_travail.api.config import ClientConfig
+from france_travail.api.rate_limiter import TokenBucket
+from france_travail.api.response_cache import ResponseCache
+from france_travail.api.session_pool import aclose_async_sessions
+from france_travail.api.token_cache import TokenStore
+from france_travail.cv_matching import CVMatchingService
+from france_travail.mock_server import MockFranceTravailServer
+
+CV = "Développeur rigoureux et autonome, à l'aise en équipe et en communication."
+
+
+class TestInteractionKey(unittest.TestCase):
+    """Vérifie la normalisation des requêtes."""
+
+    def test_query_order_and_token_body(self):
+        self.assertEqual(interaction_key('get', 'http://h/p?b=2&a=1'), interaction_key('GET', 'http://h/p?a=1&b=2'))
+        self.assertEqual(
+            interaction_key('POST', 'http://h/connexion/oauth2/access_token', b'client_secret=1'),
+            interaction_key('POST', 'http://h/connexion/oauth2/access_token', b'client_secret=2')
+        )
+        self.assertNotEqual(interaction_key('POST', 'http://h/p', b'{"a": 1}'), interaction_key('POST', 'http://h/p', b'{"a": 2}'))
+
+
+class TestRecordReplay(unittest.TestCase):
+    """Enregistre des échanges sur le serveur simulé puis les rejoue sans réseau."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'matching.json.gz')
+        self.server = MockFranceTravailServer(offers=50).start()
+        self.addCleanup(self.server.stop)
+        for patcher in (
+            patch.object(ClientConfig, 'API_URL', self.server.url),
+            patch.object(ClientConfig, 'AUTH_URL', None),
+            patch('france_travail.api.base_client.response_cache', ResponseCache(enabled=False)),
+            patch('france_travail.api.async_base_client.response_cache', ResponseCache(enabled=False)),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_scenario(self):
+        """Matching via les clients de l'API et via CVMatchingService, avec des tokens neufs."""
+        store = TokenStore()
+        with patch('france_travail.api.base_client.token_store', store), \
+                patch('france_travail.cv_matching.token_store', store):
+            skills = SoftSkillsClient(client_id='id', client_secret='secret')
+            offres = OffresClient(skills, client_id='id', client_secret='secret')
+            for client in (skills, offres):
+                client.rate_limiter = TokenBucket('test_cassette', rate=1000, capacity=100)
+            return (
+                offres.analyze_cv_match(CV, '100000M'),
+                CVMatchingService('id', 'secret').analyze_cv_job_match(CV, "Développeur Python autonome")
+            )
+
+    def test_record_then_replay(self):
+        with use_cassette(self.path, mode='record'):
+            recorded = self.run_scenario()
+        self.server.stop()
+
+        with use_cassette(self.path, mode='replay'):
+            replayed = self.run_scenario()
+        self.assertEqual(recorded[0], replayed[0])
+        self.assertEqual(recorded[1]['matching_rate'], replayed[1]['matching_rate'])
+        self.assertEqual(recorded[1]['market_insights'], replayed[1]['market_insights'])
+        self.assertGreater(replayed[1]['market_insights']['similar_jobs_found'], 0)
+
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            raw = f.read()
+        self.assertIn(REDACTED_TOKEN, raw)
+        self.assertNotIn('secret', raw)
+
+    def test_replay_miss(self):
+        with use_cassette(self.path, mode='record'):
+            pass
+        with use_cassette(self.path, mode='replay') as cassette:
+            with self.assertRaises(CassetteMissError):
+                cassette.play('GET', 'http://ailleurs/offres')
+
+    def test_async_record_then_replay(self):
+        async def scenario():
+            with patch('france_travail.api.async_base_client.token_store', TokenStore()):
+                client = AsyncSoftSkillsClient(client_id='id', client_secret='secret')
+                client.rate_limiter = TokenBucket('test_cassette', rate=1000, capacity=100)
+                result = await client.get_skills_for_job('D1102')
+            await aclose_async_sessions()
+            return result
+
+        with use_cassette(self.path, mode='record'):
+            recorded = asyncio.run(scenario())
+        with use_cassette(self.path, mode='replay', latency='original'):
+            replayed = asyncio.run(scenario())
+        self.assertEqual(recorded, replayed)
+        self.assertIn('skills', replayed)
+
+
+
+class TestAsyncRecordGzip(unittest.TestCase):
+    """Vérifie l'enregistrement d'une réponse compressée (cas par défaut avec httpx)."""
+
+    def test_gzip_response(self):
+        body = b'{"skills": {"1": {"summary": "Rigueur"}}}'
+
+        def upstream(request):
+            return httpx.Response(200, headers={'Content-Encoding': 'gzip', 'Content-Type': 'application/json'},
+                                  content=gzip.compress(body))
+
+        async def scenario(cassette):
+            transport = cassette_transport(cassette)
+            transport._inner = httpx.MockTransport(upstream)
+            async with httpx.AsyncClient(transport=transport) as client:
+                return (await client.get('http://h/skills')).json()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cassette = Cassette(os.path.join(tmp, 'gzip.json.gz'), mode='record')
+            self.assertEqual(asyncio.run(scenario(cassette)), json.loads(body))
+            self.assertEqual(Cassette.content_of(cassette.play('GET', 'http://h/skills')), body)
+
+
+if __name__ == '__main__':
+    unittest.main()
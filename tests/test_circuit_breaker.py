@@ -0,0 +1,143 @@
+"""
+Tests pour les disjoncteurs par endpoint et le repli en mode dégradé.
+"""
+import asyncio
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.api import SoftSkillsClient
+from france_travail.api.base_client import DEGRADED_KEY
+from france_travail.api.circuit_breaker import CircuitBreaker, endpoint_key, reset_breakers, OPEN, HALF_OPEN, CLOSED
+from france_travail.api.exceptions import CircuitOpenError
+from france_travail.api.rate_limiter import TokenBucket
+from france_travail.api.response_cache import ResponseCache
+from france_travail.api.retry import RetryPolicy
+
+
+class FlakySession:
+    """Session requests qui répond `status` (ou lève ConnectionError si None)."""
+
+    def __init__(self, status=503):
+        self.status = status
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        if self.status is None:
+            raise requests.exceptions.ConnectionError("injoignable")
+        response = requests.Response()
+        response.status_code = self.status
+        response._content = b'{"skills": {}}'
+        return response
+
+
+def prepare(client, session):
+    client.session = session
+    client.rate_limiter = TokenBucket('test_circuit', rate=1000, capacity=100)
+    client.retry_policy = RetryPolicy(max_attempts=1)
+    client._authenticate = lambda force=False: True
+    return client
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Vérifie les transitions fermé / ouvert / semi-ouvert."""
+
+    def test_opens_after_threshold_and_probes(self):
+        breaker = CircuitBreaker('test', failure_threshold=2, recovery_timeout=0.05)
+        breaker.record_failure()
+        breaker.allow()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.allow()
+
+        time.sleep(0.06)
+        breaker.allow()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.allow()
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker('test', failure_threshold=1, recovery_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        breaker.allow()
+        breaker.record_status(503)
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_interrupted_probe_is_released(self):
+        breaker = CircuitBreaker('test', failure_threshold=1, recovery_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        with self.assertRaises(asyncio.CancelledError):
+            with breaker.attempt():
+                raise asyncio.CancelledError()
+        self.assertEqual(breaker.state, OPEN)
+        time.sleep(0.02)
+        breaker.allow()
+        self.assertEqual(breaker.state, HALF_OPEN)
+
+    def test_stale_probe_expires(self):
+        breaker = CircuitBreaker('test', failure_threshold=1, recovery_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        breaker.allow()
+        with self.assertRaises(CircuitOpenError) as ctx:
+            breaker.allow()
+        self.assertGreater(ctx.exception.retry_after, 0)
+        time.sleep(0.06)
+        breaker.allow()
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_endpoint_key(self):
+        self.assertEqual(endpoint_key('/offres/194DZZT'), '/offres/{id}')
+        self.assertEqual(endpoint_key('/offres/search?motsCles=python'), '/offres/search')
+
+
+class TestClientDegradation(unittest.TestCase):
+    """Vérifie le fail-fast et le repli sur le cache dans BaseClient."""
+
+    def setUp(self):
+        reset_breakers()
+        self.addCleanup(reset_breakers)
+        self.cache = ResponseCache()
+        patcher = patch('france_travail.api.base_client.response_cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fails_fast_once_open(self):
+        session = FlakySession(status=None)
+        client = prepare(SoftSkillsClient('id', 'secret'), session)
+        client.cache_ttls = {}
+        with patch('france_travail.api.circuit_breaker.ClientConfig.CIRCUIT_FAILURE_THRESHOLD', 2):
+            for _ in range(2):
+                with self.assertRaises(Exception):
+                    client.get_skills_for_job('M1805')
+            with self.assertRaises(CircuitOpenError):
+                client.get_skills_for_job('D1102')
+        self.assertEqual(session.calls, 2)
+
+    def test_stale_response_flagged(self):
+        session = FlakySession(status=200)
+        client = prepare(SoftSkillsClient('id', 'secret'), session)
+        self.assertNotIn(DEGRADED_KEY, client.get_skills_for_job('M1805'))
+
+        session.status = 503
+        with patch('france_travail.api.response_cache.time.time', return_value=time.time() + 10 ** 6):
+            result = client.get_skills_for_job('M1805')
+        self.assertEqual(result[DEGRADED_KEY], 'upstream_unavailable')
+        self.assertEqual(self.cache.stats()['soft_skills']['stale'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
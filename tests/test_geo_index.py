@@ -0,0 +1,116 @@
+"""
+Tests pour l'index géographique des offres et des entreprises La Bonne Boite.
+"""
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.api import LBBClient
+from france_travail.geo_index import GeoIndex, CompanyLocator, build_offer_geo_index, haversine_km
+from france_travail.mock_server import generate_offers
+from france_travail.offer_store import OfferStore
+
+PARIS = (48.8566, 2.3522)
+VERSAILLES = (48.8049, 2.1204)
+LYON = (45.7640, 4.8357)
+
+
+class TestGeoIndex(unittest.TestCase):
+    """Vérifie les recherches par rayon et par rectangle."""
+
+    def setUp(self):
+        self.index = GeoIndex()
+        self.index.add('paris', *PARIS, rome_codes=['M1805'], item='paris')
+        self.index.add('versailles', *VERSAILLES, rome_codes=['D1102'], item='versailles')
+        self.index.add('lyon', *LYON, rome_codes=['M1805'], item='lyon')
+
+    def test_radius(self):
+        self.assertAlmostEqual(haversine_km(*PARIS, *LYON), 392, delta=3)
+        results = self.index.within_radius(*PARIS, 25)
+        self.assertEqual([item for item, _ in results], ['paris', 'versailles'])
+        self.assertEqual([item for item, _ in self.index.within_radius(*PARIS, 25, rome_codes='M1805')], ['paris'])
+        self.assertEqual(len(self.index.within_radius(*PARIS, 500)), 3)
+
+    def test_bbox_and_remove(self):
+        self.assertEqual(sorted(self.index.within_bbox(48, 2, 49.5, 3)), ['paris', 'versailles'])
+        self.index.remove('paris')
+        self.assertEqual(self.index.within_bbox(48, 2, 49.5, 3, rome_codes=['M1805']), [])
+
+    def test_offers_follow_store(self):
+        store = OfferStore()
+        store.upsert(generate_offers(2000), scope='s', seen_at=1)
+        index = build_offer_geo_index(store)
+        start = time.perf_counter()
+        nearby = index.nearby(*PARIS, 10, rome_codes='M1805', limit=20)
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertTrue(nearby)
+        self.assertTrue(all(o['romeCode'] == 'M1805' and o['distance'] <= 10 for o in nearby))
+
+        store.mark_deleted('s', 2)
+        self.assertEqual(index.nearby(*PARIS, 10), [])
+
+
+class TestCompanyLocator(unittest.TestCase):
+    """Vérifie que La Bonne Boite n'est interrogée qu'une fois par zone."""
+
+    COMPANIES = [
+        {'siret': '1', 'name': 'Boulangerie Paris', 'lat': PARIS[0], 'lon': PARIS[1], 'matched_rome_code': 'D1102'},
+        {'siret': '2', 'name': 'Boulangerie Versailles', 'lat': VERSAILLES[0], 'lon': VERSAILLES[1]},
+    ]
+
+    def test_covered_area_is_local(self):
+        store = OfferStore()
+        locator = CompanyLocator(store)
+        self.assertIsNone(locator.search('D1102', *PARIS, 10))
+
+        locator.record('D1102', *PARIS, 30, self.COMPANIES)
+        companies = locator.search('D1102', *PARIS, 10)
+        self.assertEqual([c['name'] for c in companies], ['Boulangerie Paris'])
+        self.assertIsNone(locator.search('D1102', *PARIS, 50))
+        self.assertIsNone(locator.search('D1102,G1602', *PARIS, 10))
+
+        reloaded = CompanyLocator(store)
+        self.assertEqual(len(reloaded.search('D1102', *PARIS, 25)), 2)
+        self.assertIsNone(CompanyLocator(store, ttl=0).search('D1102', *PARIS, 10))
+
+    def test_expired_areas_are_pruned(self):
+        store = OfferStore()
+        store.add_company_area('D1102', *LYON, 10, fetched_at=time.time() - 7200)
+        locator = CompanyLocator(store, ttl=3600)
+        self.assertEqual(store.company_areas(), [])
+
+        locator.record('D1102', *PARIS, 30, self.COMPANIES)
+        locator._areas['D1102'][0] = locator._areas['D1102'][0][:3] + (time.time() - 7200,)
+        locator.record('D1102', *LYON, 10, [])
+        self.assertEqual([area[:3] for area in locator._areas['D1102']], [(*LYON, 10)])
+
+    def test_requeried_area_drops_missing_companies(self):
+        store = OfferStore()
+        locator = CompanyLocator(store)
+        locator.record('G1602', *PARIS, 30, self.COMPANIES[1:])
+        locator.record('D1102', *PARIS, 30, self.COMPANIES)
+        locator.record('D1102', *PARIS, 30, self.COMPANIES[:1])
+        for current in (locator, CompanyLocator(store)):
+            self.assertEqual([c['siret'] for c in current.search('D1102', *PARIS, 30)], ['1'])
+            self.assertEqual([c['siret'] for c in current.search('G1602', *PARIS, 30)], ['2'])
+
+        locator.record('G1602', *PARIS, 30, [])
+        self.assertEqual([company['siret'] for company, *_ in store.iter_companies()], ['1'])
+
+    def test_client_answers_locally(self):
+        locator = CompanyLocator(OfferStore())
+        client = LBBClient(client_id='id', client_secret='secret')
+        with patch('france_travail.geo_index.get_company_locator', return_value=locator), \
+                patch.object(client, '_make_request', return_value={'companies': self.COMPANIES}) as request:
+            client.search_la_bonne_boite('D1102', *PARIS, 30)
+            result = client.search_la_bonne_boite('D1102', *PARIS, 5)
+        self.assertEqual(request.call_count, 1)
+        self.assertEqual(result['companies_count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Tests du budget d'import du CLI et des clients France Travail.
+
+`cli.py` est appelé en boucle par des scripts shell : son import ne doit
+charger ni les clients, ni la base de données, ni les dépendances lourdes.
+
+Une commande réelle (`cli.py romeo boulanger`) charge en plus requests et la
+pile des clients avant son premier appel HTTP. requests coûte à lui seul
+75 à 120 ms selon la machine ; la commande est donc mesurée par rapport à
+l'import de requests, mesuré dans le même processus (environ 110 ms au
+total, dont 35 ms au-delà de requests, sur un poste de développement).
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Budget (millisecondes) de l'import de cli.py, meilleur de plusieurs mesures
+IMPORT_BUDGET_MS = 100
+# Budget (millisecondes) d'une commande jusqu'à son premier appel réseau, au-delà de l'import de requests
+COMMAND_OVERHEAD_BUDGET_MS = 50
+# Modules qu'aucune commande ROMEO / recherche n'a besoin de charger
+HEAVY_MODULES = {'httpx', 'asyncio', 'numpy', 'pg8000', 'psycopg2', 'PyPDF2', 'docx', 'selenium', 'passlib', 'jose'}
+
+
+def import_times(statement):
+    """Exécute `statement` avec -X importtime et retourne {module: temps cumulé en µs}."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+# Lance `cli.py romeo boulanger` et affiche le temps écoulé, au-delà de l'import de
+# requests (mesuré dans le même processus), jusqu'au premier appel réseau (résolution DNS)
+COMMAND_UNTIL_FIRST_REQUEST = """
+import time
+start = time.perf_counter()
+import requests
+requests_import = time.perf_counter() - start
+import os, runpy, socket, sys
+
+def first_request(*args, **kwargs):
+    print((time.perf_counter() - start - requests_import) * 1000, flush=True)
+    os._exit(0)
+
+socket.getaddrinfo = first_request
+sys.argv = ['cli.py', 'romeo', 'boulanger']
+runpy.run_path('cli.py', run_name='__main__')
+"""
+
+
+def elapsed_ms(code, env=None):
+    """Exécute `code` et retourne le temps (ms) qu'il affiche en dernier."""
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return float(result.stdout.split()[-1])
+
+
+class TestImportBudget(unittest.TestCase):
+    """Vérifie que les imports coûteux restent différés."""
+
+    def test_cli_import_budget(self):
+        times = import_times('import cli')
+        self.assertFalse(HEAVY_MODULES & set(times))
+        self.assertNotIn('requests', times)
+        best = min(import_times('import cli')['cli'] for _ in range(3))
+        self.assertLess(best / 1000, IMPORT_BUDGET_MS)
+
+    def test_command_budget(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            env = dict(os.environ, FRANCE_TRAVAIL_CLIENT_ID='id', FRANCE_TRAVAIL_CLIENT_SECRET='secret',
+                       FRANCE_TRAVAIL_CACHE_DIR=cache_dir, FRANCE_TRAVAIL_TOKEN_CACHE='0',
+                       FRANCE_TRAVAIL_API_URL='', FRANCE_TRAVAIL_AUTH_URL='', FRANCE_TRAVAIL_CASSETTE='')
+            overhead = min(elapsed_ms(COMMAND_UNTIL_FIRST_REQUEST, env) for _ in range(5))
+        self.assertLess(overhead, COMMAND_OVERHEAD_BUDGET_MS)
+
+    def test_sync_client_does_not_load_async_stack(self):
+        times = import_times('from france_travail.api import RomeoClient')
+        self.assertIn('requests', times)
+        self.assertFalse(HEAVY_MODULES & set(times))
+
+    def test_package_exports_still_available(self):
+        times = import_times('import france_travail.api as api; api.AsyncOffresClient; api.OffresClient')
+        self.assertIn('httpx', times)
+
+
+if __name__ == '__main__':
+    unittest.main()
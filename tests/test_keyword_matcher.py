@@ -0,0 +1,81 @@
+"""
+Tests pour le comptage des mots-clés de soft skills en une seule passe.
+"""
+import os
+import random
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.cv_matching import CVMatchingService
+from france_travail.text_analysis import KeywordMatcher
+
+
+def reference_scores(soft_skills_db, text):
+    """Implémentation d'origine : une expression régulière par mot-clé."""
+    scores = {}
+    text_lower = text.lower()
+    for skill_id, skill_data in soft_skills_db.items():
+        score = 0
+        for keyword in skill_data['keywords']:
+            score += len(re.findall(r'\b' + re.escape(keyword) + r'\b', text_lower)) * 15
+        scores[skill_id] = min(score, 100)
+    return scores
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    """Vérifie le matcher et l'équivalence avec l'extraction d'origine."""
+
+    def test_whole_words_and_shared_keywords(self):
+        matcher = KeywordMatcher({'a': ['gestion', 'gestionnaire'], 'b': ['gestion']})
+        self.assertEqual(matcher.count('Gestion, gestionnaires, GESTIONNAIRE.'), {'gestion': 1, 'gestionnaire': 1})
+        self.assertEqual(matcher.count_groups('gestion gestion gestionnaire'), {'a': 3, 'b': 2})
+        self.assertEqual(KeywordMatcher({}).count('gestion'), {})
+
+    def test_overlapping_keywords(self):
+        groups = {'a': ['chef', 'chef de projet', 'projet'], 'b': ['de projet manager', 'manager'], 'c': ['co-chef']}
+        matcher = KeywordMatcher(groups)
+        rng = random.Random(0)
+        words = ['chef', 'de', 'projet', 'manager', 'co-chef', 'sous-chef', 'chefs', ',']
+        for _ in range(300):
+            text = ' '.join(rng.choice(words) for _ in range(rng.randrange(0, 20)))
+            expected = {k: len(re.findall(r'\b' + re.escape(k) + r'\b', text))
+                        for keywords in groups.values() for k in keywords}
+            self.assertEqual(matcher.count(text), {k: n for k, n in expected.items() if n}, text)
+        self.assertEqual(matcher.count('chef de projet'), {'chef': 1, 'chef de projet': 1, 'projet': 1})
+
+    def test_identical_to_regex_per_keyword(self):
+        service = CVMatchingService('id', 'secret')
+        vocabulary = [k for skill in service.soft_skills_db.values() for k in skill['keywords']]
+        vocabulary += ['Équipe', "l'équipe", 'équipes', 'co-équipe', 'analyse-', 'problèmes', 'chef.', 'xx']
+        rng = random.Random(0)
+        for _ in range(300):
+            text = ' '.join(rng.choice(vocabulary) for _ in range(rng.randrange(0, 40)))
+            self.assertEqual(service.extract_soft_skills(text), reference_scores(service.soft_skills_db, text), text)
+
+    def test_matcher_reused_between_calls(self):
+        service = CVMatchingService('id', 'secret')
+        service.extract_soft_skills('communication')
+        matcher, fingerprint = service._matcher, service.skills_fingerprint()
+        service.extract_soft_skills('rigueur')
+        self.assertIs(service._matcher, matcher)
+        self.assertIs(service.skills_fingerprint(), fingerprint)
+
+    def test_rebuilt_when_database_replaced(self):
+        service = CVMatchingService('id', 'secret')
+        service.extract_soft_skills('communication')
+        service.soft_skills_db = {'rigueur': {'weight': 1, 'keywords': ['rigueur']}}
+        self.assertEqual(service.extract_soft_skills('rigueur et communication'), {'rigueur': 15})
+
+    def test_rebuilt_when_database_edited_in_place(self):
+        service = CVMatchingService('id', 'secret')
+        self.assertEqual(service.extract_soft_skills('pédagogie')['communication'], 0)
+        service.soft_skills_db['communication']['keywords'].append('pédagogie')
+        service.invalidate_soft_skills()
+        self.assertEqual(service.extract_soft_skills('pédagogie')['communication'], 15)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Tests pour le cache des profils de demande du marché de CVMatchingService.
+"""
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail import cv_matching
+from france_travail.cv_matching import CVMatchingService, MarketProfileCache
+from france_travail.offer_index import build_offer_index
+from france_travail.offer_store import OfferStore
+
+SIMILAR_JOBS = [
+    {'intitule': 'Développeur Python', 'description': 'Communication, dialogue et écoute. Organisation, méthode.'},
+    {'intitule': 'Développeur Java', 'description': 'Communication, relationnel, présentation en équipe.'},
+    {'intitule': 'Développeur React', 'description': 'Travail en équipe, collaboration.'},
+]
+CV_TEXT = "Développeur Python, goût de la communication et de l'organisation."
+
+
+class TestMarketProfileCache(unittest.TestCase):
+    """Vérifie l'éviction LRU et l'expiration."""
+
+    def test_lru_and_ttl(self):
+        cache = MarketProfileCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.get('a'), cache.get('c')), (1, 3))
+        with patch('france_travail.cv_matching.time.time', return_value=10 ** 12):
+            self.assertIsNone(cache.get('a'))
+
+
+class TestCachedMarketEnrichment(unittest.TestCase):
+    """Vérifie que le profil du marché est partagé par les offres de même signature."""
+
+    def setUp(self):
+        self.cache = MarketProfileCache(maxsize=10, ttl=60)
+        patcher = patch.object(cv_matching, 'market_profiles', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        index = patch.object(cv_matching, 'get_offer_index', return_value=None)
+        index.start()
+        self.addCleanup(index.stop)
+        self.service = CVMatchingService('id', 'secret')
+
+    def test_same_signature_reuses_profile(self):
+        with patch.object(self.service, 'search_similar_jobs', return_value=SIMILAR_JOBS) as search:
+            first = self.service.analyze_cv_job_match(CV_TEXT, 'Développeur Python en équipe')
+            second = self.service.analyze_cv_job_match(CV_TEXT, 'Nous recrutons un développeur python')
+            self.service.analyze_cv_job_match(CV_TEXT, 'Développeur Java')
+        self.assertEqual(search.call_count, 2)
+        self.assertEqual(first['market_insights'], second['market_insights'])
+        self.assertEqual(first['market_insights']['top_demanded_skills'],
+                         self.service._get_top_market_skills(SIMILAR_JOBS))
+
+    def test_same_results_as_uncached_methods(self):
+        job_text = 'Développeur Python en équipe, communication.'
+        with patch.object(self.service, 'search_similar_jobs', return_value=SIMILAR_JOBS):
+            result = self.service.analyze_cv_job_match(CV_TEXT, job_text)
+        enriched = self.service.enrich_skills_with_market_data(self.service.extract_soft_skills(job_text), SIMILAR_JOBS)
+        self.assertEqual(result['job_skills'], enriched)
+        self.assertEqual(result['market_insights']['similar_jobs_found'], len(SIMILAR_JOBS))
+
+    def test_offer_skills_extracted_once(self):
+        extract = self.service.extract_soft_skills
+        with patch.object(self.service, 'search_similar_jobs', return_value=SIMILAR_JOBS), \
+                patch.object(self.service, 'extract_soft_skills', side_effect=extract) as counted:
+            self.service.analyze_cv_job_match(CV_TEXT, 'Développeur Python')
+        # CV + offre analysée + une extraction par offre similaire
+        self.assertEqual(counted.call_count, 2 + len(SIMILAR_JOBS))
+
+    def test_local_index_keyed_on_full_text(self):
+        store = OfferStore()
+        store.upsert([{'id': str(i), **job} for i, job in enumerate(SIMILAR_JOBS)])
+        index = build_offer_index(store)
+        with patch.object(cv_matching, 'get_offer_index', return_value=index), \
+                patch.object(self.service, 'search_similar_jobs', return_value=SIMILAR_JOBS) as search:
+            self.service.analyze_cv_job_match(CV_TEXT, 'Développeur Python en équipe')
+            self.service.analyze_cv_job_match(CV_TEXT, 'Nous recrutons un développeur python')
+            self.service.analyze_cv_job_match(CV_TEXT, 'Développeur Python en équipe')
+        self.assertEqual(search.call_count, 2)
+
+    def test_fingerprint_follows_skill_db(self):
+        fingerprint = self.service.skills_fingerprint()
+        self.assertEqual(self.service.skills_fingerprint(), fingerprint)
+        self.service.soft_skills_db['communication']['keywords'].append('pédagogie')
+        self.service.invalidate_soft_skills()
+        self.assertNotEqual(self.service.skills_fingerprint(), fingerprint)
+
+    def test_degraded_profile_not_cached(self):
+        def unavailable(job_text, limit=10):
+            self.service.degraded_reason = 'circuit_open'
+            return []
+
+        with patch.object(self.service, 'search_similar_jobs', side_effect=unavailable) as search:
+            result = self.service.analyze_cv_job_match(CV_TEXT, 'Développeur Python')
+            self.service.analyze_cv_job_match(CV_TEXT, 'Développeur Python')
+        self.assertEqual(result['market_insights']['degraded_reason'], 'circuit_open')
+        self.assertEqual(search.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Tests pour le matching de masse CV × offres.
+"""
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.cv_matching import CVMatchingService
+from france_travail.matching_job import MatchingJob, SkillVectorCache
+from france_travail.mock_server import generate_offers
+from france_travail.offer_store import OfferStore
+
+CVS = [
+    (1, "Manager d'équipe, communication et organisation."),
+    (2, 'Rigueur, analyse et résolution de problèmes, autonomie.'),
+    (3, 'Créativité, innovation, flexibilité.'),
+    (4, ''),
+]
+CV_FILES = {f"cv_{user_id}.pdf": cv_text for user_id, cv_text in CVS}
+
+
+def read_fake_cv(path):
+    return CV_FILES[path]
+
+
+class TestMatchingJob(unittest.TestCase):
+    """Vérifie que le job donne le même top-k que CVMatchingService."""
+
+    def setUp(self):
+        self.store = OfferStore()
+        self.store.upsert(generate_offers(500))
+        self.service = CVMatchingService('id', 'secret')
+        offers = list(self.store.iter_offers())
+        self.expected = {}
+        for user_id, cv_text in CVS:
+            ranked = self.service.rank_offers(cv_text, offers, k=5)
+            self.expected[user_id] = [(o['id'], o['matching_rate']) for o in ranked]
+
+    def run_job(self, **kwargs):
+        results = {}
+        job = MatchingJob(self.store, k=5, block_size=2, **kwargs)
+        processed = job.run(iter(CVS), lambda user_id, recs: results.__setitem__(user_id, recs))
+        self.assertEqual(processed, len(CVS))
+        return {user_id: [(r['offer_id'], r['matching_rate']) for r in recs] for user_id, recs in results.items()}
+
+    def test_in_process(self):
+        self.assertEqual(self.run_job(workers=0), self.expected)
+
+    def test_process_pool(self):
+        self.assertEqual(self.run_job(workers=2), self.expected)
+
+    def test_cv_vectors_are_cached(self):
+        cache = SkillVectorCache()
+        self.run_job(workers=0, vector_cache=cache)
+        expected = self.service.skill_vector(self.service.extract_soft_skills(CVS[0][1]))
+        with patch.object(CVMatchingService, 'extract_soft_skills', side_effect=AssertionError('CV réanalysé')):
+            self.assertEqual(cache.get_or_compute(self.service, CVS[0][1]), expected)
+
+    def test_read_cv_in_workers(self):
+        cvs = [(user_id, f"cv_{user_id}.pdf") for user_id, _ in CVS] + [(5, 'illisible.pdf')]
+        for workers in (0, 2):
+            results = {}
+            job = MatchingJob(self.store, k=5, workers=workers, block_size=2, read_cv=read_fake_cv)
+            self.assertEqual(job.run(iter(cvs), lambda user_id, recs: results.__setitem__(user_id, recs)), len(CVS))
+            self.assertEqual({user_id: [(r['offer_id'], r['matching_rate']) for r in recs]
+                              for user_id, recs in results.items()}, self.expected)
+
+    def test_results_streamed_while_reading_cvs(self):
+        consumed = []
+
+        def cvs():
+            for i in range(40):
+                consumed.append(i)
+                yield i, CVS[i % len(CVS)][1]
+
+        for workers in (0, 1):
+            consumed.clear()
+            seen_at_first_result = []
+            job = MatchingJob(self.store, k=5, workers=workers, block_size=1)
+            job.run(cvs(), lambda user_id, recs: seen_at_first_result.append(len(consumed)))
+            self.assertEqual(len(seen_at_first_result), 40)
+            self.assertLess(seen_at_first_result[0], 40)
+
+    def test_empty_store(self):
+        self.assertEqual(MatchingJob(OfferStore(), workers=0).run(iter(CVS), lambda *args: None), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Tests pour le serveur local imitant les API France Travail.
+"""
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.api import OffresClient, SoftSkillsClient, RomeoClient
+from france_travail.api.config import ClientConfig
+from france_travail.api.exceptions import RateLimitedError
+from france_travail.api.rate_limiter import TokenBucket
+from france_travail.api.response_cache import ResponseCache
+from france_travail.api.retry import RetryPolicy
+from france_travail.api.token_cache import TokenStore
+from france_travail.mock_server import MockFranceTravailServer
+
+
+class TestResolveUrl(unittest.TestCase):
+    """Vérifie la redirection des URL de base."""
+
+    def test_resolve_url(self):
+        with patch.object(ClientConfig, 'API_URL', 'http://127.0.0.1:8080'), \
+                patch.object(ClientConfig, 'AUTH_URL', None):
+            self.assertEqual(
+                ClientConfig.resolve_url("https://api.francetravail.io/partenaire/romeo/v2"),
+                "http://127.0.0.1:8080/partenaire/romeo/v2"
+            )
+            self.assertEqual(
+                ClientConfig.resolve_url("https://francetravail.io/connexion/oauth2/access_token?realm=%2Fpartenaire", auth=True),
+                "http://127.0.0.1:8080/connexion/oauth2/access_token?realm=%2Fpartenaire"
+            )
+        with patch.object(ClientConfig, 'API_URL', None):
+            self.assertEqual(ClientConfig.resolve_url("https://api.test/v1"), "https://api.test/v1")
+
+
+class TestMockServer(unittest.TestCase):
+    """Vérifie que les clients fonctionnent de bout en bout contre le serveur simulé."""
+
+    def setUp(self):
+        self.server = MockFranceTravailServer(offers=400).start()
+        self.addCleanup(self.server.stop)
+        for patcher in (
+            patch.object(ClientConfig, 'API_URL', self.server.url),
+            patch.object(ClientConfig, 'AUTH_URL', None),
+            patch('france_travail.api.base_client.token_store', TokenStore()),
+            patch('france_travail.api.base_client.response_cache', ResponseCache(enabled=False)),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def make(self, cls, *args):
+        client = cls(*args, client_id='id', client_secret='secret')
+        client.rate_limiter = TokenBucket('test_mock', rate=1000, capacity=100)
+        client.retry_policy = RetryPolicy(max_attempts=3, base_delay=0, jitter=False, max_elapsed=5)
+        return client
+
+    def test_search_and_details(self):
+        offres = self.make(OffresClient, None)
+        offers = offres.search_all({})
+        self.assertEqual(len(offers), 400)
+        self.assertEqual(len({o['id'] for o in offers}), 400)
+        python_offers = list(offres.iter_search({'motsCles': 'python'}))
+        self.assertTrue(python_offers)
+        self.assertTrue(all('Python' in o['intitule'] for o in python_offers))
+        self.assertEqual(offres.get_job_details(offers[0]['id'])['id'], offers[0]['id'])
+
+    def test_matching_end_to_end(self):
+        skills = self.make(SoftSkillsClient)
+        offres = self.make(OffresClient, skills)
+        result = offres.analyze_cv_match("Rigueur et autonomie", "100000M")
+        self.assertEqual(result['rome_code'], 'M1805')
+        self.assertGreater(result['matching_rate'], 0)
+
+    def test_romeo(self):
+        romeo = self.make(RomeoClient)
+        result = romeo.predict_metiers("boulanger", nb_results=2)
+        self.assertEqual(result[0]['metiersRome'][0]['codeRome'], 'D1102')
+
+    def test_quota_returns_429(self):
+        self.server.state.quota = 1
+        skills = self.make(SoftSkillsClient)
+        skills.retry_policy = RetryPolicy(max_attempts=1)
+        # Trois appels rapides : au moins deux tombent dans la même seconde
+        with self.assertRaises(RateLimitedError):
+            for code in ('D1102', 'M1805', 'G1602'):
+                skills.get_skills_for_job(code)
+
+
+if __name__ == '__main__':
+    unittest.main()
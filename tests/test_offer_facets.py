@@ -0,0 +1,72 @@
+"""
+Tests pour les facettes des offres de l'entrepôt local.
+"""
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.mock_server import generate_offers
+from france_travail.offer_facets import build_offer_facets, facet_values
+from france_travail.offer_store import OfferStore
+
+OFFERS = [
+    {'id': '1', 'typeContrat': 'CDI', 'romeCode': 'M1805', 'lieuTravail': {'libelle': '75 - PARIS 11'},
+     'experienceLibelle': '2 ans', 'salaire': {'libelle': 'Annuel de 42000,00 Euros à 48000,00 Euros'}},
+    {'id': '2', 'typeContrat': 'CDD', 'romeCode': 'M1805', 'lieuTravail': {'libelle': '69 - LYON 03'},
+     'salaire': {'libelle': 'Mensuel de 2000.0 Euros sur 12 mois'}},
+    {'id': '3', 'typeContrat': 'CDI', 'romeCode': 'D1102', 'lieuTravail': {'codePostal': '97400'}},
+]
+
+
+class TestFacetValues(unittest.TestCase):
+    """Vérifie l'extraction des valeurs de facettes."""
+
+    def test_values(self):
+        self.assertEqual(facet_values(OFFERS[0])['salaire'], '35-45k')
+        self.assertEqual(facet_values(OFFERS[1])['salaire'], '< 25k')
+        self.assertEqual(facet_values(OFFERS[2])['departement'], '974')
+        self.assertEqual(facet_values(OFFERS[2])['experience'], 'Non précisé')
+
+
+class TestOfferFacets(unittest.TestCase):
+    """Vérifie les comptages filtrés et leur mise à jour incrémentale."""
+
+    def setUp(self):
+        self.store = OfferStore()
+        self.store.upsert(OFFERS, scope='s', seen_at=1)
+        self.facets = build_offer_facets(self.store)
+
+    def test_counts(self):
+        result = self.facets.counts()
+        self.assertEqual(result['total'], 3)
+        self.assertEqual(result['facets']['typeContrat'], {'CDI': 2, 'CDD': 1})
+
+    def test_filters_exclude_own_facet(self):
+        result = self.facets.counts({'typeContrat': 'CDI', 'romeCode': 'M1805,D1102'})
+        self.assertEqual(result['total'], 2)
+        # Les autres types de contrat restent visibles pour les codes ROME choisis
+        self.assertEqual(result['facets']['typeContrat'], {'CDI': 2, 'CDD': 1})
+        self.assertEqual(result['facets']['departement'], {'75': 1, '974': 1})
+        self.assertEqual([o['id'] for o in self.facets.offers({'departement': '69'})], ['2'])
+
+    def test_follows_store(self):
+        self.store.upsert([dict(OFFERS[1], typeContrat='CDI')], scope='s', seen_at=2)
+        self.assertEqual(self.facets.counts()['facets']['typeContrat'], {'CDI': 3})
+        self.store.mark_deleted('s', 2)
+        self.assertEqual(self.facets.counts()['total'], 1)
+
+    def test_filtered_counts_are_fast(self):
+        store = OfferStore()
+        store.upsert(generate_offers(10000))
+        facets = build_offer_facets(store)
+        start = time.perf_counter()
+        result = facets.counts({'typeContrat': 'CDI', 'departement': '75'})
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertEqual(sum(result['facets']['romeCode'].values()), result['total'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Tests pour l'index plein texte (BM25) des offres de l'entrepôt local.
+"""
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.cv_matching import CVMatchingService
+from france_travail.mock_server import generate_offers
+from france_travail.offer_index import OfferIndex, build_offer_index
+from france_travail.offer_store import OfferStore
+from france_travail.text_analysis import tokenize
+
+OFFERS = [
+    {'id': '1', 'intitule': 'Développeur Python H/F', 'description': "Développement d'APIs en Python et Django."},
+    {'id': '2', 'intitule': 'Développeuse Java', 'description': 'Maintenance applicative Java, Spring.'},
+    {'id': '3', 'intitule': 'Comptable', 'description': 'Tenue de la comptabilité, bilans, développement du suivi client.'},
+]
+
+
+class TestTokenize(unittest.TestCase):
+    """Vérifie la normalisation française."""
+
+    def test_accents_stop_words_and_stems(self):
+        self.assertEqual(tokenize("Le développeur et les développeuses de l'équipe"), ['developp', 'developp', 'equip'])
+        self.assertEqual(tokenize('Commerciaux'), tokenize('commercial'))
+
+
+class TestOfferIndex(unittest.TestCase):
+    """Vérifie le classement BM25 et les mises à jour incrémentales."""
+
+    def setUp(self):
+        self.store = OfferStore()
+        self.store.upsert(OFFERS)
+        self.index = build_offer_index(self.store)
+
+    def test_ranking(self):
+        results = self.index.search('développement python', k=3)
+        self.assertEqual(results[0][0], '1')
+        self.assertEqual({offer_id for offer_id, _ in results}, {'1', '2', '3'})
+        self.assertEqual(self.index.search('inconnu'), [])
+        self.assertEqual([o['id'] for o in self.index.search_offers('java', exclude=['9'])], ['2'])
+
+    def test_follows_store(self):
+        self.store.upsert([{'id': '4', 'intitule': 'Data engineer Python', 'description': 'Spark'}])
+        self.assertIn('4', dict(self.index.search('spark')))
+        self.store.upsert([dict(OFFERS[1], description='Kotlin')], scope='s', seen_at=1)
+        self.assertEqual(self.index.search('spring'), [])
+        self.store.mark_deleted('s', 2)
+        self.assertEqual(self.index.search('kotlin'), [])
+        self.assertEqual(len(self.index), 3)
+
+    def test_top_k_is_fast(self):
+        index = OfferIndex()
+        for offer in generate_offers(5000):
+            index.add(offer)
+        start = time.perf_counter()
+        results = index.search('développeur python analyse de données', k=10)
+        self.assertEqual(len(results), 10)
+        self.assertLess(time.perf_counter() - start, 0.2)
+
+
+class TestSimilarJobs(unittest.TestCase):
+    """Vérifie que les offres similaires sont servies par l'index local."""
+
+    def test_local_index_without_api_call(self):
+        store = OfferStore()
+        store.upsert(OFFERS)
+        service = CVMatchingService('id', 'secret')
+        with patch('france_travail.cv_matching.get_offer_index', return_value=build_offer_index(store)), \
+                patch.object(service, 'authenticate') as authenticate:
+            jobs = service.search_similar_jobs('Nous recherchons un développeur Python', limit=2)
+        self.assertEqual(jobs[0]['id'], '1')
+        authenticate.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+"""
+Tests pour l'entrepôt local d'offres et sa synchronisation incrémentale.
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.offer_index import build_offer_index
+from france_travail.offer_store import OfferStore
+from france_travail.offer_sync import OfferSync, format_api_date
+from france_travail.api.exceptions import FranceTravailAPIError
+from france_travail.api.scheduler import current_priority, BATCH
+
+
+def make_offer(i, hours_ago, **extra):
+    created = datetime.now(timezone.utc) - timedelta(hours=hours_ago)
+    offer = {
+        'id': f"{100000 + i}M",
+        'intitule': f"Développeur Python {i}",
+        'description': 'Poste en CDI',
+        'dateCreation': created.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+        'romeCode': 'M1805',
+        'typeContrat': 'CDI',
+    }
+    offer.update(extra)
+    return offer
+
+
+class FakeOffresClient:
+    """Client Offres réduit : filtre par date de création comme l'API."""
+
+    def __init__(self, offers):
+        self.offers = offers
+        self.searches = []
+        self.priorities = set()
+        self.error = None
+
+    def _matching(self, params):
+        return [o for o in self.offers
+                if params['minCreationDate'] <= o['dateCreation'][:19] + 'Z' <= params['maxCreationDate']]
+
+    def count_search(self, params):
+        self.priorities.add(current_priority())
+        return len(self._matching(params))
+
+    def search_all(self, params, fields=None, strict=False):
+        if self.error:
+            raise self.error
+        self.searches.append(params)
+        return [dict(o) for o in self._matching(params)]
+
+
+class TestOfferStore(unittest.TestCase):
+    """Vérifie l'insertion, la mise à jour et la suppression des offres."""
+
+    def setUp(self):
+        self.store = OfferStore()
+
+    def test_upsert_counts(self):
+        offers = [make_offer(1, 2), make_offer(2, 3)]
+        self.assertEqual(self.store.upsert(offers, scope='s'), {'inserted': 2, 'updated': 0, 'unchanged': 0})
+        offers[0]['intitule'] = 'Développeur Python senior'
+        self.assertEqual(self.store.upsert(offers, scope='s'), {'inserted': 0, 'updated': 1, 'unchanged': 1})
+        self.assertEqual(self.store.get('100001M')['intitule'], 'Développeur Python senior')
+
+    def test_mark_deleted_and_listeners(self):
+        events = []
+        self.store.subscribe(lambda changed, deleted: events.append(([o['id'] for o in changed], deleted)))
+        self.store.upsert([make_offer(1, 2), make_offer(2, 3)], scope='s', seen_at=100)
+        self.store.upsert([make_offer(2, 3)], scope='s', seen_at=200)
+
+        self.assertEqual(self.store.mark_deleted('s', 200), ['100001M'])
+        self.assertIsNone(self.store.get('100001M'))
+        self.assertEqual(self.store.count(), 1)
+        self.assertEqual(events, [(['100001M', '100002M'], []), ([], ['100001M'])])
+
+    def test_search(self):
+        self.store.upsert([make_offer(1, 2), make_offer(2, 3, typeContrat='MIS', intitule='Data engineer')])
+        self.assertEqual([o['id'] for o in self.store.search(type_contrat='MIS')], ['100002M'])
+        self.assertEqual([o['id'] for o in self.store.search(keywords='python')], ['100001M'])
+        self.assertEqual(len(self.store.search(rome_code='M1805')), 2)
+
+
+class TestCrossProcessRefresh(unittest.TestCase):
+    """Vérifie que les index suivent les écritures d'un autre processus (autre connexion)."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'offers.sqlite')
+
+    def test_refresh_applies_foreign_writes(self):
+        server, sync = OfferStore(self.path), OfferStore(self.path)
+        server.upsert([make_offer(1, 2)], scope='s', seen_at=100)
+        index = build_offer_index(server)
+        events = []
+        server.subscribe(lambda changed, deleted: events.append(([o['id'] for o in changed], deleted)))
+        server.refresh()
+        self.assertEqual(events, [])
+
+        sync.upsert([make_offer(2, 3, intitule='Boulanger')], scope='s', seen_at=200)
+        sync.mark_deleted('s', 200)
+        self.assertEqual([offer_id for offer_id, _ in index.search('python')], ['100001M'])
+        server.refresh()
+        self.assertEqual(events, [(['100002M'], ['100001M'])])
+        self.assertEqual(index.search('python'), [])
+        self.assertEqual([offer_id for offer_id, _ in index.search('boulanger')], ['100002M'])
+        server.refresh()
+        self.assertEqual(len(events), 1)
+
+    def test_store_without_generation_is_migrated(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute('CREATE TABLE offers (id TEXT PRIMARY KEY, date_creation TEXT, date_actualisation TEXT, '
+                     'rome_code TEXT, type_contrat TEXT, data BLOB, first_seen REAL, last_seen REAL, deleted_at REAL)')
+        conn.commit()
+        conn.close()
+        store = OfferStore(self.path)
+        store.upsert([make_offer(1, 2)])
+        self.assertEqual(store.count(), 1)
+
+
+class TestOfferSync(unittest.TestCase):
+    """Vérifie la synchronisation complète puis incrémentale."""
+
+    def setUp(self):
+        self.store = OfferStore()
+        self.client = FakeOffresClient([make_offer(i, 10 + i) for i in range(12)])
+        self.sync = OfferSync(self.client, self.store, {'motsCles': 'python'}, history_days=2)
+
+    def test_full_then_incremental(self):
+        result = self.sync.run()
+        self.assertTrue(result['full'])
+        self.assertEqual(result['inserted'], 12)
+        self.assertEqual(self.client.priorities, {BATCH})
+
+        self.client.offers.append(make_offer(99, 0))
+        self.client.searches.clear()
+        result = self.sync.run()
+        self.assertFalse(result['full'])
+        self.assertEqual(result['inserted'], 1)
+        watermark = self.store.get_state(self.sync.scope)['watermark']
+        self.assertLessEqual(self.client.searches[0]['maxCreationDate'], watermark)
+        self.assertEqual(self.store.count(), 13)
+
+    def test_full_sync_marks_missing_offers_deleted(self):
+        self.sync.run()
+        removed = self.client.offers.pop(0)
+        self.client.offers[0]['intitule'] = 'Développeur Python (modifiée)'
+        result = self.sync.run(full=True)
+        self.assertEqual((result['updated'], result['deleted']), (1, 1))
+        self.assertIsNone(self.store.get(removed['id']))
+
+    def test_full_sync_keeps_offers_older_than_history(self):
+        old = make_offer(50, 24 * 5)
+        self.store.upsert([old], scope=self.sync.scope, seen_at=1)
+        self.client.offers.append(old)
+        result = self.sync.run(full=True)
+        self.assertEqual(result['deleted'], 0)
+        self.assertEqual(self.store.get(old['id'])['id'], old['id'])
+
+    def test_truncated_window_marks_nothing_deleted(self):
+        self.sync.run()
+        removed = self.client.offers.pop(0)
+        with patch('france_travail.offer_sync.MAX_RESULTS', 5), \
+                patch('france_travail.offer_sync.MIN_SPAN', timedelta(days=3)):
+            result = self.sync.run(full=True)
+        self.assertEqual(result['deleted'], 0)
+        self.assertIsNotNone(self.store.get(removed['id']))
+
+    def test_failed_sync_keeps_offers_and_watermark(self):
+        self.sync.run()
+        state = self.store.get_state(self.sync.scope)
+        self.client.error = FranceTravailAPIError('Authentification impossible')
+        with self.assertRaises(FranceTravailAPIError):
+            self.sync.run(full=True)
+        self.assertEqual(self.store.count(), 12)
+        self.assertEqual(self.store.get_state(self.sync.scope), state)
+
+    def test_large_ranges_are_split(self):
+        with patch('france_travail.offer_sync.MAX_RESULTS', 5):
+            end = datetime.now(timezone.utc)
+            windows = list(self.sync.date_windows(end - timedelta(days=2), end))
+        self.assertGreater(len(windows), 2)
+        for start, stop in windows:
+            params = {'minCreationDate': format_api_date(start), 'maxCreationDate': format_api_date(stop)}
+            self.assertLessEqual(self.client.count_search(params), 5)
+        self.assertEqual(self.sync.run()['inserted'], 12)
+
+
+if __name__ == '__main__':
+    unittest.main()
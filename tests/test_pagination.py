@@ -0,0 +1,197 @@
+"""
+Tests pour la pagination de /offres/search par fenêtres Content-Range.
+"""
+import asyncio
+import itertools
+import json
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+
+import httpx
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.api import OffresClient, AsyncOffresClient
+from france_travail.api.exceptions import FranceTravailAPIError
+from france_travail.api.pagination import parse_content_range, window_bounds
+from france_travail.api.rate_limiter import TokenBucket
+from france_travail.api.token_cache import TokenStore
+from france_travail.api.response_cache import ResponseCache
+
+TOTAL = 400
+
+
+def setUpModule():
+    # Cache de réponses désactivé : chaque test doit voir les appels réseau
+    cache = ResponseCache(enabled=False)
+    for target in ('base_client', 'async_base_client'):
+        patcher = patch(f'france_travail.api.{target}.response_cache', cache)
+        patcher.start()
+        unittest.addModuleCleanup(patcher.stop)
+
+
+def search_page(range_param, total=TOTAL):
+    """Retourne (statut, en-têtes, corps) de l'API simulée pour une fenêtre donnée."""
+    start, end = (int(x) for x in range_param.split('-'))
+    end = min(end, total - 1)
+    if start >= total:
+        return 204, {}, b''
+    offers = [{'id': str(i)} for i in range(start, end + 1)]
+    status = 200 if start == 0 and end == total - 1 else 206
+    headers = {'Content-Range': f"offres {start}-{end}/{total}"}
+    return status, headers, json.dumps({'resultats': offers}).encode()
+
+
+class FakeSession:
+    """Session requests simulant /offres/search."""
+
+    def __init__(self):
+        self.ranges = []
+        self.lock = threading.Lock()
+
+    def request(self, method, url, params=None, **kwargs):
+        with self.lock:
+            self.ranges.append(params['range'])
+        status, headers, body = search_page(params['range'])
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers)
+        response._content = body
+        return response
+
+
+def make_client():
+    client = OffresClient(soft_skills_client=None, client_id='id', client_secret='secret')
+    client.session = FakeSession()
+    client.rate_limiter = TokenBucket('test_pagination', rate=1000, capacity=100)
+    client._authenticate = lambda force=False: True
+    return client
+
+
+class TestPaginationHelpers(unittest.TestCase):
+    """Vérifie l'analyse de Content-Range et le calcul des fenêtres."""
+
+    def test_parse_content_range(self):
+        self.assertEqual(parse_content_range("offres 0-149/1234"), (0, 149, 1234))
+        self.assertEqual(parse_content_range("offres 0-149/*"), (0, 149, None))
+        self.assertIsNone(parse_content_range(None))
+        self.assertIsNone(parse_content_range("n'importe quoi"))
+
+    def test_window_bounds(self):
+        self.assertEqual(window_bounds(0), (0, 149))
+        self.assertEqual(window_bounds(300, total=400), (300, 399))
+        self.assertEqual(window_bounds(0, limit=20), (0, 19))
+        self.assertEqual(window_bounds(3000), (3000, 3149))
+        self.assertIsNone(window_bounds(3150))
+        self.assertIsNone(window_bounds(400, total=400))
+
+
+class TestIterSearch(unittest.TestCase):
+    """Vérifie le parcours synchrone des fenêtres."""
+
+    def test_walks_all_windows(self):
+        client = make_client()
+        ids = [offer['id'] for offer in client.iter_search({'motsCles': 'python'})]
+        self.assertEqual(ids, [str(i) for i in range(TOTAL)])
+        self.assertEqual(client.session.ranges, ['0-149', '150-299', '300-399'])
+
+    def test_limit(self):
+        client = make_client()
+        self.assertEqual(len(list(client.iter_search({}, limit=160))), 160)
+        self.assertEqual(client.session.ranges, ['0-149', '150-159'])
+
+    def test_stops_when_consumer_stops(self):
+        client = make_client()
+        first = list(itertools.islice(client.iter_search({}), 5))
+        self.assertEqual(len(first), 5)
+        # Première fenêtre + au plus une fenêtre préchargée
+        self.assertLessEqual(len(client.session.ranges), 2)
+
+
+class TestSearchAll(unittest.TestCase):
+    """Vérifie la récupération parallèle des fenêtres."""
+
+    def test_parallel_windows_merged_in_order(self):
+        client = make_client()
+        offers = client.search_all({'codeROME': 'M1805'}, window=50, max_workers=4)
+        self.assertEqual([offer['id'] for offer in offers], [str(i) for i in range(TOTAL)])
+        self.assertEqual(client.session.ranges[0], '0-49')
+        self.assertEqual(sorted(client.session.ranges), sorted(f"{i}-{i + 49}" for i in range(0, TOTAL, 50)))
+
+    def test_single_window(self):
+        client = make_client()
+        self.assertEqual(len(client.search_all({}, limit=30)), 30)
+        self.assertEqual(client.session.ranges, ['0-29'])
+
+
+class TestStrictSearch(unittest.TestCase):
+    """Vérifie que les échecs sont remontés au lieu de donner un résultat vide."""
+
+    def test_auth_failure(self):
+        client = make_client()
+        client._authenticate = lambda force=False: False
+        self.assertEqual(client.search_all({}), [])
+        with self.assertRaises(FranceTravailAPIError):
+            client.count_search({})
+        with self.assertRaises(FranceTravailAPIError):
+            client.search_all({}, strict=True)
+
+    def test_client_error(self):
+        client = make_client()
+        response = requests.Response()
+        response.status_code = 400
+        response._content = b'{}'
+        client.session.request = lambda *args, **kwargs: response
+        with self.assertRaises(FranceTravailAPIError) as ctx:
+            client.search_all({}, strict=True)
+        self.assertEqual(ctx.exception.status_code, 400)
+
+
+class TestAiterSearch(unittest.TestCase):
+    """Vérifie le parcours asynchrone des fenêtres."""
+
+    def test_walks_all_windows(self):
+        ranges = []
+
+        def handler(request):
+            if request.url.path.endswith('/access_token'):
+                return httpx.Response(200, json={'access_token': 'tok', 'expires_in': 1499})
+            ranges.append(request.url.params['range'])
+            status, headers, body = search_page(request.url.params['range'])
+            return httpx.Response(status, headers=headers, content=body)
+
+        async def run():
+            session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            with patch('france_travail.api.async_base_client.get_async_session', return_value=session), \
+                    patch('france_travail.api.async_base_client.token_store', TokenStore()):
+                client = AsyncOffresClient(None, client_id='id', client_secret='secret')
+                client.rate_limiter = TokenBucket('test_pagination', rate=1000, capacity=100)
+                return [offer['id'] async for offer in client.aiter_search({}, window=100)]
+
+        self.assertEqual(asyncio.run(run()), [str(i) for i in range(TOTAL)])
+        self.assertEqual(ranges, ['0-99', '100-199', '200-299', '300-399'])
+
+    def test_search_all(self):
+        def handler(request):
+            if request.url.path.endswith('/access_token'):
+                return httpx.Response(200, json={'access_token': 'tok', 'expires_in': 1499})
+            status, headers, body = search_page(request.url.params['range'])
+            return httpx.Response(status, headers=headers, content=body)
+
+        async def run():
+            session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            with patch('france_travail.api.async_base_client.get_async_session', return_value=session), \
+                    patch('france_travail.api.async_base_client.token_store', TokenStore()):
+                client = AsyncOffresClient(None, client_id='id', client_secret='secret')
+                client.rate_limiter = TokenBucket('test_pagination', rate=1000, capacity=100)
+                return await client.search_all({}, window=150)
+
+        self.assertEqual([offer['id'] for offer in asyncio.run(run())], [str(i) for i in range(TOTAL)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Tests pour la projection des réponses et le décodage JSON rapide.
+"""
+import json
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.api import OffresClient
+from france_travail.api import json_codec
+from france_travail.api.projection import project, field_tree
+from france_travail.api.rate_limiter import TokenBucket
+from france_travail.api.response_cache import ResponseCache
+
+OFFER = {
+    'id': '194DZZT',
+    'intitule': 'Développeur Python',
+    'description': 'x' * 2000,
+    'lieuTravail': {'libelle': '75 - Paris', 'latitude': 48.85, 'commune': '75056'},
+    'competences': [{'code': '1', 'libelle': 'Python', 'exigence': 'E'}],
+}
+
+
+class OffersSession:
+    """Session requests qui répond une page de recherche et compte les appels."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        response = requests.Response()
+        response.status_code = 206
+        response.headers['Content-Range'] = 'offres 0-0/1'
+        response._content = json.dumps({'resultats': [OFFER], 'filtresPossibles': [{'filtre': 'x'}]}).encode()
+        return response
+
+
+class TestProjection(unittest.TestCase):
+    """Vérifie la réduction des documents aux champs demandés."""
+
+    def test_nested_paths_and_lists(self):
+        fields = ('id', 'lieuTravail.libelle', 'competences.libelle', 'absent.champ')
+        self.assertEqual(project(OFFER, fields), {
+            'id': '194DZZT',
+            'lieuTravail': {'libelle': '75 - Paris'},
+            'competences': [{'libelle': 'Python'}],
+        })
+        self.assertIs(project(OFFER, None), OFFER)
+
+    def test_shorter_path_keeps_whole_value(self):
+        self.assertEqual(field_tree(['lieuTravail', 'lieuTravail.libelle']), {'lieuTravail': None})
+        self.assertEqual(field_tree(['lieuTravail.libelle', 'lieuTravail']), {'lieuTravail': None})
+
+    def test_codec_fallback(self):
+        payload = {'intitule': 'Électricien'}
+        with patch.object(json_codec, 'orjson', None):
+            self.assertEqual(json_codec.loads(json_codec.dumps(payload)), payload)
+        self.assertEqual(json_codec.loads(json_codec.dumps(payload)), payload)
+
+
+class TestClientProjection(unittest.TestCase):
+    """Vérifie que la projection est appliquée avant la mise en cache."""
+
+    def setUp(self):
+        self.cache = ResponseCache()
+        patcher = patch('france_travail.api.base_client.response_cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = OffresClient(soft_skills_client=None, client_id='id', client_secret='secret')
+        self.client.session = OffersSession()
+        self.client.rate_limiter = TokenBucket('test_projection', rate=1000, capacity=100)
+        self.client._authenticate = lambda force=False: True
+
+    def test_search_projected_and_cached(self):
+        fields = ('id', 'intitule')
+        result = self.client.search_jobs({'motsCles': 'python'}, fields=fields)
+        self.assertEqual(result, {'resultats': [{'id': '194DZZT', 'intitule': 'Développeur Python'}]})
+
+        self.assertEqual(self.client.search_jobs({'motsCles': 'python'}, fields=fields), result)
+        self.assertEqual(self.client.session.calls, 1)
+        stored = self.cache._connection().execute('SELECT content FROM responses').fetchone()[0]
+        self.assertNotIn(b'description', bytes(stored))
+
+        full = self.client.search_jobs({'motsCles': 'python'})
+        self.assertIn('filtresPossibles', full)
+        self.assertEqual(self.client.session.calls, 2)
+
+    def test_search_all_fields(self):
+        offers = self.client.search_all({'motsCles': 'python'}, fields=('id', 'lieuTravail.libelle'))
+        self.assertEqual(offers, [{'id': '194DZZT', 'lieuTravail': {'libelle': '75 - Paris'}}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Tests pour le limiteur de débit par seau à jetons.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.api.rate_limiter import TokenBucket, FileBackend, MemoryBackend, get_rate_limiter
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Vérifie les rafales, l'espacement et le partage d'état."""
+
+    def test_burst_then_spacing(self):
+        """La capacité est servie immédiatement, puis les appels sont espacés au débit."""
+        bucket = TokenBucket('test', rate=20, capacity=3)
+        waits = [bucket.reserve() for _ in range(5)]
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(waits[3], 1 / 20, delta=0.01)
+        self.assertAlmostEqual(waits[4], 2 / 20, delta=0.01)
+
+    def test_try_acquire(self):
+        """try_acquire ne crée pas de dette quand le seau est vide."""
+        bucket = TokenBucket('test', rate=1, capacity=1)
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+        self.assertGreater(bucket.time_until_available(), 0.9)
+
+    def test_threads_respect_rate(self):
+        """Plusieurs threads partageant le seau ne dépassent pas le débit."""
+        bucket = TokenBucket('test', rate=50, capacity=1)
+        stamps = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(5):
+                bucket.acquire()
+                with lock:
+                    stamps.append(time.monotonic())
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        start = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # 20 appels à 50/s avec 1 jeton d'avance : au moins 19/50 s
+        self.assertGreaterEqual(max(stamps) - start, 19 / 50 - 0.02)
+
+    def test_async_acquire(self):
+        """acquire_async espace les coroutines sans bloquer la boucle."""
+        bucket = TokenBucket('test', rate=100, capacity=1)
+
+        async def run():
+            start = time.monotonic()
+            await asyncio.gather(*(bucket.acquire_async() for _ in range(6)))
+            return time.monotonic() - start
+
+        self.assertGreaterEqual(asyncio.run(run()), 5 / 100 - 0.01)
+
+    def test_file_backend_shared_between_buckets(self):
+        """Deux seaux (ex. deux workers) sur le même fichier partagent le quota."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            a = TokenBucket('offres', rate=10, capacity=2, backend=FileBackend(tmpdir))
+            b = TokenBucket('offres', rate=10, capacity=2, backend=FileBackend(tmpdir))
+            self.assertEqual(a.reserve(), 0.0)
+            self.assertEqual(b.reserve(), 0.0)
+            self.assertGreater(a.reserve(), 0.0)
+
+    def test_registry_uses_api_quotas(self):
+        """Les clients d'une même API partagent un seau au bon débit."""
+        self.assertIs(get_rate_limiter('romeo'), get_rate_limiter('romeo'))
+        self.assertEqual(get_rate_limiter('soft_skills').rate, 2)
+        self.assertEqual(get_rate_limiter('offres').rate, 10)
+        self.assertIsInstance(get_rate_limiter('lbb').backend, MemoryBackend)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Tests pour le cache disque des réponses HTTP.
+"""
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.api import SoftSkillsClient
+from france_travail.api.base_client import BaseClient
+from france_travail.api.rate_limiter import TokenBucket
+from france_travail.api.response_cache import ResponseCache, cache_key, ttl_for
+
+
+class RecordingSession:
+    """Session requests qui enregistre les requêtes et répond via `handler`."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        status, headers, body = self.handler(method, url, kwargs)
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers)
+        response._content = body
+        return response
+
+
+def prepare(client, handler):
+    client.session = RecordingSession(handler)
+    client.rate_limiter = TokenBucket('test_cache', rate=1000, capacity=100)
+    client._authenticate = lambda force=False: True
+    return client
+
+
+class TestResponseCacheStore(unittest.TestCase):
+    """Vérifie le stockage SQLite et le calcul des clés."""
+
+    def test_persisted_on_disk(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'responses.sqlite')
+            ResponseCache(path).set('k', 200, {'ETag': '"v1"', 'Authorization': 'x'}, b'{}', ttl=60)
+            entry = ResponseCache(path).get('k')
+            self.assertTrue(entry.is_fresh())
+            self.assertEqual(entry.headers, {'ETag': '"v1"'})
+            self.assertEqual(entry.validators(), {'If-None-Match': '"v1"'})
+
+    def test_key_and_ttl(self):
+        self.assertEqual(cache_key('get', 'u', {'a': 1, 'b': 2}), cache_key('GET', 'u', {'b': 2, 'a': 1}))
+        self.assertNotEqual(cache_key('GET', 'u', {'a': 1}, scope='s1'), cache_key('GET', 'u', {'a': 1}, scope='s2'))
+        ttls = {'/offres/': 900, '/offres/search': 300}
+        self.assertEqual(ttl_for('/offres/search', ttls), 300)
+        self.assertEqual(ttl_for('/offres/123', ttls), 900)
+        self.assertEqual(ttl_for('/autre', ttls), 0)
+
+
+class TestClientCaching(unittest.TestCase):
+    """Vérifie l'intégration du cache dans BaseClient._send."""
+
+    def setUp(self):
+        self.cache = ResponseCache()
+        patcher = patch('france_travail.api.base_client.response_cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_soft_skills_served_from_cache(self):
+        client = prepare(SoftSkillsClient(client_id='id', client_secret='secret'),
+                         lambda m, u, kw: (200, {}, b'{"skills": {}}'))
+        for _ in range(3):
+            self.assertEqual(client.get_skills_for_job('D1102'), {'skills': {}})
+        client.get_skills_for_job('M1805')
+        self.assertEqual(len(client.session.requests), 2)
+        self.assertEqual(self.cache.stats()['soft_skills'], {'hits': 2, 'revalidated': 0, 'misses': 2, 'stale': 0, 'hit_rate': 0.5})
+
+    def test_revalidation_with_etag(self):
+        def handler(method, url, kwargs):
+            if kwargs['headers'].get('If-None-Match') == '"v1"':
+                return 304, {}, b''
+            return 200, {'ETag': '"v1"'}, b'{"skills": {"s1": {}}}'
+
+        client = prepare(SoftSkillsClient(client_id='id', client_secret='secret'), handler)
+        client.cache_ttls = {'/professions/job_skills': 0.05}
+        first = client.get_skills_for_job('D1102')
+        time.sleep(0.1)
+        second = client.get_skills_for_job('D1102')
+        self.assertEqual(first, second)
+        self.assertEqual(len(client.session.requests), 2)
+        self.assertEqual(self.cache.stats()['soft_skills']['revalidated'], 1)
+
+    def test_non_idempotent_and_errors_not_cached(self):
+        client = BaseClient(client_id='id', client_secret='secret', base_url='https://api.test', scope='s')
+        client.cache_ttls = {'/': 60}
+        prepare(client, lambda m, u, kw: (404, {}, b'') if u.endswith('/absent') else (200, {}, b'{}'))
+        client._make_request('POST', '/ecriture')
+        client._make_request('POST', '/ecriture')
+        client._make_request('GET', '/absent')
+        client._make_request('GET', '/absent')
+        self.assertEqual(len(client.session.requests), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
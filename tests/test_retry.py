@@ -0,0 +1,134 @@
+"""
+Tests pour la politique de nouvelles tentatives (429 / 5xx).
+"""
+import os
+import sys
+import unittest
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.api.base_client import BaseClient
+from france_travail.api.exceptions import RateLimitedError, UpstreamUnavailableError
+from france_travail.api.rate_limiter import TokenBucket
+from france_travail.api.retry import RetryPolicy, RetryStats, parse_retry_after
+import france_travail.api.base_client as base_client
+
+
+def make_response(status, body=b'{}', headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers.update(headers or {})
+    return response
+
+
+class FakeSession:
+    """Session qui rejoue une liste de réponses et compte les appels."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        item = self.responses.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+
+class FakeClient(BaseClient):
+    api_name = 'test_retry'
+    idempotent_endpoints = ('/predictionMetiers',)
+
+    def __init__(self, responses):
+        super().__init__(client_id='id', client_secret='secret', base_url='https://api.test', scope='test')
+        self.session = FakeSession(responses)
+        self.rate_limiter = TokenBucket('test_retry', rate=1000, capacity=100)
+        self.retry_policy = RetryPolicy(max_attempts=3, base_delay=0, jitter=False)
+
+    def _authenticate(self, force=False):
+        self.access_token = 'token'
+        return True
+
+
+class TestParseRetryAfter(unittest.TestCase):
+    """Vérifie la lecture de l'en-tête Retry-After."""
+
+    def test_seconds(self):
+        self.assertEqual(parse_retry_after('3'), 3.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('bientôt'))
+
+    def test_http_date(self):
+        date = datetime.now(timezone.utc) + timedelta(seconds=30)
+        self.assertAlmostEqual(parse_retry_after(format_datetime(date, usegmt=True)), 30, delta=2)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Vérifie les règles de nouvelle tentative."""
+
+    def test_backoff_is_capped(self):
+        policy = RetryPolicy(base_delay=1, max_delay=4, jitter=False)
+        self.assertEqual([policy.backoff(i) for i in range(4)], [1, 2, 4, 4])
+
+    def test_post_not_retried_on_5xx_but_retried_on_429(self):
+        state = RetryPolicy(base_delay=0, jitter=False).start('POST', '/offres')
+        self.assertIsNone(state.next_delay(503))
+        self.assertIsNotNone(state.next_delay(429))
+
+    def test_max_elapsed(self):
+        state = RetryPolicy(max_elapsed=1).start('GET', '/offres')
+        self.assertIsNone(state.next_delay(503, retry_after=5))
+
+
+class TestClientRetry(unittest.TestCase):
+    """Vérifie l'intégration dans BaseClient._make_request."""
+
+    def setUp(self):
+        self._stats = base_client.retry_stats
+        base_client.retry_stats = RetryStats()
+
+    def tearDown(self):
+        base_client.retry_stats = self._stats
+
+    def test_429_then_success(self):
+        client = FakeClient([make_response(429, headers={'Retry-After': '0'}), make_response(200, b'{"ok": true}')])
+        self.assertEqual(client._make_request('GET', '/offres/search'), {'ok': True})
+        self.assertEqual(client.session.calls, 2)
+        stats = base_client.retry_stats.snapshot()['test_retry']
+        self.assertEqual((stats['retries'], stats['successes'], stats['success_rate']), (1, 1, 1.0))
+
+    def test_exhausted_429_raises(self):
+        client = FakeClient([make_response(429, headers={'Retry-After': '0'})] * 3)
+        with self.assertRaises(RateLimitedError):
+            client._make_request('GET', '/offres/search')
+        self.assertEqual(client.session.calls, 3)
+
+    def test_non_idempotent_post_not_retried(self):
+        client = FakeClient([make_response(500), make_response(200)])
+        with self.assertRaises(UpstreamUnavailableError):
+            client._make_request('POST', '/offres')
+        self.assertEqual(client.session.calls, 1)
+
+    def test_idempotent_post_retried(self):
+        client = FakeClient([make_response(502), make_response(200, b'[]')])
+        self.assertEqual(client._make_request('POST', '/predictionMetiers', json={}), [])
+        self.assertEqual(client.session.calls, 2)
+
+    def test_network_error_retried(self):
+        client = FakeClient([requests.exceptions.ConnectionError('reset'), make_response(200, b'{}')])
+        self.assertEqual(client._make_request('GET', '/offres/1'), {})
+
+    def test_client_error_still_returns_none(self):
+        client = FakeClient([make_response(404)])
+        self.assertIsNone(client._make_request('GET', '/offres/inconnue'))
+        self.assertEqual(client.session.calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Tests pour l'index des compétences utilisé par le matching ROME 4.0.
+"""
+import os
+import random
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.rome4_api import FranceTravailROME4API
+
+WORDS = ['gestion', 'des', 'stocks', 'accueil', 'client', 'clientèle', 'développer', 'une', 'application',
+         'python', 'rigueur', 'travail', 'en', 'équipe', 'sql', 'ux', 'r', 'communication', 'écrite']
+
+METIER_COMPETENCES = {
+    'savoir': ['Bases de données SQL', 'Langage Python', 'UX'],
+    'savoir_faire': ['Développer une application', 'Gestion des stocks', 'Accueil de la clientèle'],
+    'savoir_etre': ['Rigueur', 'Travail en équipe'],
+    'competences_transverses': [],
+}
+
+
+def exhaustive_matching(api, metier_competences, user_skills):
+    """Comparaison de chaque compétence de l'utilisateur à chaque compétence du métier."""
+    user_skills_lower = [skill.lower().strip() for skill in user_skills]
+    matches_by_category = {}
+    for category, rome_competences in metier_competences.items():
+        category_matches = []
+        for user_skill in user_skills_lower:
+            for rome_comp in [comp.lower().strip() for comp in rome_competences]:
+                if (user_skill == rome_comp or user_skill in rome_comp or rome_comp in user_skill or
+                        api._similarity_score(user_skill, rome_comp) > 0.7):
+                    category_matches.append(user_skill)
+                    break
+        matches_by_category[category] = category_matches
+    all_matches = {match for matches in matches_by_category.values() for match in matches}
+    missing = [f"{comp} ({category})" for category, comps in metier_competences.items() for comp in comps[:3]
+               if not any(match in comp.lower() or comp.lower() in match for match in all_matches)]
+    return matches_by_category, missing[:8]
+
+
+def random_phrase(rng):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+
+
+class TestROME4Matching(unittest.TestCase):
+    """Vérifie l'équivalence avec la comparaison exhaustive et la réutilisation de l'index."""
+
+    def setUp(self):
+        self.api = FranceTravailROME4API('id', 'secret')
+        for name in ('extract_competences_from_metier', 'get_contextes_travail'):
+            patcher = patch.object(self.api, name)
+            patcher.start().return_value = [] if name == 'get_contextes_travail' else METIER_COMPETENCES
+            self.addCleanup(patcher.stop)
+
+    def assert_same_as_exhaustive(self, metier_competences, user_skills):
+        self.api.extract_competences_from_metier.return_value = metier_competences
+        result = self.api.match_competences_rome4('M1805', user_skills)
+        matches, missing = exhaustive_matching(self.api, metier_competences, user_skills)
+        for category, category_matches in matches.items():
+            self.assertEqual(sorted(result['matches_by_category'][category]), sorted(set(category_matches)))
+        self.assertEqual(result['missing_skills'], missing)
+        return result
+
+    def test_edge_cases(self):
+        result = self.assert_same_as_exhaustive(METIER_COMPETENCES, [
+            'Python', 'python', 'sql', 'r', 'ux', '', '  ', 'stocks', 'gestion des stocks et inventaires',
+            'travail équipe en', 'accueil\x00client', 'Développement web', 'écrite',
+        ])
+        self.assertIn('python', result['matches_by_category']['savoir'])
+        self.assertIn('travail équipe en', result['matches_by_category']['savoir_etre'])
+
+    def test_random_skills(self):
+        rng = random.Random(0)
+        for _ in range(50):
+            metier = {category: [random_phrase(rng).capitalize() for _ in range(rng.randint(0, 8))]
+                      for category in METIER_COMPETENCES}
+            metier['savoir'] = metier['savoir'] or ['Sql']
+            self.assert_same_as_exhaustive(metier, [random_phrase(rng) for _ in range(rng.randint(0, 10))])
+
+    def test_index_reused_across_users(self):
+        self.api.match_competences_rome4('M1805', ['Python'])
+        index = self.api.competence_indexes['M1805']
+        self.api.match_competences_rome4('m1805', ['Rigueur'])
+        self.assertIs(self.api.competence_indexes['M1805'], index)
+
+        changed = dict(METIER_COMPETENCES, savoir_etre=['Autonomie'])
+        self.assert_same_as_exhaustive(changed, ['autonomie'])
+        self.assertIsNot(self.api.competence_indexes['M1805'], index)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Tests pour l'ordonnancement par priorité des appels France Travail.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.api.rate_limiter import TokenBucket
+from france_travail.api.scheduler import (
+    RequestScheduler, request_priority, current_priority, propagate_priority, INTERACTIVE, BATCH
+)
+
+
+def saturated_scheduler(rate=50, min_shares=None):
+    """Scheduler dont le seau est vide : chaque jeton arrive toutes les 1/rate s."""
+    limiter = TokenBucket('test_scheduler', rate=rate, capacity=1)
+    limiter.try_acquire()
+    return RequestScheduler(limiter, min_shares=min_shares or {INTERACTIVE: 0.5, BATCH: 0.2})
+
+
+class TestPriorityContext(unittest.TestCase):
+    """Vérifie la propagation de la priorité courante."""
+
+    def test_context_and_threads(self):
+        self.assertEqual(current_priority(), INTERACTIVE)
+        with request_priority(BATCH):
+            fetch = propagate_priority(current_priority)
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                self.assertEqual(executor.submit(fetch).result(), BATCH)
+                self.assertEqual(executor.submit(current_priority).result(), INTERACTIVE)
+        self.assertEqual(current_priority(), INTERACTIVE)
+
+    def test_unknown_priority(self):
+        with self.assertRaises(ValueError):
+            with request_priority('urgent'):
+                pass
+
+
+class TestRequestScheduler(unittest.TestCase):
+    """Vérifie l'ordre de service et les parts minimales."""
+
+    def run_contention(self, scheduler, batch_calls, interactive_calls):
+        order = []
+        lock = threading.Lock()
+
+        def call(priority):
+            scheduler.acquire(priority)
+            with lock:
+                order.append(priority)
+
+        threads = [threading.Thread(target=call, args=(BATCH,)) for _ in range(batch_calls)]
+        threads += [threading.Thread(target=call, args=(INTERACTIVE,)) for _ in range(interactive_calls)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.001)
+        for thread in threads:
+            thread.join()
+        return order
+
+    def test_interactive_served_before_queued_batch(self):
+        scheduler = saturated_scheduler(min_shares={INTERACTIVE: 0, BATCH: 0})
+        order = self.run_contention(scheduler, batch_calls=6, interactive_calls=2)
+        self.assertLess(order.index(INTERACTIVE), 3)
+        self.assertEqual(scheduler.snapshot()[BATCH]['max_queued'], 6)
+        self.assertEqual(scheduler.snapshot()[INTERACTIVE]['granted'], 2)
+
+    def test_batch_keeps_min_share(self):
+        scheduler = saturated_scheduler(rate=200)
+        order = self.run_contention(scheduler, batch_calls=10, interactive_calls=20)
+        self.assertIn(BATCH, order[:10])
+        self.assertEqual(scheduler.snapshot()[BATCH]['queued'], 0)
+
+    def test_async_acquire(self):
+        scheduler = saturated_scheduler()
+
+        async def main():
+            with request_priority(BATCH):
+                await asyncio.gather(*(scheduler.acquire_async() for _ in range(3)))
+
+        asyncio.run(main())
+        self.assertEqual(scheduler.snapshot()[BATCH]['granted'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
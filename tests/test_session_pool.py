@@ -0,0 +1,92 @@
+"""
+Tests pour le pool de sessions HTTP partagées des clients France Travail.
+"""
+import asyncio
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.api import session_pool
+from france_travail.api.config import ClientConfig
+from france_travail.api.soft_skills_client import SoftSkillsClient
+from france_travail.api.romeo_client import RomeoClient
+from france_travail.api.offres_client import OffresClient
+
+
+class TestSessionPool(unittest.TestCase):
+    """Vérifie la réutilisation des sessions par hôte."""
+
+    def tearDown(self):
+        session_pool.close_sessions()
+
+    def test_same_host_shares_session(self):
+        """Deux URLs du même hôte partagent la même session."""
+        a = session_pool.get_session("https://api.francetravail.io/partenaire/romeo/v2")
+        b = session_pool.get_session("https://api.francetravail.io/partenaire/matchviasoftskills/v1")
+        c = session_pool.get_session("https://api.emploi-store.fr/partenaire/offresdemploi/v2")
+        self.assertIs(a, b)
+        self.assertIsNot(a, c)
+
+    def test_clients_reuse_pool(self):
+        """Les sous-clients réutilisent la session de leur hôte."""
+        skills = SoftSkillsClient(client_id="id", client_secret="secret")
+        romeo = RomeoClient(client_id="id", client_secret="secret")
+        offres = OffresClient(skills, client_id="id", client_secret="secret")
+        self.assertIs(skills.session, romeo.session)
+        self.assertIsNot(skills.session, offres.session)
+        self.assertIs(skills.auth_session, offres.auth_session)
+        self.assertEqual(skills.timeout, ClientConfig.get_timeout())
+
+    def test_configure_pool_rebuilds_sessions(self):
+        """Une nouvelle configuration recrée les sessions avec la bonne taille de pool."""
+        old = session_pool.get_session("https://api.francetravail.io")
+        previous = ClientConfig.POOL_MAXSIZE
+        try:
+            session_pool.configure_pool(pool_maxsize=42)
+            new = session_pool.get_session("https://api.francetravail.io")
+            self.assertIsNot(old, new)
+            self.assertEqual(new.get_adapter("https://api.francetravail.io")._pool_maxsize, 42)
+        finally:
+            session_pool.configure_pool(pool_maxsize=previous)
+
+
+    def test_async_client_per_event_loop(self):
+        """Chaque boucle asyncio a son propre client httpx, fermé avec elle."""
+        async def session():
+            first = session_pool.get_async_session("https://api.francetravail.io/partenaire/romeo/v2")
+            self.assertIs(first, session_pool.get_async_session("https://api.francetravail.io"))
+            await session_pool.aclose_async_sessions()
+            self.assertTrue(first.is_closed)
+            return first
+
+        first, second = asyncio.run(session()), asyncio.run(session())
+        self.assertIsNot(first, second)
+        self.assertFalse(session_pool._async_sessions)
+
+
+    def test_install_cassette_closes_async_clients(self):
+        """Les clients httpx remplacés par une cassette sont fermés dans leur boucle."""
+        async def running_loop():
+            session = session_pool.get_async_session("https://api.francetravail.io")
+            session_pool.install_cassette(None)
+            await asyncio.sleep(0.01)
+            return session
+
+        self.assertTrue(asyncio.run(running_loop()).is_closed)
+
+        async def open_session():
+            return session_pool.get_async_session("https://api.francetravail.io")
+
+        loop = asyncio.new_event_loop()
+        try:
+            session = loop.run_until_complete(open_session())
+            session_pool.install_cassette(None)
+            self.assertTrue(session.is_closed)
+        finally:
+            loop.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
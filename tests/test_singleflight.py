@@ -0,0 +1,127 @@
+"""
+Tests pour le regroupement des requêtes identiques simultanées.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import httpx
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.api import SoftSkillsClient, AsyncSoftSkillsClient
+from france_travail.api.rate_limiter import TokenBucket
+from france_travail.api.response_cache import ResponseCache
+from france_travail.api.singleflight import SingleFlight, AsyncSingleFlight
+from france_travail.api.token_cache import TokenStore
+
+
+class SlowSession:
+    """Session requests lente qui compte les appels."""
+
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        with self.lock:
+            self.calls += 1
+        time.sleep(0.1)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"skills": {"s1": {"summary": "Rigueur", "score": 1}}}'
+        return response
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Vérifie le regroupement générique."""
+
+    def test_error_shared_with_waiters(self):
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def failing():
+            started.set()
+            time.sleep(0.05)
+            raise ValueError("boom")
+
+        def follower():
+            started.wait()
+            return flight.do('k', lambda: 'jamais appelé')
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(flight.do, 'k', failing)
+            other = executor.submit(follower)
+            self.assertRaises(ValueError, leader.result)
+            self.assertRaises(ValueError, other.result)
+        self.assertEqual(flight.stats(), {'calls': 1, 'shared': 1})
+
+    def test_async_sequential_calls_not_shared(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return len(calls)
+
+        async def run():
+            return [await flight.do('k', fetch), await flight.do('k', fetch)]
+
+        self.assertEqual(asyncio.run(run()), [1, 2])
+
+
+class TestClientCoalescing(unittest.TestCase):
+    """Vérifie que les clients n'émettent qu'un appel pour des requêtes simultanées identiques."""
+
+    def setUp(self):
+        cache = ResponseCache(enabled=False)
+        for target in ('base_client', 'async_base_client'):
+            patcher = patch(f'france_travail.api.{target}.response_cache', cache)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_threads_share_one_call(self):
+        client = SoftSkillsClient(client_id='id', client_secret='secret')
+        client.session = SlowSession()
+        client.rate_limiter = TokenBucket('test_flight', rate=1000, capacity=100)
+        client._authenticate = lambda force=False: True
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            results = list(executor.map(lambda _: client.get_skills_for_job('D1102'), range(10)))
+        self.assertEqual(client.session.calls, 1)
+        self.assertTrue(all(r == results[0] for r in results))
+        # Chaque appelant décode sa propre copie
+        self.assertEqual(len({id(r) for r in results}), 10)
+
+    def test_coroutines_share_one_call(self):
+        calls = []
+
+        async def handler(request):
+            if request.url.path.endswith('/access_token'):
+                return httpx.Response(200, json={'access_token': 'tok', 'expires_in': 1499})
+            calls.append(request.url.params['code'])
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={'skills': {}})
+
+        async def run():
+            session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            with patch('france_travail.api.async_base_client.get_async_session', return_value=session), \
+                    patch('france_travail.api.async_base_client.token_store', TokenStore()):
+                client = AsyncSoftSkillsClient(client_id='id', client_secret='secret')
+                client.rate_limiter = TokenBucket('test_flight', rate=1000, capacity=100)
+                codes = ['D1102'] * 5 + ['M1805'] * 5
+                return await asyncio.gather(*(client.get_skills_for_job(code) for code in codes))
+
+        results = asyncio.run(run())
+        self.assertEqual(results, [{'skills': {}}] * 10)
+        self.assertEqual(sorted(calls), ['D1102', 'M1805'])
+
+
+if __name__ == '__main__':
+    unittest.main()
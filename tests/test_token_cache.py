@@ -0,0 +1,93 @@
+"""
+Tests pour le cache partagé de tokens OAuth.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from france_travail.api.token_cache import TokenStore
+
+
+class TestTokenStore(unittest.TestCase):
+    """Vérifie l'expiration, le renouvellement unique et la persistance disque."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, 'tokens.json')
+
+    def test_token_reused_until_expiry_margin(self):
+        """Le token est réutilisé tant qu'il n'est pas proche de l'expiration."""
+        store = TokenStore(refresh_margin=60)
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return {'access_token': f'tok{len(calls)}', 'expires_in': 1499}
+
+        self.assertEqual(store.get_token('id', 'a b', fetch), 'tok1')
+        self.assertEqual(store.get_token('id', 'b,a', fetch), 'tok1')
+        self.assertEqual(len(calls), 1)
+
+        # Proche de l'expiration : renouvellement
+        store._tokens['id|a b']['expires_at'] = time.time() + 30
+        self.assertEqual(store.get_token('id', 'a b', fetch), 'tok2')
+
+    def test_single_flight_refresh(self):
+        """Plusieurs threads concurrents ne déclenchent qu'une authentification."""
+        store = TokenStore()
+        calls = []
+        barrier = threading.Barrier(8)
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return {'access_token': 'tok', 'expires_in': 1499}
+
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(store.get_token('id', 'scope', fetch))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(results, ['tok'] * 8)
+        self.assertEqual(len(calls), 1)
+
+    def test_invalidate_only_current_token(self):
+        """Un 401 sur un ancien token n'invalide pas le token déjà renouvelé."""
+        store = TokenStore()
+        store.store('id', 'scope', {'access_token': 'new', 'expires_in': 1499})
+        store.invalidate('id', 'scope', 'old')
+        self.assertEqual(store.peek('id', 'scope'), 'new')
+        store.invalidate('id', 'scope', 'new')
+        self.assertIsNone(store.peek('id', 'scope'))
+
+    def test_disk_cache_shared_between_instances(self):
+        """Un autre processus (nouvelle instance) relit le token depuis le disque."""
+        first = TokenStore(path=self.path)
+        first.get_token('id', 'scope', lambda: {'access_token': 'disk', 'expires_in': 1499})
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+
+        second = TokenStore(path=self.path)
+        self.assertEqual(second.get_token('id', 'scope', lambda: self.fail("pas d'appel attendu")), 'disk')
+
+    def test_failed_fetch_returns_none(self):
+        """Une authentification échouée n'est pas mise en cache."""
+        store = TokenStore()
+        self.assertIsNone(store.get_token('id', 'scope', lambda: None))
+        self.assertEqual(store.get_token('id', 'scope', lambda: {'access_token': 'ok'}), 'ok')
+
+
+if __name__ == '__main__':
+    unittest.main()